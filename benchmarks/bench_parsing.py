@@ -0,0 +1,201 @@
+# benchmarks/bench_parsing.py
+"""
+Parsing benchmarks, run from the project root:
+
+    python -m benchmarks.bench_parsing
+
+`fallback` compares the single-parse `extract_degrees_markdown` with the
+previous flow (sections parsed and tokenized for the strict pass, then parsed
+and tokenized again for the loose fallback) on pages without a strict match.
+
+`backends` times `extract_all_sections` with every parser backend.
+
+`split` compares per-heading `extract_section_text` scans with the one-pass
+`heading_records` walk on a long biography with a deep heading tree.
+
+`prefilter` times the sentence pass over already extracted sections with and
+without the `keywords.txt` section gate, and fails when the gate changes the
+extracted sentences.
+
+`logging` times `extract_degrees_markdown` with a file handler attached,
+with parsing at DEBUG and at INFO and with the handler written directly or
+behind the `QueueListener` that `setup_logging` installs.
+
+`metrics` times `extract_degrees_markdown` with the metrics registry off (the
+default) and on; off should be indistinguishable from uninstrumented code.
+"""
+
+import argparse
+import logging
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.pages import synthetic_biography
+from professional_profiler import metrics
+from professional_profiler.logging.logger import enqueue_handlers, stop_logging
+from professional_profiler.parsing.constants import get_patterns
+from professional_profiler.parsing.extractors import (
+    HEADING_RE,
+    _parse,
+    extract_all_sections,
+    extract_section_text,
+    heading_records,
+    extract_degrees_markdown,
+    extract_every_degree_sentence,
+    scan_degree_sentences,
+)
+
+
+def _two_pass(html: str) -> None:
+    extracted, _ = scan_degree_sentences(extract_all_sections(html))
+    if not extracted:
+        extract_every_degree_sentence(html)
+
+
+def timeit(fn, pages: list[str], repeat: int) -> float:
+    """Best-of-`repeat` seconds per page."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for html in pages:
+            fn(html)
+        best = min(best, time.perf_counter() - start)
+    return best / len(pages)
+
+
+def bench_fallback(pages: int, repeat: int) -> None:
+    corpus = [synthetic_biography(strict=False) for _ in range(pages)]
+    before = timeit(_two_pass, corpus, repeat)
+    after = timeit(extract_degrees_markdown, corpus, repeat)
+    print(f"fallback  two-pass   {before * 1e3:8.2f} ms/page")
+    print(f"fallback  one-pass   {after * 1e3:8.2f} ms/page  ({before / after:.2f}x)")
+
+
+def bench_backends(pages: int, repeat: int) -> None:
+    corpus = [synthetic_biography(sections=20, strict=True) for _ in range(pages)]
+    baseline = None
+    for backend in ("html5lib", "lxml", "selectolax"):
+        try:
+            per_page = timeit(lambda html: extract_all_sections(html, backend), corpus, repeat)
+        except ImportError as e:
+            print(f"sections  {backend:<10} skipped: {e}")
+            continue
+        baseline = baseline or per_page
+        speedup = baseline / per_page
+        print(f"sections  {backend:<10} {per_page * 1e3:8.2f} ms/page  ({speedup:.2f}x)")
+
+
+def bench_split(pages: int, repeat: int) -> None:
+    html = synthetic_biography(sections=120, paragraphs=8, depth=4)
+    bodies = [_parse(html, "lxml")[1] for _ in range(pages)]
+
+    def per_heading(body):
+        return [extract_section_text(h) for h in body.find_all(HEADING_RE)]
+
+    before = timeit(per_heading, bodies, repeat)
+    after = timeit(heading_records, bodies, repeat)
+    print(f"split     per-heading {before * 1e3:8.2f} ms/page")
+    print(f"split     one-pass    {after * 1e3:8.2f} ms/page  ({before / after:.2f}x)")
+
+
+def bench_prefilter(pages: int, repeat: int) -> None:
+    corpus = [
+        extract_all_sections(synthetic_biography(sections=20, strict=strict), "selectolax")
+        for strict in (True, False)
+        for _ in range(pages // 2 or 1)
+    ]
+    if get_patterns().keywords is None:
+        print("sentences prefilter    skipped: no keywords, or an anchored degree pattern")
+        return
+    changed = sum(
+        scan_degree_sentences(secs) != scan_degree_sentences(secs, prefilter=False)
+        for secs in corpus
+    )
+    if changed:
+        raise SystemExit(f"the keyword gate changed the sentences of {changed} pages")
+    before = timeit(lambda secs: scan_degree_sentences(secs, prefilter=False), corpus, repeat)
+    after = timeit(scan_degree_sentences, corpus, repeat)
+    print(f"sentences no prefilter {before * 1e3:8.2f} ms/page")
+    print(f"sentences prefilter    {after * 1e3:8.2f} ms/page  ({before / after:.2f}x)")
+
+
+LOG_MODES = (
+    ("debug direct", logging.DEBUG, False),
+    ("info  direct", logging.INFO, False),
+    ("info  queued", logging.INFO, True),
+)
+
+
+def _log_to(path: Path, level: int, queued: bool) -> None:
+    stop_logging()
+    handler = logging.FileHandler(path)
+    handler.setFormatter(logging.Formatter("[%(asctime)s] %(levelname)s %(name)s: %(message)s"))
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel(logging.INFO)
+    logging.getLogger("professional_profiler.parsing").setLevel(level)
+    if queued:
+        enqueue_handlers()
+
+
+def bench_logging(pages: int, repeat: int) -> None:
+    corpus = [synthetic_biography(sections=20, strict=strict) for strict in (True, False)]
+    corpus *= pages // 2 or 1
+    root = logging.getLogger()
+    saved = root.handlers[:], root.level
+    parsing = logging.getLogger("professional_profiler.parsing")
+    saved_level = parsing.level
+    baseline = None
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            for label, level, queued in LOG_MODES:
+                path = Path(tmp) / f"{label.replace(' ', '_')}.log"
+                _log_to(path, level, queued)
+                per_page = timeit(extract_degrees_markdown, corpus, repeat)
+                stop_logging()
+                for handler in root.handlers:
+                    handler.close()
+                lines = sum(1 for _ in path.open()) / (len(corpus) * repeat)
+                baseline = baseline or per_page
+                print(
+                    f"logging   {label} {per_page * 1e3:8.2f} ms/page  "
+                    f"({baseline / per_page:.2f}x, {lines:.1f} lines/page)"
+                )
+    finally:
+        root.handlers, root.level = saved
+        parsing.setLevel(saved_level)
+
+
+def bench_metrics(pages: int, repeat: int) -> None:
+    corpus = [synthetic_biography(sections=20, strict=strict) for strict in (True, False)]
+    corpus *= pages // 2 or 1
+    off = timeit(extract_degrees_markdown, corpus, repeat)
+    metrics.enable()
+    try:
+        on = timeit(extract_degrees_markdown, corpus, repeat)
+    finally:
+        metrics.enable(False)
+        metrics.REGISTRY.reset()
+    print(f"metrics   off  {off * 1e3:8.2f} ms/page")
+    print(f"metrics   on   {on * 1e3:8.2f} ms/page  ({on / off - 1:+.1%})")
+
+
+BENCHES = {
+    "fallback": bench_fallback,
+    "backends": bench_backends,
+    "split": bench_split,
+    "prefilter": bench_prefilter,
+    "metrics": bench_metrics,
+    "logging": bench_logging,
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("bench", nargs="*", default=list(BENCHES))
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    for name in args.bench:
+        BENCHES[name](args.pages, args.repeat)
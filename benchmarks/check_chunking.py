@@ -0,0 +1,136 @@
+# benchmarks/check_chunking.py
+"""
+Check the snippet chunker, run from the project root:
+
+    python -m benchmarks.check_chunking
+    python -m benchmarks.check_chunking --threshold 300 --overlap-rate 0.25
+
+A synthetic `degrees_to_markdown` snippet (several sections of degree
+sentences, one far longer than the threshold and one nearly as long) is chunked with
+`chunk_snippet` using tiktoken, when it is installed and its encoding loads,
+and the regex approximation. Every chunk must be within the threshold, as
+counted by the same counter; consecutive chunks must share the longest tail
+of sentences that fits the overlap (or as much of it as leaves room for the
+next sentence); every sentence must sit under its own section title in each
+chunk; and every input sentence must appear in some chunk (the long one in
+pieces, in order). Exits non-zero on any failure.
+"""
+
+import argparse
+import sys
+
+from professional_profiler.extraction import chunking
+from professional_profiler.extraction.chunking import (
+    chunk_snippet,
+    count_tokens,
+    markdown_sections,
+)
+from professional_profiler.parsing.formatter import degrees_to_markdown
+
+FIELDS = ("history", "physics", "economics", "law", "music", "chemistry")
+SCHOOLS = ("Harvard College", "Yale University", "the University of Chicago", "MIT")
+
+
+def snippet(threshold: int) -> tuple[str, dict[str, str]]:
+    """The markdown and the section title of every sentence in it."""
+    sections = {}
+    for s, title in enumerate(("_lead_", "Education", "Early life", "Career")):
+        sections[title] = [
+            f"In {1950 + 10 * s + i} the author earned degree {s}.{i} in "
+            f"{FIELDS[i % len(FIELDS)]} from {SCHOOLS[(s + i) % len(SCHOOLS)]}."
+            for i in range(15)
+        ]
+    # longer than a chunk, and long enough to crowd out part of the overlap
+    sections["Education"].insert(
+        7, " ".join(f"word{i}" for i in range(2 * threshold)) + " and a Ph.D. in physics."
+    )
+    sections["Career"].insert(
+        7, " ".join(f"word{i}" for i in range(threshold * 4 // 5)) + " and a J.D. in law."
+    )
+    titles = {sent: title for title, sents in sections.items() for sent in sents}
+    return degrees_to_markdown(sections), titles
+
+
+def sentences_of(chunk: str) -> list[tuple[str, str]]:
+    """`(title, sentence)` pairs of a chunk, in order."""
+    return [
+        (sec["title"], line)
+        for sec in markdown_sections(chunk)
+        for line in sec["content"].splitlines()
+    ]
+
+
+def check(name: str, threshold: int, overlap_rate: float) -> int:
+    text, titles = snippet(threshold)
+    chunks = chunk_snippet(text, threshold, overlap_rate)
+    overlap = int(threshold * overlap_rate)
+    problems = []
+
+    sizes = count_tokens(chunks)
+    if len(chunks) < 2:
+        problems.append(f"{len(chunks)} chunk, the snippet was not split")
+    problems += [f"chunk {i} has {n} tokens" for i, n in enumerate(sizes) if n > threshold]
+
+    pieces = [sentences_of(chunk) for chunk in chunks]
+    for i, chunk in enumerate(pieces):
+        for title, sent in chunk:
+            # pieces of the long sentence are checked for coverage below
+            expected = titles.get(sent, "Education")
+            if title != expected:
+                problems.append(f"chunk {i}: {sent[:30]!r} under {title!r}, not {expected!r}")
+
+    for i in range(len(pieces) - 1):
+        # the longest tail of chunk i within the overlap budget starts chunk i + 1,
+        # shortened only as far as the next sentence needs the room
+        tail, size = [], 0
+        for title, sent in reversed(pieces[i]):
+            n = count_tokens([sent])[0] + 2
+            if size + n > overlap:
+                break
+            tail.insert(0, (title, sent))
+            size += n
+        shared = next(
+            k for k in range(len(tail), -1, -1) if pieces[i + 1][:k] == tail[len(tail) - k :]
+        )
+        if shared < len(tail) and shared < len(pieces[i + 1]):
+            # one more tail sentence must not fit beside the first new one
+            kept = tail[len(tail) - shared - 1 :] + [pieces[i + 1][shared]]
+            need = sum(count_tokens([sent])[0] + 2 for _, sent in kept)
+            need += sum(count_tokens([f"## {t}" for t in {t for t, _ in kept}]))
+            if need <= threshold:
+                problems.append(
+                    f"chunks {i} and {i + 1} share {shared} of {len(tail)} overlap sentences"
+                )
+
+    covered = " ".join(dict.fromkeys(sent for chunk in pieces for _, sent in chunk))
+    problems += [f"{sent[:30]!r} is in no chunk" for sent in titles if sent not in covered]
+
+    print(
+        f"{'FAIL' if problems else 'ok':<5} {name:<8} {len(chunks)} chunks, "
+        f"{min(sizes)}-{max(sizes)} tokens of {threshold}, overlap {overlap}"
+    )
+    for problem in problems[:10]:
+        print(f"      {problem}")
+    return len(problems)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threshold", type=int, default=300)
+    parser.add_argument("--overlap-rate", type=float, default=0.25)
+    args = parser.parse_args()
+
+    failures = 0
+    if chunking.tiktoken is None:
+        print("skip  tiktoken not installed")
+    else:
+        failures += check("tiktoken", args.threshold, args.overlap_rate)
+    # the regex approximation, as used without tiktoken
+    chunking.tiktoken = None
+    chunking.get_tokenizer.cache_clear()
+    failures += check("regex", args.threshold, args.overlap_rate)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
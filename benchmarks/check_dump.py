@@ -0,0 +1,87 @@
+# benchmarks/check_dump.py
+"""
+Check that the offline dump backend answers like the API client, run from
+the project root:
+
+    python -m benchmarks.check_dump
+
+`fixtures/dump/enwiki_sample.ndjson` is a small Enterprise HTML dump of the
+replay server's articles (with their redirects, a disambiguation page and a
+talk page that must be skipped). It is indexed into a temporary directory,
+then every recorded name and its lower-case and underscored spellings are
+resolved with `WikiDump.search_many` and with `WikimediaClient.search_many`
+against the replay server, and the page of every resolved key is fetched
+from both; a key missing from the dump must raise `FetchError` with
+`HTTP_ERROR`, as the API's 404 does. Prints the index build time and
+lookups per second, and exits non-zero on any difference.
+"""
+
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.check_titles import spellings
+from benchmarks.replay_server import FIXTURES, ReplayServer
+from professional_profiler.scraping.dump import WikiDump
+from professional_profiler.scraping.wikipedia_search import (
+    SKIP_KEYS,
+    Failure,
+    FetchError,
+    WikimediaClient,
+)
+
+DUMP = FIXTURES / "dump" / "enwiki_sample.ndjson"
+
+
+def main() -> int:
+    logging.getLogger("professional_profiler").setLevel(logging.ERROR)
+
+    with ReplayServer() as server:
+        names = [s for name in server.search for s in spellings(name)]
+        with WikimediaClient(
+            base_url=server.url, action_url=server.url + "/w/api.php"
+        ) as client:
+            expected = client.search_many(names)
+            expected_pages = {
+                key: client.page_html(key)
+                for key in set(expected.values())
+                if key not in SKIP_KEYS
+            }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        dump = WikiDump(DUMP, index_path=Path(tmp) / "index.sqlite")
+        built = time.perf_counter() - start
+        with dump:
+            start = time.perf_counter()
+            got = dump.search_many(names)
+            pages = {key: dump.page_html(key) for key in set(got.values())}
+            looked_up = time.perf_counter() - start
+            try:
+                missing = dump.page_html("Not_In_The_Dump")
+            except FetchError as e:
+                missing = e.failure
+
+    failures = 0
+    for name in names:
+        ok = got[name] == expected[name]
+        failures += not ok
+        print(f"{'ok' if ok else 'FAIL':<5} {name!r:<28} {expected[name]:<24} {got[name]}")
+    for key, html in expected_pages.items():
+        if pages.get(key) != html:
+            failures += 1
+            print(f"FAIL  page {key} differs from the API page")
+    if missing is not Failure.HTTP_ERROR:
+        failures += 1
+        print(f"FAIL  a page missing from the dump gave {missing!r}, not HTTP_ERROR")
+    print(
+        f"indexed in {built * 1e3:.1f} ms, {len(names) + len(pages)} lookups in "
+        f"{looked_up * 1e3:.1f} ms, {len(expected_pages)} pages compared"
+    )
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,261 @@
+# benchmarks/check_extraction.py
+"""
+Check `ExtractionEngine` against a replayable mock model, run from the
+project root:
+
+    python -m benchmarks.check_extraction
+
+The engine talks to an `httpx.MockTransport` that answers every snippet with
+a Bachelor's degree, except snippets carrying a marker word:
+
+- RATE: a 429 with `Retry-After: 3` first, the retry must wait that long;
+- FLAKY: a 503 first, retried after the exponential backoff;
+- INVALID: a reply that fails the schema first, asked again;
+- GARBAGE: a reply that is not JSON every time, given up after the retries;
+- BAD: a 400, not retried;
+- BOOM: the transport raises `RuntimeError`, the author gets a failed result.
+
+Every author must still get a result, an error raised by the authors
+iterator must come out of `extract_many`, and a `TokenBudget` that covers
+one request per minute must hold the second request back. A batch of
+`CACHE_AUTHORS` authors sharing two snippets (up to formatting) and trivial
+ones must take two model calls (the mock is slow, so the duplicates are in
+flight together), and none when it runs again on the same `ExtractionCache`. A run that does
+not finish within `TIMEOUT` seconds counts as a hang. Exits non-zero on any
+failure.
+"""
+
+import asyncio
+import json
+import logging
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import httpx
+
+from professional_profiler.extraction.cache import ExtractionCache
+from professional_profiler.extraction.chunking import count_tokens
+from professional_profiler.extraction.engine import ExtractionEngine, TokenBudget
+
+TIMEOUT = 20.0
+RETRY_AFTER = 3.0
+REPLY = json.dumps({"studies": [{"degree_type": "BACHELOR", "degree_field": ["History"]}]})
+SCHEMA_INVALID = json.dumps({"studies": [{"degree_type": "Wizard"}]})
+MARKERS = ("RATE", "FLAKY", "INVALID", "GARBAGE", "BAD", "BOOM")
+CACHE_AUTHORS = 100
+# two distinct snippets, one of them in two formattings, and two trivial ones
+SNIPPETS = [
+    "## Education\n- He received his B.A. in history from Harvard College.[1]",
+    "## Early life\n-   he received his B.A.  in history from Harvard College .",
+    "## Education\n- She earned a Ph.D. in physics from MIT.",
+    "NOT HTML",
+    "## Degree Mentions\n",
+]
+
+
+class MockModel:
+    """`httpx.MockTransport` handler, records when each marker was asked."""
+
+    def __init__(self):
+        self.calls = defaultdict(list)
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        snippet = json.loads(request.content)["messages"][-1]["content"]
+        marker = next((m for m in MARKERS if m in snippet), "OK")
+        self.calls[marker].append(time.monotonic())
+        first = len(self.calls[marker]) == 1
+        content = REPLY
+        if marker == "BOOM":
+            raise RuntimeError("mock transport blew up")
+        if marker == "BAD":
+            return httpx.Response(400, json={"error": "bad request"})
+        if marker == "RATE" and first:
+            return httpx.Response(429, headers={"Retry-After": str(RETRY_AFTER)})
+        if marker == "FLAKY" and first:
+            return httpx.Response(503)
+        if marker == "INVALID" and first:
+            content = SCHEMA_INVALID
+        if marker == "GARBAGE":
+            content = "I think they studied history."
+        return httpx.Response(
+            200,
+            json={
+                "choices": [{"message": {"content": content}}],
+                "usage": {"total_tokens": 100},
+            },
+        )
+
+    def total(self) -> int:
+        return sum(map(len, self.calls.values()))
+
+    def gap(self, marker: str) -> float:
+        """Seconds between the first two requests for `marker`."""
+        times = self.calls[marker]
+        return times[1] - times[0] if len(times) > 1 else 0.0
+
+
+class SlowModel(MockModel):
+    """A `MockModel` that takes `delay` seconds, so identical snippets overlap."""
+
+    def __init__(self, delay: float = 0.2):
+        super().__init__()
+        self.delay = delay
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(self.delay)
+        return super().__call__(request)
+
+
+def authors(count: int, markers=()) -> list[tuple[str, str, str]]:
+    rows = [
+        (str(i), f"Author {i}", f"Author {i} earned a BA in History.") for i in range(count)
+    ]
+    for marker in markers:
+        i = len(rows)
+        rows.append((marker, f"Author {i}", f"Author {i} earned a BA in History {marker}."))
+    return rows
+
+
+class BrokenInput(Exception):
+    pass
+
+
+def broken(rows):
+    yield from rows
+    raise BrokenInput("authors iterator failed")
+
+
+def engine_for(model: MockModel, **kwargs) -> ExtractionEngine:
+    client = httpx.AsyncClient(transport=httpx.MockTransport(model), base_url="http://mock")
+    return ExtractionEngine("http://mock", "mock", client=client, **kwargs)
+
+
+async def collect(engine: ExtractionEngine, rows) -> list:
+    async with engine.client, engine:
+        return [result async for result in engine.extract_many(rows)]
+
+
+def run(engine: ExtractionEngine, rows, timeout: float = TIMEOUT):
+    """The results, or the exception `extract_many` raised."""
+    try:
+        return asyncio.run(asyncio.wait_for(collect(engine, rows), timeout))
+    except Exception as e:
+        return e
+
+
+def report(name: str, ok: bool, detail: str) -> int:
+    print(f"{'ok' if ok else 'FAIL':<5} {name:<32} {detail:.90}")
+    return not ok
+
+
+def check_failures() -> int:
+    model = MockModel()
+    got = run(engine_for(model, max_concurrency=8, max_retries=1), authors(3, MARKERS))
+    if isinstance(got, Exception):
+        return report("retries and failures", False, f"extract_many raised {got!r}")
+    errors = {r.author_id: r.error or "" for r in got}
+    failures = report(
+        "every author answered", len(got) == 3 + len(MARKERS), f"{len(got)} results"
+    )
+    failures += report(
+        "429 waits for Retry-After",
+        not errors["RATE"] and model.gap("RATE") >= RETRY_AFTER,
+        f"{len(model.calls['RATE'])} requests, {model.gap('RATE'):.2f}s apart",
+    )
+    failures += report(
+        "503 retried after backoff",
+        not errors["FLAKY"] and model.gap("FLAKY") >= 2.0,
+        f"{len(model.calls['FLAKY'])} requests, {model.gap('FLAKY'):.2f}s apart",
+    )
+    failures += report(
+        "schema-invalid reply re-asked",
+        not errors["INVALID"] and len(model.calls["INVALID"]) == 2,
+        f"{len(model.calls['INVALID'])} requests",
+    )
+    failures += report(
+        "unusable replies given up",
+        errors["GARBAGE"].startswith("gave up") and len(model.calls["GARBAGE"]) == 2,
+        f"{len(model.calls['GARBAGE'])} requests, {errors['GARBAGE']!r}",
+    )
+    failures += report(
+        "400 not retried",
+        errors["BAD"] == "HTTP 400" and len(model.calls["BAD"]) == 1,
+        f"{len(model.calls['BAD'])} requests, {errors['BAD']!r}",
+    )
+    failures += report(
+        "transport bug fails one author",
+        errors["BOOM"].startswith("RuntimeError") and not any(errors[str(i)] for i in range(3)),
+        f"{errors['BOOM']!r}",
+    )
+    return failures
+
+
+def check_budget() -> int:
+    model = MockModel()
+    engine = engine_for(model, max_concurrency=4)
+    rows = authors(3)
+    reserved = engine._prompt_tokens + count_tokens([rows[0][2]])[0] + engine.max_tokens
+    # one request per minute, the others wait for the budget to refill
+    engine.budget = TokenBudget(reserved + 10)
+    got = run(engine, rows, timeout=2.0)
+    return report(
+        "token budget holds calls",
+        isinstance(got, TimeoutError) and model.total() == 1,
+        f"{model.total()} requests in 2s with {reserved + 10} tokens/min",
+    )
+
+
+def check_cache() -> int:
+    rows = [(str(i), f"Author {i}", SNIPPETS[i % len(SNIPPETS)]) for i in range(CACHE_AUTHORS)]
+    trivial = sum(1 for _, _, snippet in rows if snippet in SNIPPETS[3:])
+    failures = 0
+    answers = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, expected in (("first run", 2), ("rerun", 0)):
+            model = SlowModel()
+            cache = ExtractionCache(Path(tmp) / "extraction.sqlite")
+            engine = engine_for(model, cache=cache)
+            got = run(engine, rows)
+            cache.close()
+            if isinstance(got, Exception):
+                failures += report(name, False, f"extract_many raised {got!r}")
+                continue
+            answers.append({r.author_id: r.profile for r in got})
+            ok = (
+                model.total() == expected
+                and engine.calls["model"] == expected
+                and engine.calls["trivial"] == trivial
+                # identical snippets in flight wait for the one request
+                and (engine.calls["shared"] > 0 or not expected)
+                and len(got) == CACHE_AUTHORS
+                and not any(r.error for r in got)
+            )
+            failures += report(
+                f"cache {name}", ok, f"{model.total()} model calls, {dict(engine.calls)}"
+            )
+    if len(answers) == 2:
+        failures += report(
+            "cache rerun answers", answers[0] == answers[1], "same profile for every author"
+        )
+    return failures
+
+
+def main() -> int:
+    logging.getLogger("professional_profiler").setLevel(logging.CRITICAL)
+    failures = check_failures()
+    failures += check_budget()
+    failures += check_cache()
+
+    got = run(engine_for(MockModel(), max_concurrency=2), broken(authors(4)))
+    failures += report("failing authors iterator", isinstance(got, BrokenInput), repr(got))
+
+    got = run(engine_for(MockModel(), max_concurrency=2), authors(4) + [("4", "Author 4")])
+    failures += report("malformed author row", isinstance(got, ValueError), repr(got))
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+# benchmarks/check_golden.py
+"""
+Golden-output check for the section extraction backends, run from the project
+root:
+
+    python -m benchmarks.check_golden            # compare every backend
+    python -m benchmarks.check_golden --update   # regenerate with html5lib
+
+Each page in `fixtures/pages` (hand-written pages reproducing the markup of
+the REST/Parsoid and the classic `mw-parser-output` HTML, plus two synthetic
+biographies from `pages.py`) has its expected `extract_all_sections` output
+in `fixtures/golden/<page>.json`, produced by the reference html5lib backend
+with the section blacklist from `config/app.yaml`. Exits non-zero on any
+mismatch.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from professional_profiler.parsing.extractors import extract_all_sections
+
+FIXTURES = Path(__file__).parent / "fixtures"
+BACKENDS = ("html5lib", "lxml", "selectolax")
+
+
+def load_pages() -> dict[str, str]:
+    return {
+        path.stem: path.read_text(encoding="utf-8")
+        for path in sorted((FIXTURES / "pages").glob("*.html"))
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--update", action="store_true")
+    parser.add_argument("--backend", action="append", choices=BACKENDS)
+    args = parser.parse_args()
+
+    golden_dir = FIXTURES / "golden"
+    golden_dir.mkdir(exist_ok=True)
+    failures = 0
+    for name, html in load_pages().items():
+        golden_path = golden_dir / f"{name}.json"
+        if args.update:
+            sections = extract_all_sections(html, backend="html5lib")
+            golden_path.write_text(json.dumps(sections, indent=2, ensure_ascii=False) + "\n")
+            print(f"updated {golden_path.name}")
+            continue
+        expected = json.loads(golden_path.read_text(encoding="utf-8"))
+        for backend in args.backend or BACKENDS:
+            try:
+                got = extract_all_sections(html, backend=backend)
+            except ImportError as e:
+                print(f"skip  {backend:<10} {name}: {e}")
+                continue
+            ok = got == expected
+            failures += not ok
+            print(f"{'ok' if ok else 'FAIL':<5} {backend:<10} {name}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+# benchmarks/check_matcher.py
+"""
+Check the degree matcher against `DEGREE_PATTERN`, run from the project root:
+
+    python -m benchmarks.check_matcher
+
+Every sample sentence lists the mentions `DegreeMatcher` must find, with
+their text and degree type, and the spans must hold that text. In the
+sentences with degrees every `DEGREE_PATTERN` match must fall inside one of
+the matcher's spans, so the vocabulary covers the pattern's spellings; the
+sentences without degrees are ones the pattern misfires on (state codes,
+clock times, lower-case words) and the matcher must find nothing. Exits
+non-zero on any failure.
+"""
+
+import sys
+
+from professional_profiler.models import FieldEnum
+from professional_profiler.parsing.constants import get_patterns
+from professional_profiler.parsing.matcher import DegreeMatcher
+
+A, B, M, D = FieldEnum.ASSOCIATE, FieldEnum.BACHELOR, FieldEnum.MASTER, FieldEnum.DOCTOR
+
+SAMPLES = [
+    (
+        "Moyn earned his A.B. degree from Washington University in St. Louis in "
+        "history and French literature (1994).",
+        [("A.B", B)],
+    ),
+    (
+        "He continued his education, earning a Ph.D. from the University of "
+        "California at Berkeley (2000) and his J.D. from Harvard Law School (2001).",
+        [("Ph.D", D), ("J.D", D)],
+    ),
+    ("She received a BA, MA and PhD from Yale.", [("BA", B), ("MA", M), ("PhD", D)]),
+    ("He earned a BSc in chemistry and an MS in physics.", [("BSc", B), ("MS", M)]),
+    ("He holds an MSc.", [("MSc", M)]),
+    ("Both of her PhDs and his two Ph.D.s were in physics.", [("PhDs", D), ("Ph.D.s", D)]),
+    ("The firm hired three J.D.s and an LL.M. graduate.", [("J.D.s", D), ("LL.M", M)]),
+    (
+        "She earned a Bachelor's degree in economics and a Master of Arts in history.",
+        [("Bachelor's degree", B), ("Master of Arts", M)],
+    ),
+    ("After a Master in Economics she joined the bank.", [("Master", M)]),
+    ("He completed a Doctorate in 1980.", [("Doctorate", D)]),
+    ("She holds an associate degree and an MBA.", [("associate degree", A), ("MBA", M)]),
+    # no degrees
+    ("He moved to Boston, MA in 1990.", []),
+    ("She was born in Baltimore, MD 21201.", []),
+    ("The lecture began at 10 AM.", []),
+    ("He was a master craftsman.", []),
+    ("His ma taught him to read.", []),
+]
+
+
+def main() -> int:
+    matcher = DegreeMatcher()
+    pattern = get_patterns().degree
+    failures = 0
+    for sentence, expected in SAMPLES:
+        found = matcher.findall(sentence)
+        got = [(m.text, m.degree_type) for m in found]
+        ok = got == expected and all(sentence[m.start : m.end] == m.text for m in found)
+        missed = []
+        if expected:
+            missed = [
+                p.group()
+                for p in pattern.finditer(sentence)
+                if not any(m.start <= p.start() and p.end() <= m.end for m in found)
+            ]
+            ok = ok and not missed
+        failures += not ok
+        shown = ", ".join(f"{text} {t.name}" for text, t in got) or "-"
+        print(f"{'ok' if ok else 'FAIL':<5} {sentence[:60]!r:<64} {shown}")
+        if got != expected:
+            print(f"      expected {', '.join(f'{x} {t.name}' for x, t in expected) or '-'}")
+        if missed:
+            print(f"      DEGREE_PATTERN matches outside the spans: {missed}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
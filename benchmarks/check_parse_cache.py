@@ -0,0 +1,100 @@
+# benchmarks/check_parse_cache.py
+"""
+Check that incremental re-parsing gives the same markdown as parsing from
+scratch, run from the project root:
+
+    python -m benchmarks.check_parse_cache
+
+The corpus is the replay server's pages, synthetic biographies (some of them
+twice, as authors sharing a page) and an outcome string. It is parsed with
+`ParsingPool.map` and a `ParseCache` in a temporary directory four times:
+cold, again unchanged, after narrowing the loose degree pattern and after
+blacklisting a section. Each run must match `parse_page`
+under the same patterns, and reuse what it should: every result when
+nothing changed, every HTML page's sections when only a pattern changed, nothing
+when the blacklist changed. Prints the wall time and cache counts of each
+run and exits non-zero on any difference.
+"""
+
+import argparse
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.pages import synthetic_biography
+from benchmarks.replay_server import load_recording
+from professional_profiler.parsing.batch import ParsingPool
+from professional_profiler.parsing.cache import ParseCache
+from professional_profiler.parsing.constants import compile_patterns, get_patterns, set_patterns
+from professional_profiler.parsing.extractors import parse_page
+from professional_profiler.parsing.utils import is_html
+
+
+def corpus() -> list[str]:
+    _, pages = load_recording()
+    synthetic = [
+        synthetic_biography(sections=8 + n % 5, strict=n % 2 == 0, depth=1 + n % 3)
+        for n in range(12)
+    ]
+    return [*pages.values(), *synthetic, *synthetic[:4], "NO_MATCH"]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+    logging.getLogger("professional_profiler").setLevel(logging.ERROR)
+
+    pages = corpus()
+    distinct = len(set(pages))
+    # outcome strings have no sections to reuse
+    html = len({page for page in pages if is_html(page)})
+    configured = get_patterns()
+    narrowed = compile_patterns(
+        configured.degree.pattern, r"\bdoctorate\b", configured.blacklist
+    )
+    blacklisted = compile_patterns(
+        configured.degree.pattern,
+        configured.loose.pattern,
+        configured.blacklist | {"Section 1"},
+    )
+    # (run, patterns, expected results reused, expected sections reused)
+    runs = [
+        ("cold", configured, 0, 0),
+        ("unchanged", configured, distinct, 0),
+        ("loose pattern", narrowed, 0, html),
+        ("blacklist", blacklisted, 0, 0),
+    ]
+
+    failures = 0
+    previous = None
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, patterns, results, sections in runs:
+            set_patterns(patterns)
+            expected = [parse_page(page) for page in pages]
+            with ParseCache(Path(tmp) / "parsing.sqlite") as cache:
+                with ParsingPool(args.workers) as pool:
+                    start = time.perf_counter()
+                    got = pool.map(pages, cache=cache)
+                    wall = time.perf_counter() - start
+                stats = cache.stats()
+            wrong = sum(g != e for g, e in zip(got, expected))
+            reused = (stats["hits"]["results"], stats["hits"]["sections"])
+            ok = not wrong and reused == (results, sections)
+            failures += not ok
+            changed = sum(g != p for g, p in zip(got, previous)) if previous else 0
+            print(
+                f"{'ok' if ok else 'FAIL':<5} {name:<14} {wall * 1e3:8.1f} ms  "
+                f"results reused {reused[0]:>3}, sections reused {reused[1]:>3}, "
+                f"parsed {stats['misses']:>3}  {changed} pages changed, {wrong} wrong"
+            )
+            previous = got
+    set_patterns(None)
+    print(f"{len(pages)} pages, {distinct} distinct")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
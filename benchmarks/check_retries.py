@@ -0,0 +1,135 @@
+# benchmarks/check_retries.py
+"""
+Check that transient failures end up retried rather than lost, against the
+replay server, run from the project root:
+
+    python -m benchmarks.check_retries --rate-429 0.3 --rate-5xx 0.2
+
+Every recorded name is fetched with `iter_fetch` once from a well-behaved
+server and once from one answering a share of requests with 429 (with a
+`Retry-After`) or 503. With the client retrying twice, many authors exhaust
+their retries and go through the dead-letter queue; every author must still
+come out exactly once, with the outcome of the clean run unless it is
+reported with a retryable `Failure` after `dead_letter_rounds`.
+
+A third run is against a server that holds a throttle window open for the
+`Retry-After` of every 429 (`hold_429`). A `Retry-After` longer than the
+client's `--max-wait` is not waited out inline, but the shared rate limiter
+must still pause for it: only the requests already in flight when a window
+opens (at most one per other worker) may arrive inside it. Prints the
+outcomes, the dead letters and the wall time of each run, and exits non-zero
+on a lost or wrong outcome or a request sent into a throttle window.
+"""
+
+import argparse
+import itertools
+import logging
+import sys
+import time
+from collections import Counter
+
+from benchmarks.replay_server import ReplayServer
+from professional_profiler import metrics
+from professional_profiler.config import wikipediaSettings
+from professional_profiler.scraping.fetcher import iter_fetch
+
+
+def fetch(server: ReplayServer, names: list[str], args) -> tuple[dict, float]:
+    conf = wikipediaSettings(
+        rate_limit=600_000,
+        max_retries=2,
+        timeout=args.max_wait,
+        response_code=429,
+        language="en",
+        max_workers=args.workers,
+        base_url=server.url,
+        action_url=server.url + "/w/api.php",
+        backoff=args.backoff,
+        dead_letter_rounds=args.rounds,
+        dead_letter_wait=args.dead_letter_wait,
+    )
+    start = time.perf_counter()
+    results = {}
+    for idx, _, result in iter_fetch(names, conf):
+        assert idx not in results, f"author {idx} reported twice"
+        results[idx] = result
+    return results, time.perf_counter() - start
+
+
+def compare(expected: dict, got: dict) -> tuple[Counter, int]:
+    """Outcomes of `got` against the clean run, and how many are wrong or lost."""
+    outcomes: Counter = Counter()
+    failures = 0
+    for idx, result in expected.items():
+        other = got.get(idx)
+        if other is None:
+            outcomes["lost"] += 1
+            failures += 1
+        elif other.failure is not None:
+            outcomes[other.failure.value] += 1
+            failures += not other.failure.retryable
+        else:
+            outcomes["same" if other == result else "different"] += 1
+            failures += other != result
+    return outcomes, failures
+
+
+def dead_letters() -> dict:
+    dead = {
+        dict(labels)["failure"]: n
+        for (name, labels), n in metrics.REGISTRY.counters.items()
+        if name == "dead_letters_total"
+    }
+    metrics.REGISTRY.reset()
+    return dead
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--authors", type=int, default=64)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--rate-429", type=float, default=0.3)
+    parser.add_argument("--rate-5xx", type=float, default=0.2)
+    parser.add_argument("--window-429", type=float, default=0.05, help="429s of the third run")
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--backoff", type=float, default=0.01)
+    parser.add_argument("--max-wait", type=float, default=0.5, help="longest inline wait")
+    parser.add_argument("--rounds", type=int, default=3, help="dead-letter rounds")
+    parser.add_argument("--dead-letter-wait", type=float, default=0.2)
+    args = parser.parse_args()
+    logging.getLogger("professional_profiler").setLevel(logging.ERROR)
+    metrics.enable()
+
+    with ReplayServer() as clean:
+        names = list(itertools.islice(itertools.cycle(clean.search), args.authors))
+        expected, clean_wall = fetch(clean, names, args)
+    print(f"{len(names)} authors, clean run {clean_wall:.2f}s")
+
+    failures = 0
+    servers = {
+        "flaky": ReplayServer(
+            rate_429=args.rate_429, retry_after=args.retry_after, rate_5xx=args.rate_5xx
+        ),
+        "windowed": ReplayServer(
+            rate_429=args.window_429, retry_after=args.retry_after, hold_429=True
+        ),
+    }
+    for run, server in servers.items():
+        with server:
+            got, wall = fetch(server, names, args)
+        outcomes, wrong = compare(expected, got)
+        # requests already in flight when a window opens are the only excuse
+        early = server.ignored - server.windows * (args.workers - 1)
+        failures += wrong + max(0, early)
+        errors = {"429": server.throttled, "503": server.unavailable, "total": server.requests}
+        if server.hold_429:
+            errors.update(windows=server.windows, inside_window=server.ignored)
+        print(
+            f"{'FAIL' if wrong or early > 0 else 'ok':<5} {run:<9} {wall:.2f}s  "
+            f"server {errors}\n      outcomes {dict(outcomes)}, dead letters {dead_letters()}"
+        )
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
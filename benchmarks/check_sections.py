@@ -0,0 +1,89 @@
+# benchmarks/check_sections.py
+"""
+Check that section-targeted fetching keeps what parsing needs, against the
+replay server, run from the project root:
+
+    python -m benchmarks.check_sections
+
+Every recorded page is fetched whole (`page_html`) and with
+`fetch_mode="sections"` (`section_html`), and both are run through
+`extract_all_sections`. `action=parse` renders with the legacy parser, which
+does not wrap sections in `<section>` tags the way the REST API's Parsoid
+HTML does, so the whole page is compared in that flat form
+(`replay_server.legacy_html`). The sectioned page must give the same lead and
+infobox education rows as the whole page, the same content for every
+section it keeps, and keep every section whose title matches
+`section_keywords`; pages without such a section must fall back to the
+whole page. Prints the bytes and requests each way and exits non-zero on
+any difference.
+"""
+
+import logging
+import sys
+
+from benchmarks.replay_server import ReplayServer, legacy_html
+from professional_profiler import metrics
+from professional_profiler.parsing.extractors import extract_all_sections
+from professional_profiler.scraping.wikipedia_search import WikimediaClient
+
+PSEUDO = ("_lead_", "_infobox_education_")
+
+
+def downloaded(mode: str) -> float:
+    return metrics.REGISTRY.counters.get(("wiki_page_bytes_total", (("mode", mode),)), 0)
+
+
+def compare(full: list[dict], sectioned: list[dict], keywords: tuple) -> list[str]:
+    """Differences of `sectioned` from `full`, as printable lines."""
+    whole = {s["title"]: s["content"] for s in full}
+    kept = {s["title"]: s["content"] for s in sectioned}
+    problems = [f"{t} differs" for t, c in kept.items() if whole.get(t) != c]
+    problems += [f"{t} missing" for t in PSEUDO if t in whole and t not in kept]
+    problems += [
+        f"{t} missing" for t in whole if t not in kept and any(k in t.lower() for k in keywords)
+    ]
+    return problems
+
+
+def main() -> int:
+    logging.getLogger("professional_profiler").setLevel(logging.ERROR)
+    metrics.enable()
+
+    failures = 0
+    with ReplayServer() as server:
+        with WikimediaClient(
+            base_url=server.url, action_url=server.url + "/w/api.php", fetch_mode="sections"
+        ) as client:
+            for key in server.pages:
+                start = server.requests
+                full = client.page_html(key)
+                whole = server.requests - start
+                start = server.requests
+                part = client.fetch_page(key)
+                parted = server.requests - start
+
+                sectioned = extract_all_sections(part)
+                problems = compare(
+                    extract_all_sections(legacy_html(full)), sectioned, client.section_keywords
+                )
+                if part == full:
+                    mode = "full page"
+                else:
+                    mode = ", ".join(s["title"] for s in sectioned)
+                failures += bool(problems)
+                print(
+                    f"{'FAIL' if problems else 'ok':<5} {key:<20} {len(full):>6} -> "
+                    f"{len(part):>6} chars  {whole} -> {parted} requests  {mode}"
+                )
+                for problem in problems:
+                    print(f"      {problem}")
+
+    print(
+        f"downloaded {downloaded('full'):.0f} bytes of whole pages, "
+        f"{downloaded('sections'):.0f} bytes of sections"
+    )
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,54 @@
+# benchmarks/check_titles.py
+"""
+Check that batched title resolution gives the same outcomes as searching
+every name, against the replay server, run from the project root:
+
+    python -m benchmarks.check_titles
+
+Every recorded name (plus its lower-case and underscored spellings, so
+normalization and unresolved names are covered) is resolved once with
+`WikimediaClient.search` per name and once with `search_many`, which sends
+`TITLES_PER_QUERY` names per `action=query` request and only searches the
+rest. Prints the requests each way and exits non-zero on any difference.
+"""
+
+import logging
+import sys
+
+from benchmarks.replay_server import ReplayServer
+from professional_profiler.scraping.wikipedia_search import WikimediaClient
+
+
+def spellings(name: str) -> list[str]:
+    return [name, name.lower(), name.replace(" ", "_")]
+
+
+def main() -> int:
+    logging.getLogger("professional_profiler").setLevel(logging.ERROR)
+
+    with ReplayServer() as server:
+        names = [s for name in server.search for s in spellings(name)]
+
+        def client() -> WikimediaClient:
+            return WikimediaClient(base_url=server.url, action_url=server.url + "/w/api.php")
+
+        with client() as one:
+            start = server.requests
+            expected = {name: one.search(name) for name in names}
+            per_name = server.requests - start
+        with client() as bulk:
+            start = server.requests
+            got = bulk.search_many(names)
+            batched = server.requests - start
+
+    failures = 0
+    for name in names:
+        ok = got[name] == expected[name]
+        failures += not ok
+        print(f"{'ok' if ok else 'FAIL':<5} {name!r:<28} {expected[name]:<20} {got[name]}")
+    print(f"{len(names)} names: {per_name} requests searching each, {batched} batched")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
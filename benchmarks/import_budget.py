@@ -0,0 +1,83 @@
+# benchmarks/import_budget.py
+"""
+Import-time budget for the parsing package, run from the project root:
+
+    python -m benchmarks.import_budget
+    python -m benchmarks.import_budget --budget-ms 80 --top 15
+
+Each module is imported in a fresh interpreter under `python -X importtime`
+(best of `--repeat` runs, so a cold disk cache does not count) and its
+cumulative import time is compared with the budget. The slowest dependencies
+are listed to show what to defer next. Exits non-zero when a module is over
+budget.
+"""
+
+import argparse
+import subprocess
+import sys
+
+# module -> budget in milliseconds; bs4, nltk, pydantic and the pattern files
+# are loaded on first use, so none of these pay for them at import
+BUDGETS = {
+    "professional_profiler.parsing": 5.0,
+    "professional_profiler.parsing.utils": 5.0,
+    "professional_profiler.parsing.extractors": 40.0,
+    "professional_profiler.parsing.batch": 60.0,
+}
+
+
+def import_times(module: str) -> dict[str, int]:
+    """
+    Cumulative import time in microseconds of `module` and of every module it
+    pulls in (interpreter start-up imports such as `site` are left out).
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []  # (depth, name, cumulative), children are printed before their parent
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((depth, name.strip(), int(cumulative)))
+
+    end = next(i for i, row in enumerate(rows) if row[1] == module)
+    depth = rows[end][0]
+    start = end
+    while start > 0 and rows[start - 1][0] > depth:
+        start -= 1
+    return {name: cumulative for _, name, cumulative in rows[start : end + 1]}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("modules", nargs="*", default=list(BUDGETS))
+    parser.add_argument("--budget-ms", type=float, help="override the per-module budget")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top", type=int, default=8)
+    args = parser.parse_args()
+
+    over = 0
+    for module in args.modules:
+        runs = [import_times(module) for _ in range(args.repeat)]
+        best = min(runs, key=lambda times: times[module])
+        total_ms = best[module] / 1e3
+        budget = args.budget_ms or BUDGETS.get(module, 100.0)
+        ok = total_ms <= budget
+        over += not ok
+        status = "ok" if ok else "OVER"
+        print(f"{status:<5} {module:<45} {total_ms:8.1f} ms  (budget {budget:g} ms)")
+        heaviest = sorted(
+            (item for item in best.items() if item[0] != module), key=lambda item: -item[1]
+        )
+        for name, micros in heaviest[: args.top]:
+            print(f"        {name:<43} {micros / 1e3:8.1f} ms")
+    return 1 if over else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,45 @@
+# benchmarks/pages.py
+"""
+Synthetic Wikipedia-shaped pages for the benchmarks.
+
+Pages mimic the REST `/page/{key}/html` structure the parser expects: a
+`div.mw-parser-output` with an infobox, lead paragraphs, nested headings,
+citation markers and the usual reference/navbox junk.
+"""
+
+FILLER = (
+    "He wrote a weekly column on politics and the economy for the paper[{n}] "
+    "and appeared regularly on television as a commentator. "
+    "His reporting covered state government, campaigns and local elections."
+)
+STRICT = "He received his B.A. in history from Harvard College in {year}."
+LOOSE = "He graduated from Harvard College in {year} with a degree in history."
+
+
+def synthetic_biography(
+    sections: int = 8, paragraphs: int = 6, strict: bool = False, depth: int = 2
+) -> str:
+    """Build one page; `strict=False` leaves only loose degree mentions."""
+    degree = STRICT if strict else LOOSE
+    parts = [
+        '<div class="mw-parser-output">',
+        '<div class="hatnote">For other people named Example, see Example.</div>',
+        '<table class="infobox"><tr><th>Born</th><td>1950</td></tr>'
+        "<tr><th>Alma mater</th><td>Harvard College</td></tr></table>",
+        "<p>Example Person is an American journalist.[1]</p>",
+    ]
+    for s in range(sections):
+        level = 2 + (s % depth)
+        parts.append(f"<h{level}>Section {s}</h{level}>")
+        for p in range(paragraphs):
+            text = FILLER.format(n=s * paragraphs + p)
+            if s == 1 and p == 0:
+                text += " " + degree.format(year=1970 + s)
+            parts.append(f'<p>{text}<sup class="reference">[{p}]</sup></p>')
+    parts += [
+        "<h2>References</h2>",
+        '<div class="reflist"><ol class="references"><li>Ref</li></ol></div>',
+        '<table class="navbox"><tr><td>Nav</td></tr></table>',
+        "</div>",
+    ]
+    return "\n".join(parts)
@@ -0,0 +1,344 @@
+# benchmarks/replay_server.py
+"""
+Local stand-in for the Wikimedia APIs, used by `run_suite` and `check_titles`.
+
+Replays the search replies recorded in `fixtures/replay/recording.json` and
+serves the HTML of `fixtures/pages` for the page keys listed there, on the
+same paths `WikimediaClient` requests (`/{lang}/search/page?q=...`, matched
+ignoring case and underscores, and `/{lang}/page/{key}/html`). Multi-title
+`/w/api.php?action=query&titles=...` requests are answered from the
+recorded articles and redirects the way MediaWiki does (title
+normalization, `redirects`, missing pages and the `disambiguation` page
+prop, `formatversion=2`), and `action=parse` requests for the section index
+(`prop=sections|revid`) or the HTML of one section (`prop=text&section=N`)
+are answered by splitting the fixture page at its headings, the way the
+legacy parser numbers sections. Every reply is delayed by `latency` seconds plus
+up to `jitter` more, and a `rate_429` share of requests is answered with
+`429 Too Many Requests` and a `Retry-After` header instead (a `rate_5xx`
+share with `503 Service Unavailable`). With `hold_429`, a 429 opens a
+throttle window like a real rate limiter: every request until `Retry-After`
+has passed is answered 429 too and counted in `ignored`. Point a client at
+it with `WikimediaClient(base_url=server.url, action_url=server.url +
+"/w/api.php")`.
+
+Run on its own to poke at it by hand:
+
+    python -m benchmarks.replay_server --port 8765 --latency 0.05 --rate-429 0.1
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlsplit
+
+FIXTURES = Path(__file__).parent / "fixtures"
+RECORDING = FIXTURES / "replay" / "recording.json"
+HEADING = re.compile(r"^h[2-6]$")
+
+
+def load_recording(path: Path = RECORDING) -> tuple[dict, dict[str, str]]:
+    """The recording, and page HTML by page key."""
+    recording = json.loads(path.read_text(encoding="utf-8"))
+    pages = {
+        key: (FIXTURES / "pages" / f"{stem}.html").read_text(encoding="utf-8")
+        for key, stem in recording["pages"].items()
+    }
+    return recording, pages
+
+
+def _fold(query: str) -> str:
+    return " ".join(query.replace("_", " ").split()).casefold()
+
+
+def normalize_title(title: str) -> str:
+    """MediaWiki's title normalization for the main namespace."""
+    title = " ".join(title.replace("_", " ").split())
+    return title[:1].upper() + title[1:]
+
+
+def _top_nodes(parent):
+    """Children of `parent`, with Parsoid `<section>` wrappers flattened away."""
+    for node in parent.children:
+        if getattr(node, "name", None) == "section":
+            yield from _top_nodes(node)
+        else:
+            yield node
+
+
+def _heading(node):
+    """The `<hN>` of a top-level heading node (bare or in a `mw-heading` div), or None."""
+    name = getattr(node, "name", None)
+    if name is None:
+        return None
+    if HEADING.match(name):
+        return node
+    if name == "div" and "mw-heading" in (node.get("class") or []):
+        return node.find(HEADING)
+    return None
+
+
+def _root(html: str):
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    return soup.select_one("div.mw-parser-output") or soup.body or soup
+
+
+def legacy_html(html: str) -> str:
+    """The page as the legacy parser would render it: flat, in one parser-output div."""
+    body = "".join(map(str, _top_nodes(_root(html))))
+    return f'<div class="mw-parser-output">{body}</div>'
+
+
+def split_sections(html: str) -> tuple[list[dict], list[str]]:
+    """
+    `action=parse` view of a page: the `sections` index and the HTML of every
+    section, section 0 being the lead. Section N runs from its heading up to
+    the next heading of the same or a higher level, subsections included.
+    """
+    nodes = list(_top_nodes(_root(html)))
+    starts = [(i, _heading(node)) for i, node in enumerate(nodes)]
+    starts = [(i, h) for i, h in starts if h is not None]
+
+    sections, texts = [], ["".join(map(str, nodes[: starts[0][0] if starts else None]))]
+    numbers: list[int] = []
+    for n, (i, h) in enumerate(starts):
+        level = int(h.name[1])
+        depth = level - 1
+        numbers = numbers[:depth] + [0] * (depth - len(numbers))
+        numbers[depth - 1] += 1
+        end = next((j for j, g in starts[n + 1 :] if int(g.name[1]) <= level), len(nodes))
+        sections.append(
+            {
+                "toclevel": len([x for x in numbers if x]),
+                "level": str(level),
+                "line": h.get_text(strip=True),
+                "number": ".".join(str(x) for x in numbers if x),
+                "index": str(n + 1),
+                "anchor": h.get("id") or h.get_text(strip=True).replace(" ", "_"),
+            }
+        )
+        texts.append("".join(map(str, nodes[i:end])))
+    return sections, texts
+
+
+class ReplayServer:
+    """Threaded HTTP server replaying a recording, usable as a context manager."""
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        rate_429: float = 0.0,
+        retry_after: int = 1,
+        port: int = 0,
+        seed: int = 0,
+        recording: Path = RECORDING,
+        rate_5xx: float = 0.0,
+        hold_429: bool = False,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_429 = rate_429
+        self.rate_5xx = rate_5xx
+        self.retry_after = retry_after
+        self.hold_429 = hold_429
+        recorded, self.pages = load_recording(recording)
+        self.search = recorded["search"]
+        # search is insensitive to case and underscores, like CirrusSearch
+        self._search_replies = {_fold(q): reply for q, reply in self.search.items()}
+        self.articles = recorded.get("articles", {})
+        self.redirects = recorded.get("redirects", {})
+        # revision id by page key, and the split pages for action=parse
+        self.revisions = {key: n for n, key in enumerate(self.pages, start=1)}
+        self._split: dict[str, tuple[list[dict], list[str]]] = {}
+        self.requests = 0
+        self.throttled = 0
+        self.unavailable = 0
+        # throttle windows opened and requests that arrived inside one
+        self.windows = 0
+        self.ignored = 0
+        self._throttled_until = 0.0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "ReplayServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _draw(self) -> tuple[float, int | None]:
+        """Delay and the error status (429, 503) if any for the next request."""
+        with self._lock:
+            self.requests += 1
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            now = time.monotonic()
+            if now < self._throttled_until:
+                self.ignored += 1
+                self.throttled += 1
+                return delay, 429
+            throttle = self._random.random() < self.rate_429
+            self.throttled += throttle
+            if throttle and self.hold_429:
+                self.windows += 1
+                self._throttled_until = now + self.retry_after
+            # only drawn when asked for, so recorded runs keep their stream
+            unavailable = bool(self.rate_5xx) and self._random.random() < self.rate_5xx
+            self.unavailable += unavailable and not throttle
+        return delay, 429 if throttle else 503 if unavailable else None
+
+    def _query_titles(self, titles: list[str]) -> dict:
+        query: dict = {"pages": []}
+        for title in dict.fromkeys(titles):
+            target = normalize_title(title)
+            if target != title:
+                query.setdefault("normalized", []).append({"from": title, "to": target})
+            if target in self.redirects:
+                query.setdefault("redirects", []).append(
+                    {"from": target, "to": self.redirects[target]}
+                )
+                target = self.redirects[target]
+            if target in self.articles:
+                pageid = list(self.articles).index(target) + 1
+                page = {"pageid": pageid, "ns": 0, "title": target}
+                if self.articles[target]:
+                    page["pageprops"] = self.articles[target]
+            else:
+                page = {"ns": 0, "title": target, "missing": True}
+            if page not in query["pages"]:
+                query["pages"].append(page)
+        return {"batchcomplete": True, "query": query}
+
+    def _parse(self, query: dict) -> dict:
+        if "oldid" in query:
+            revid = int(query["oldid"][0])
+            key = next((k for k, r in self.revisions.items() if r == revid), None)
+        else:
+            title = normalize_title(query.get("page", [""])[0])
+            key = self.redirects.get(title, title).replace(" ", "_")
+        if key not in self.pages:
+            return {
+                "error": {
+                    "code": "missingtitle",
+                    "info": "The page you specified doesn't exist.",
+                }
+            }
+        with self._lock:
+            if key not in self._split:
+                self._split[key] = split_sections(self.pages[key])
+            sections, texts = self._split[key]
+        parse = {"title": key.replace("_", " "), "pageid": self.revisions[key]}
+        parse["revid"] = self.revisions[key]
+        props = query.get("prop", ["text"])[0].split("|")
+        if "sections" in props:
+            parse["sections"] = sections
+        if "text" in props:
+            index = int(query.get("section", ["0"])[0])
+            if index >= len(texts):
+                return {
+                    "error": {"code": "nosuchsection", "info": f"There is no section {index}."}
+                }
+            parse["text"] = (
+                '<div class="mw-content-ltr mw-parser-output" lang="en" dir="ltr">'
+                + texts[index]
+                + "</div>"
+            )
+        return {"parse": parse}
+
+    def _reply(self, path: str, query: dict) -> tuple[int, str, bytes]:
+        if path == "/w/api.php" and query.get("action") == ["query"]:
+            titles = query.get("titles", [""])[0].split("|")
+            data = self._query_titles(titles)
+            return 200, "application/json", json.dumps(data).encode("utf-8")
+        if path == "/w/api.php" and query.get("action") == ["parse"]:
+            data = self._parse(query)
+            return 200, "application/json", json.dumps(data).encode("utf-8")
+        parts = [unquote(p) for p in path.strip("/").split("/")]
+        if len(parts) == 3 and parts[1:] == ["search", "page"]:
+            name = query.get("q", [""])[0]
+            data = self._search_replies.get(_fold(name), {"pages": []})
+            return 200, "application/json", json.dumps(data).encode("utf-8")
+        if len(parts) == 4 and parts[1] == "page" and parts[3] == "html":
+            html = self.pages.get(parts[2])
+            if html is not None:
+                return 200, "text/html; charset=utf-8", html.encode("utf-8")
+        return 404, "application/json", b'{"httpCode": 404, "httpReason": "Not Found"}'
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                delay, error = server._draw()
+                if delay:
+                    time.sleep(delay)
+                if error:
+                    status, ctype = error, "application/json"
+                    body = json.dumps({"httpCode": error}).encode("utf-8")
+                else:
+                    url = urlsplit(self.path)
+                    status, ctype, body = server._reply(url.path, parse_qs(url.query))
+                self.send_response(status)
+                self.send_header("Content-Type", ctype)
+                self.send_header("Content-Length", str(len(body)))
+                if error == 429:
+                    self.send_header("Retry-After", str(server.retry_after))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--rate-5xx", type=float, default=0.0)
+    parser.add_argument("--hold-429", action="store_true", help="429s open a throttle window")
+    args = parser.parse_args()
+    server = ReplayServer(
+        args.latency,
+        args.jitter,
+        args.rate_429,
+        args.retry_after,
+        port=args.port,
+        rate_5xx=args.rate_5xx,
+        hold_429=args.hold_429,
+    )
+    print(f"replaying {len(server.search)} searches and {len(server.pages)} pages")
+    print(f"base_url: {server.url}")
+    with server:
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,267 @@
+# benchmarks/run_suite.py
+"""
+End-to-end benchmark against the local replay server, run from the project
+root:
+
+    python -m benchmarks.run_suite                     # compare with the baseline
+    python -m benchmarks.run_suite --latency 0.05 --rate-429 0.05
+    python -m benchmarks.run_suite --save-baseline     # after an intended change
+
+`--authors` names from the recording are resolved the way the scrape does
+(`fetch_author` on `--workers` threads sharing one `WikimediaClient`, after
+batched title lookups with `--bulk-titles`, downloading only the keyword
+sections with `--fetch-mode sections`), but
+against `replay_server.ReplayServer`, and every page is parsed on the main
+thread as it arrives, like the streaming run. Reported per stage (fetch,
+sections, sentences) are the p50/p90/p99 latencies per author, plus
+pages/sec (authors whose page was fetched) over the whole run and the peak
+RSS of the process. Each fixture page is parsed once before the clock starts,
+so parser and pattern set-up do not land in the first samples.
+
+The report is compared with `baseline.json`: a p50/p90 latency or peak RSS
+more than `--tolerance` above the baseline, or pages/sec more than `--tolerance` below
+it, is a regression and the exit status is non-zero (p99 is reported but too
+noisy over a few hundred samples to gate on). Baselines are only
+comparable between runs with the same settings (they are stored with the
+report) on the same machine.
+"""
+
+import argparse
+import itertools
+import json
+import logging
+import resource
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+from benchmarks.replay_server import ReplayServer
+from professional_profiler.parsing.extractors import (
+    extract_all_sections,
+    scan_degree_sentences,
+)
+from professional_profiler.scraping.fetcher import FetchResult, fetch_author, resolve_batches
+from professional_profiler.scraping.wikipedia_search import (
+    SKIP_KEYS,
+    FetchError,
+    WikimediaClient,
+)
+
+BASELINE = Path(__file__).parent / "baseline.json"
+STAGES = ("fetch", "sections", "sentences")
+
+
+def percentiles(samples: list[float]) -> dict:
+    """Nearest-rank p50/p90/p99 and mean of `samples` (seconds), in milliseconds."""
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+
+    def rank(p: float) -> float:
+        return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))] * 1e3
+
+    return {
+        "count": len(ordered),
+        "mean_ms": round(sum(ordered) / len(ordered) * 1e3, 3),
+        "p50_ms": round(rank(50), 3),
+        "p90_ms": round(rank(90), 3),
+        "p99_ms": round(rank(99), 3),
+    }
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return round(peak / (1 << 20 if sys.platform == "darwin" else 1 << 10), 1)
+
+
+def _timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def run(args) -> dict:
+    timings: dict[str, list[float]] = {stage: [] for stage in STAGES}
+    skipped: dict[str, str] = {}
+    outcomes: Counter = Counter()
+
+    def fetch(name: str, client: WikimediaClient, key: str | None):
+        start = time.perf_counter()
+        try:
+            result = fetch_author(name, client, key)
+        except FetchError as e:
+            result = FetchResult(e.key or "", "", e.failure)
+        return result, time.perf_counter() - start
+
+    with ReplayServer(
+        args.latency,
+        args.jitter,
+        args.rate_429,
+        args.retry_after,
+        seed=args.seed,
+        rate_5xx=args.rate_5xx,
+    ) as server:
+        for html in server.pages.values():
+            sections = extract_all_sections(html)
+            try:
+                scan_degree_sentences(sections)
+            except LookupError as e:  # nltk punkt data not installed
+                skipped["sentences"] = next(
+                    line.strip() for line in str(e).splitlines() if line.strip("* ")
+                )
+
+        names = list(itertools.islice(itertools.cycle(server.search), args.authors))
+        client = WikimediaClient(
+            retry=args.retries,
+            timeout=args.max_wait,
+            backoff=args.retry_wait,
+            pool_size=args.workers,
+            base_url=server.url,
+            action_url=server.url + "/w/api.php",
+            fetch_mode=args.fetch_mode,
+        )
+        start = time.perf_counter()
+        with client, ThreadPoolExecutor(max_workers=args.workers) as pool:
+            if args.bulk_titles:
+                items = resolve_batches(names, client)
+            else:
+                items = ((idx, name, None) for idx, name in enumerate(names))
+            futures = [pool.submit(fetch, name, client, key) for _, name, key in items]
+            for fut in as_completed(futures):
+                result, elapsed = fut.result()
+                timings["fetch"].append(elapsed)
+                if result.failure is not None:
+                    outcomes[result.failure.value] += 1
+                    continue
+                if result.key in SKIP_KEYS:
+                    outcomes[result.key] += 1
+                    continue
+                outcomes["page"] += 1
+                sections, elapsed = _timed(extract_all_sections, result.source)
+                timings["sections"].append(elapsed)
+                if "sentences" not in skipped:
+                    _, elapsed = _timed(scan_degree_sentences, sections)
+                    timings["sentences"].append(elapsed)
+        wall = time.perf_counter() - start
+
+    return {
+        "settings": {
+            "authors": args.authors,
+            "workers": args.workers,
+            "latency": args.latency,
+            "jitter": args.jitter,
+            "rate_429": args.rate_429,
+            "rate_5xx": args.rate_5xx,
+            "retries": args.retries,
+            "retry_after": args.retry_after,
+            "retry_wait": args.retry_wait,
+            "max_wait": args.max_wait,
+            "seed": args.seed,
+            "bulk_titles": args.bulk_titles,
+            "fetch_mode": args.fetch_mode,
+        },
+        "wall_s": round(wall, 3),
+        "pages_per_sec": round(outcomes["page"] / wall, 2),
+        "peak_rss_mb": peak_rss_mb(),
+        "outcomes": dict(outcomes),
+        "requests": {
+            "total": server.requests,
+            "throttled": server.throttled,
+            "unavailable": server.unavailable,
+        },
+        "stages": {stage: percentiles(timings[stage]) for stage in STAGES},
+        "skipped": skipped,
+    }
+
+
+def print_report(report: dict) -> None:
+    print(
+        f"{report['settings']['authors']} authors in {report['wall_s']:.2f}s, "
+        f"{report['pages_per_sec']:.1f} pages/sec, peak RSS {report['peak_rss_mb']:.1f} MB"
+    )
+    print(f"outcomes {report['outcomes']}  requests {report['requests']}")
+    for stage, stats in report["stages"].items():
+        if stage in report["skipped"]:
+            print(f"{stage:<10} skipped: {report['skipped'][stage]}")
+        elif stats["count"]:
+            print(
+                f"{stage:<10} p50 {stats['p50_ms']:8.2f} ms  p90 {stats['p90_ms']:8.2f} ms  "
+                f"p99 {stats['p99_ms']:8.2f} ms  (n={stats['count']})"
+            )
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Regressions of `report` against `baseline`, as printable lines."""
+    if report["settings"] != baseline["settings"]:
+        print(f"warning: baseline settings differ: {baseline['settings']}")
+    # (label, current, baseline, higher is better)
+    checks = [
+        ("pages/sec", report["pages_per_sec"], baseline["pages_per_sec"], True),
+        ("peak RSS MB", report["peak_rss_mb"], baseline["peak_rss_mb"], False),
+    ]
+    for stage, stats in report["stages"].items():
+        base = baseline["stages"].get(stage, {})
+        for metric in ("p50_ms", "p90_ms"):
+            if metric in stats and metric in base:
+                checks.append((f"{stage} {metric}", stats[metric], base[metric], False))
+
+    regressions = []
+    for label, current, base, higher_is_better in checks:
+        change = (current - base) / base if base else 0.0
+        worse = -change if higher_is_better else change
+        flag = "REGRESSION" if worse > tolerance else ""
+        print(f"{label:<20} {base:10.2f} -> {current:10.2f}  {change:+7.1%}  {flag}")
+        if flag:
+            regressions.append(f"{label}: {base} -> {current}")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--authors", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds per reply")
+    parser.add_argument("--jitter", type=float, default=0.01, help="extra random seconds")
+    parser.add_argument("--rate-429", type=float, default=0.02, help="share of 429 replies")
+    parser.add_argument("--rate-5xx", type=float, default=0.0, help="share of 503 replies")
+    parser.add_argument("--retry-after", type=int, default=0, help="Retry-After of 429s")
+    parser.add_argument("--retries", type=int, default=5)
+    parser.add_argument("--retry-wait", type=float, default=0.05, help="client backoff base")
+    parser.add_argument("--max-wait", type=float, default=2.0, help="longest client wait")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--bulk-titles", action="store_true", help="batch title lookups")
+    parser.add_argument("--fetch-mode", choices=("full", "sections"), default="full")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--output", type=Path, help="also write the report here")
+    args = parser.parse_args()
+
+    # per-page parse warnings would drown the report
+    logging.getLogger("professional_profiler").setLevel(logging.ERROR)
+    report = run(args)
+    print_report(report)
+    text = json.dumps(report, indent=2) + "\n"
+    if args.output:
+        args.output.write_text(text, encoding="utf-8")
+    if args.save_baseline:
+        args.baseline.write_text(text, encoding="utf-8")
+        print(f"saved baseline to {args.baseline}")
+        return 0
+    if not args.baseline.exists():
+        print(f"no baseline at {args.baseline}, run with --save-baseline")
+        return 0
+    regressions = compare(
+        report, json.loads(args.baseline.read_text(encoding="utf-8")), args.tolerance
+    )
+    if regressions:
+        print(f"{len(regressions)} regression(s) over {args.tolerance:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
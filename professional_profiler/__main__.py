@@ -1,17 +1,53 @@
 # professional_profiler/__main__.py
 """
-    This module is the entry point for professional profiler pipeline that runs
-    - wikipedia 'scraping' (I'm using the API)
-    - professional studies data extraction agent
+This module is the entry point for professional profiler pipeline that runs
+- wikipedia 'scraping' (I'm using the API)
+- parsing of the degree sentences out of each page
+- professional studies data extraction agent
+
+Scraping and parsing run as one streaming stage graph (see `pipeline.py`):
+name -> search key -> HTML in the fetch threads, HTML -> sections -> degree
+sentences in the parsing processes, and the rows of each author are written
+as soon as that author is parsed. Sections and sentences are produced by the
+same worker call, so section text is never shipped between processes.
 """
+
 # ===== IMPORTS =====
 import sys
+import time
+from professional_profiler import metrics
 from professional_profiler.logging.logger import setup_logging, get_logger
+from professional_profiler.config import load_app_config
+from professional_profiler.parsing.batch import ParsingPool
+from professional_profiler.parsing.extractors import ParsedPage
+from professional_profiler.pipeline import Pipeline
+from professional_profiler.scraping.cache import ResponseCache
+from professional_profiler.scraping.checkpoint import (
+    FAILED,
+    RETRYABLE,
+    ProgressLedger,
+    ResultWriter,
+)
+from professional_profiler.scraping.fetcher import iter_fetch
+from professional_profiler.scraping.names import normalize_names, unique_queries
+from professional_profiler.scraping.storage import PageStore
+import pandas as pd
 
 logger = get_logger(__name__)
 
 # ===== FUNCTIONS =====
 
+
+def parse_stage(pool: ParsingPool):
+    def parse(item: tuple) -> tuple:
+        _, _, result = item
+        if result.failure is not None:
+            return item, ParsedPage("")
+        return item, pool.parse(result.source)
+
+    return parse
+
+
 # ===== MAIN =====
 
 
@@ -20,7 +56,109 @@ def main():
     setup_logging()
 
     logger.info("Starting full pipeline")
-    # cfg = load_app_config()
+    cfg = load_app_config()
+    # before the parsing pool starts, so its workers record too
+    metrics.enable(cfg.metrics.enabled)
+    file_conf = cfg.scraping.file
+    output_path = cfg.scraping.paths.processed_data
+
+    subjects = pd.read_csv(cfg.scraping.paths.authors)
+    if len(subjects) == 0:
+        logger.error("No subjects found in the file.")
+        return
+    if file_conf.raw_name_column:
+        subjects[file_conf.name_column] = normalize_names(subjects[file_conf.raw_name_column])
+
+    # Skip authors finished by a previous run
+    ledger = ProgressLedger(
+        output_path + file_conf.ledger, max_attempts=cfg.scraping.wikipedia.max_attempts
+    )
+    todo = subjects[~subjects[file_conf.id_column].map(ledger.is_finished)]
+    todo = todo.reset_index(drop=True)
+    logger.info("%d of %d subjects left to process", len(todo), len(subjects))
+    # one search and parse per distinct query, recorded for every author sharing it
+    queries, groups = unique_queries(todo[file_conf.name_column])
+
+    cache = (
+        ResponseCache.from_settings(cfg.scraping.cache) if cfg.scraping.cache.enabled else None
+    )
+    scraped = ResultWriter(
+        output_path + file_conf.name, fieldnames=[*subjects.columns, "key", "failure"]
+    )
+    parsed = ResultWriter(
+        cfg.parsing.paths.results_path + cfg.parsing.file.file_name,
+        fieldnames=["id", "author_name", "sentences", "degree_types"],
+    )
+    pages = PageStore(output_path + file_conf.pages)
+    start, write_busy = time.perf_counter(), 0.0
+    try:
+        with ParsingPool(cfg.parsing.workers, cfg.parsing.chunk_size) as pool:
+            # two tasks per process keep every worker busy while results travel back
+            threads = pool.workers * 2 if pool.workers > 1 else 1
+            pipeline = (
+                Pipeline(cfg.pipeline.queue_size)
+                .source(
+                    "fetch",
+                    iter_fetch(
+                        queries,
+                        cfg.scraping.wikipedia,
+                        cache=cache,
+                        dump_conf=cfg.scraping.dump,
+                    ),
+                )
+                .stage("parse", parse_stage(pool), threads=threads)
+            )
+            # stops the fetch and parse threads if writing fails
+            with pipeline:
+                for (idx, _, result), page in pipeline:
+                    write_start = time.perf_counter()
+                    failure = result.failure.value if result.failure else ""
+                    for row in todo.iloc[groups[idx]].to_dict("records"):
+                        author_id, name = row[file_conf.id_column], row[file_conf.name_column]
+                        # store the page before the ledger marks the author as finished
+                        if result.failure is None:
+                            pages.put(author_id, result.key, result.source)
+                        status = ledger.record(author_id, name, result.key, result.failure)
+                        if status == FAILED:
+                            logger.error("Giving up on %s: %s", name, failure)
+                        if status != RETRYABLE:
+                            scraped.write({**row, "key": result.key, "failure": failure})
+                            parsed.write(
+                                {
+                                    "id": author_id,
+                                    "author_name": name,
+                                    "sentences": page.markdown,
+                                    "degree_types": page.degree_types,
+                                }
+                            )
+                    write_busy += time.perf_counter() - write_start
+    finally:
+        pages.close()
+        parsed.close()
+        scraped.close()
+        ledger.close()
+    logger.info("Progress: %s", ledger.summary())
+    wall, busy = time.perf_counter() - start, {**pipeline.busy, "write": write_busy}
+    logger.info(
+        "Pipeline finished in %.1fs, busy per stage: %s",
+        wall,
+        ", ".join(f"{stage} {secs:.1f}s" for stage, secs in busy.items()),
+    )
+
+    if cache is not None:
+        cache.evict()
+        stats = cache.stats()
+        logger.info("Cache hits: %s, misses: %s", stats["hits"], stats["misses"])
+        cache.close()
+
+    if cfg.metrics.enabled:
+        metrics.set_gauge("pipeline_wall_seconds", wall)
+        metrics.set_gauge("pipeline_authors", len(todo))
+        metrics.set_gauge("pipeline_queries", len(queries))
+        for stage, secs in busy.items():
+            metrics.set_gauge("pipeline_busy_seconds", secs, stage=stage)
+        metrics.write_report(cfg.metrics.json_path, cfg.metrics.prometheus_path)
+        logger.info("Metrics written to %s", cfg.metrics.json_path)
 
 
 if __name__ == "__main__":
@@ -1,5 +1,6 @@
 # professional_profiler/config.py
 from pathlib import Path
+from typing import Literal
 from pydantic import BaseModel
 import yaml
 
@@ -14,20 +15,58 @@ class srapingPaths(BaseModel):
 class scrapingfile(BaseModel):
     name: str
     name_column: str
+    id_column: str = "id"
+    raw_name_column: str = ""  # "Last, First; suffix" column normalized into name_column
+    ledger: str = "/progress.jsonl"
+    pages: str = "/pages.sqlite"
 
 
 class wikipediaSettings(BaseModel):
     rate_limit: int
     max_retries: int
-    timeout: int
+    timeout: float  # longest wait before a retry, a longer Retry-After dead-letters the author
     response_code: int
     language: str
+    max_workers: int = 8  # authors resolved concurrently
+    burst: int = 1  # token bucket capacity on top of rate_limit
+    pool_size: int = 10  # keep-alive connections held by the shared session
+    max_attempts: int = 3  # runs an author stays retryable before it is marked failed
+    bulk_titles: bool = True  # resolve exact titles 50 per action=query before searching
+    backoff: float = 1.0  # first retry waits up to this, doubling per attempt (full jitter)
+    dead_letter_rounds: int = 2  # end-of-run retries of authors that failed transiently
+    dead_letter_wait: float = 60  # minimum seconds before a dead-lettered author is retried
+    base_url: str = "https://api.wikimedia.org/core/v1/wikipedia"  # REST search and page HTML
+    action_url: str = ""  # Action API, empty for https://{language}.wikipedia.org/w/api.php
+    backend: Literal["api", "dump"] = "api"  # live API, or a local dump (scraping.dump)
+    fetch_mode: Literal["full", "sections"] = "full"  # whole page, or lead + keyword sections
+    # headings whose sections fetch_mode "sections" downloads
+    section_keywords: list[str] = [
+        "early life",
+        "education",
+        "career",
+        "biography",
+        "background",
+    ]
+
+
+class cacheSettings(BaseModel):
+    enabled: bool = True
+    path: str = "data/cache/wikipedia.sqlite"
+    ttl_days: float = 30
+    max_size_mb: int = 2048
+
+
+class dumpSettings(BaseModel):
+    path: str = "data/dumps/enwiki_namespace_0"  # Enterprise HTML .ndjson file or directory
+    index_path: str = ""  # title index, defaults to <path>.idx
 
 
 class scrapingConfig(BaseModel):
     paths: srapingPaths
     wikipedia: wikipediaSettings
     file: scrapingfile
+    cache: cacheSettings = cacheSettings()
+    dump: dumpSettings = dumpSettings()
 
 
 class parsingPaths(BaseModel):
@@ -42,14 +81,70 @@ class parsingFile(BaseModel):
     file_name: str
 
 
+class parsingCacheSettings(BaseModel):
+    enabled: bool = True
+    path: str = "data/cache/parsing.sqlite"
+    max_size_mb: int = 1024
+
+
 class parsingConfig(BaseModel):
     paths: parsingPaths
     file: parsingFile
+    cache: parsingCacheSettings = parsingCacheSettings()
+    batch_size: int = 1024  # pages read from the page store at a time
+    workers: int = 0  # parsing processes, 0 = one per CPU core, 1 = no pool
+    chunk_size: int = 16  # pages sent to a worker per task
+    backend: Literal["html5lib", "lxml", "selectolax"] = "html5lib"
+
+
+class extractionPaths(BaseModel):
+    results_path: str = "data/processed/extracted_files"
+
+
+class extractionFile(BaseModel):
+    file_name: str = "/extracted_results.jsonl"
+
+
+class extractionCacheSettings(BaseModel):
+    enabled: bool = True
+    path: str = "data/cache/extraction.sqlite"
+    max_size_mb: int = 256
+
+
+class extractionConfig(BaseModel):
+    paths: extractionPaths = extractionPaths()
+    file: extractionFile = extractionFile()
+    cache: extractionCacheSettings = extractionCacheSettings()
+    base_url: str = "https://api.deepseek.com/v1"  # any OpenAI-compatible endpoint
+    model: str = "deepseek-chat"
+    api_key_env: str = "DEEPSEEK_API_KEY"  # environment variable holding the key
+    temperature: float = 0.0
+    max_concurrency: int = 16  # requests in flight at once
+    tokens_per_minute: int = 200_000
+    max_tokens: int = 512  # completion tokens per request
+    max_retries: int = 3
+    timeout: float = 60
+    apply_chunking: bool = True
+    chunk_token_threshold: int = 5000  # tokens per snippet chunk
+    overlap_rate: float = 0.25  # share of a chunk repeated at the start of the next
+
+
+class pipelineConfig(BaseModel):
+    queue_size: int = 64  # items buffered between two stages
+
+
+class metricsConfig(BaseModel):
+    enabled: bool = False
+    json_path: str = "data/metrics/run.json"
+    prometheus_path: str = "data/metrics/run.prom"  # empty to skip the textfile
 
 
 class AppConfig(BaseModel):
     scraping: scrapingConfig
     parsing: parsingConfig
+    extraction: extractionConfig = extractionConfig()
+    pipeline: pipelineConfig = pipelineConfig()
+    metrics: metricsConfig = metricsConfig()
 
 
 def load_app_config(path: str | Path = _APP_YAML) -> AppConfig:
@@ -0,0 +1,86 @@
+# ===== IMPORTS =====
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+from professional_profiler.config import load_app_config
+from professional_profiler.extraction.cache import ExtractionCache
+from professional_profiler.extraction.engine import ExtractionEngine
+from professional_profiler.logging.logger import get_logger, setup_logging
+
+logger = get_logger(__name__)
+
+# ===== FUNCTIONS =====
+
+
+def load_finished(path: Path) -> set[str]:
+    """Ids already written by a previous run."""
+    if not path.exists():
+        return set()
+    finished = set()
+    with path.open(encoding="utf-8") as fh:
+        for line in fh:
+            try:
+                finished.add(str(json.loads(line)["id"]))
+            except (json.JSONDecodeError, KeyError):
+                logger.warning("Skipping unreadable line in %s", path)
+    return finished
+
+
+async def run(config) -> None:
+    parsed_path = config.parsing.paths.results_path + config.parsing.file.file_name
+    output_path = Path(config.extraction.paths.results_path + config.extraction.file.file_name)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    parsed = pd.read_csv(parsed_path, dtype={"id": str}, keep_default_na=False)
+    finished = load_finished(output_path)
+    todo = parsed[~parsed["id"].isin(finished)]
+    logger.info("%d of %d authors left to extract", len(todo), len(parsed))
+
+    cache_conf = config.extraction.cache
+    cache = ExtractionCache.from_settings(cache_conf) if cache_conf.enabled else None
+    failed = 0
+    async with ExtractionEngine.from_settings(config.extraction, cache=cache) as engine:
+        with output_path.open("a", encoding="utf-8") as out:
+            authors = todo[["id", "author_name", "sentences"]].itertuples(index=False)
+            async for result in engine.extract_many(authors):
+                if result.profile is None:
+                    # not written, so the next run tries this author again
+                    failed += 1
+                    continue
+                record = {
+                    "id": result.author_id,
+                    "author_name": result.author_name,
+                    **result.profile.model_dump(mode="json"),
+                }
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                out.flush()
+    logger.info("Extraction finished, %d authors failed", failed)
+    logger.info("Snippets answered: %s", engine.calls)
+
+    if cache is not None:
+        cache.evict()
+        cache.close()
+
+
+# ===== MAIN =====
+
+
+def main():
+    logger.info("Starting LLM extraction")
+    config = load_app_config()
+    asyncio.run(run(config))
+
+
+if __name__ == "__main__":
+    setup_logging()
+    try:
+        main()
+    except Exception:
+        logger = get_logger(__name__)
+        logger.exception("Fatal error in extraction")
+        sys.exit(1)
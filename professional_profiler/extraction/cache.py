@@ -0,0 +1,147 @@
+# professional_profiler/extraction/cache.py
+"""
+Content-addressed cache for LLM extraction replies.
+
+A reply is keyed by the hash of the normalized snippet, the model name and
+the prompt version (`prompt.PROMPT_VERSION`), so re-running the extraction
+only calls the model for snippets it has not answered with the current
+prompt, and authors with the same snippet share one answer. Normalizing
+drops markdown headings, bullets, citation marks, case and extra whitespace
+(including the spaces the section extractor leaves around punctuation), which
+is enough to fold the common infobox-only lines together. Snippets
+without a single degree sentence (the "NOT HTML" fallback, an empty
+"## Degree Mentions" block) are answered without a model call at all. The
+store is a SQLite file kept under `max_bytes` by evicting the least recently
+used replies, as in `scraping.cache`.
+"""
+
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from professional_profiler.logging.logger import get_logger
+from professional_profiler.models import FieldEnum, ProfessionalProfiler, Study
+
+logger = get_logger(__name__)
+
+_CITATION_RE = re.compile(r"\[\s*(?:\d+|[a-z]|citation needed)\s*\]", re.IGNORECASE)
+_SPACE_RE = re.compile(r"\s+")
+# get_text(" ") leaves "Harvard University ( BA )" and "Boston , MA"
+_PUNCT_SPACE_RE = re.compile(r"\s+(?=[),.;:])|(?<=\()\s+")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS replies (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    prompt_version TEXT NOT NULL,
+    reply TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS replies_accessed ON replies (accessed_at);
+"""
+
+
+def normalize_snippet(snippet: str) -> str:
+    """The degree sentences of a `parsing` snippet, one per line, in canonical form."""
+    lines = []
+    for line in snippet.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#") or line == "NOT HTML":
+            continue
+        line = _CITATION_RE.sub(" ", line.removeprefix("- "))
+        line = _PUNCT_SPACE_RE.sub("", _SPACE_RE.sub(" ", line)).strip().casefold()
+        if line:
+            lines.append(line)
+    return "\n".join(lines)
+
+
+def cache_key(normalized: str, model: str, prompt_version: str) -> str:
+    return hashlib.sha256(
+        "\0".join((model, prompt_version, normalized)).encode("utf-8")
+    ).hexdigest()
+
+
+def trivial_answer(normalized: str) -> Optional[ProfessionalProfiler]:
+    """The reply for a snippet that needs no model call, or None."""
+    if not normalized:
+        return ProfessionalProfiler(studies=[Study(degree_type=FieldEnum.NONE)])
+    return None
+
+
+class ExtractionCache:
+    """SQLite reply store, safe to share between threads."""
+
+    def __init__(self, path: str | Path, max_bytes: int = 256 << 20):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    @classmethod
+    def from_settings(cls, cache_conf) -> "ExtractionCache":
+        """Build a cache from the `extraction.cache` config section."""
+        return cls(cache_conf.path, max_bytes=cache_conf.max_size_mb * 1024 * 1024)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def get(self, key: str) -> Optional[ProfessionalProfiler]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT reply FROM replies WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._conn.execute(
+                "UPDATE replies SET accessed_at = ? WHERE key = ?", (time.time(), key)
+            )
+            self._conn.commit()
+        return ProfessionalProfiler.model_validate_json(row[0])
+
+    def put(
+        self, key: str, model: str, prompt_version: str, profile: ProfessionalProfiler
+    ) -> None:
+        reply = profile.model_dump_json()
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO replies VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, model, prompt_version, reply, len(reply), now, now),
+            )
+            self._conn.commit()
+
+    def evict(self) -> int:
+        """Drop least recently used replies until the table fits `max_bytes`."""
+        with self._lock:
+            row = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM replies").fetchone()
+            total = row[0]
+            if total <= self.max_bytes:
+                return 0
+            removed = 0
+            rows = self._conn.execute("SELECT key, size FROM replies ORDER BY accessed_at")
+            for key, size in rows.fetchall():
+                if total <= self.max_bytes:
+                    break
+                self._conn.execute("DELETE FROM replies WHERE key = ?", (key,))
+                total -= size
+                removed += 1
+            self._conn.commit()
+        logger.info("Evicted %d cached replies to stay under %d bytes", removed, self.max_bytes)
+        return removed
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses}
@@ -0,0 +1,197 @@
+# professional_profiler/extraction/chunking.py
+"""
+Token-budgeted chunking of degree snippets, see "Chunking & Text Processing"
+in the README (`chunk_token_threshold: 5000`, `overlap_rate: 0.25`).
+
+A snippet (the `degrees_to_markdown` output, or `extract_all_sections`
+sections) is cut into sentence units that remember their section title.
+Units are packed into chunks of at most `threshold` tokens, each chunk
+starts again with the title of every section it covers, and consecutive
+chunks share their last `overlap_rate * threshold` tokens of units (fewer
+when the next unit would not fit beside them) so a degree split across a
+boundary is seen whole at least once.
+
+Tokens are counted with tiktoken when it is installed and its encoding can
+be loaded (the encoder is built once and cached, texts are counted in one
+`encode_ordinary_batch` call); otherwise a regex approximation with the same
+interface is used.
+"""
+
+import re
+from functools import lru_cache
+from typing import Callable, Iterable, NamedTuple, Optional
+
+from professional_profiler.logging.logger import get_logger
+
+try:
+    import tiktoken
+except ImportError:  # optional dependency, counts are approximated without it
+    tiktoken = None
+
+logger = get_logger(__name__)
+
+DEFAULT_ENCODING = "cl100k_base"
+
+# words, numbers and single punctuation marks, roughly one BPE token each
+_APPROX_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+(?=[A-Z(\"'])")
+
+
+class Unit(NamedTuple):
+    title: str
+    text: str
+    tokens: int
+
+
+@lru_cache(maxsize=4)
+def get_tokenizer(encoding: str = DEFAULT_ENCODING) -> Callable[[list[str]], list[int]]:
+    """Batch token counter for `encoding`, built once per process."""
+    if tiktoken is not None:
+        try:
+            encoder = tiktoken.get_encoding(encoding)
+        except Exception as e:  # e.g. the encoding file cannot be downloaded
+            logger.warning("tiktoken encoding %s unavailable (%s), approximating", encoding, e)
+        else:
+            return lambda texts: [len(ids) for ids in encoder.encode_ordinary_batch(texts)]
+    return lambda texts: [len(_APPROX_TOKEN_RE.findall(text)) for text in texts]
+
+
+def count_tokens(texts: list[str], encoding: str = DEFAULT_ENCODING) -> list[int]:
+    return get_tokenizer(encoding)(texts) if texts else []
+
+
+def _header(title: str) -> str:
+    return "# Lead" if title == "_lead_" else f"## {title}"
+
+
+def markdown_sections(snippet: str) -> list[dict]:
+    """Split `degrees_to_markdown` output back into `{"title", "content"}` sections."""
+    sections: list[dict] = []
+    for line in snippet.splitlines():
+        line = line.strip()
+        if line.startswith("#"):
+            title = line.lstrip("#").strip()
+            sections.append({"title": "_lead_" if title == "Lead" else title, "content": []})
+        elif line:
+            if not sections:
+                sections.append({"title": "", "content": []})
+            sections[-1]["content"].append(line.removeprefix("- "))
+    return [{"title": s["title"], "content": "\n".join(s["content"])} for s in sections]
+
+
+def _units(sections: Iterable[dict], encoding: str) -> list[Unit]:
+    pieces = [
+        (sec["title"], sent)
+        for sec in sections
+        for line in sec["content"].splitlines()
+        for sent in _SENTENCE_END_RE.split(line.strip())
+        if sent
+    ]
+    counts = count_tokens([text for _, text in pieces], encoding)
+    return [Unit(title, text, n) for (title, text), n in zip(pieces, counts)]
+
+
+def _split_long(unit: Unit, limit: int, encoding: str) -> list[Unit]:
+    """Cut a unit longer than `limit` tokens on word boundaries."""
+    words = unit.text.split()
+    counts = count_tokens([w + " " for w in words], encoding)
+    parts, current, size = [], [], 0
+    for word, n in zip(words, counts):
+        if current and size + n > limit:
+            parts.append(Unit(unit.title, " ".join(current), size))
+            current, size = [], 0
+        current.append(word)
+        size += n
+    if current:
+        parts.append(Unit(unit.title, " ".join(current), size))
+    return parts
+
+
+def _render(units: list[Unit]) -> str:
+    lines, title = [], None
+    for unit in units:
+        if unit.title != title:
+            if lines:
+                lines.append("")
+            if unit.title:
+                lines.append(_header(unit.title))
+            title = unit.title
+        lines.append(f"- {unit.text}")
+    return "\n".join(lines)
+
+
+def chunk_sections(
+    sections: list[dict],
+    threshold: int = 5000,
+    overlap_rate: float = 0.25,
+    encoding: str = DEFAULT_ENCODING,
+) -> list[str]:
+    """
+    Markdown chunks of `sections`, each at most `threshold` tokens (headers
+    included, as counted by `count_tokens`), overlapping by `overlap_rate`.
+    """
+    if not 0 <= overlap_rate < 1:
+        raise ValueError("overlap_rate must be in [0, 1)")
+    titles = list(dict.fromkeys(sec["title"] for sec in sections))
+    header_tokens = dict(zip(titles, count_tokens([_header(t) for t in titles], encoding)))
+    # "- " per unit and a newline between lines, counted as one token each
+    units = []
+    for unit in _units(sections, encoding):
+        limit = threshold - header_tokens[unit.title] - 2
+        units.extend(_split_long(unit, limit, encoding) if unit.tokens > limit else [unit])
+    overlap = int(threshold * overlap_rate)
+
+    def cost(unit: Unit, seen_titles: set) -> int:
+        header = header_tokens[unit.title] if unit.title not in seen_titles else 0
+        return unit.tokens + 2 + header
+
+    chunks: list[list[Unit]] = []
+    current: list[Unit] = []
+    size = 0
+    seen_titles: set[str] = set()
+    for unit in units:
+        unit_cost = cost(unit, seen_titles)
+        if current and size + unit_cost > threshold:
+            chunks.append(current)
+            # carry the tail of the closed chunk over, within the overlap budget
+            tail, tail_size = [], 0
+            for prev in reversed(current):
+                if tail_size + prev.tokens + 2 > overlap:
+                    break
+                tail.insert(0, prev)
+                tail_size += prev.tokens + 2
+            current = tail
+            seen_titles = {u.title for u in tail}
+            size = tail_size + sum(header_tokens[t] for t in seen_titles)
+            unit_cost = cost(unit, seen_titles)
+            # shorten the carried tail until it leaves room for the unit
+            while current and size + unit_cost > threshold:
+                current = current[1:]
+                seen_titles = {u.title for u in current}
+                size = sum(u.tokens + 2 for u in current)
+                size += sum(header_tokens[t] for t in seen_titles)
+                unit_cost = cost(unit, seen_titles)
+        current.append(unit)
+        seen_titles.add(unit.title)
+        size += unit_cost
+    if current:
+        chunks.append(current)
+    return [_render(chunk) for chunk in chunks]
+
+
+def chunk_snippet(
+    snippet: str,
+    threshold: int = 5000,
+    overlap_rate: float = 0.25,
+    encoding: str = DEFAULT_ENCODING,
+    tokens: Optional[int] = None,
+) -> list[str]:
+    """
+    `chunk_sections` for a markdown snippet. Returns `[snippet]` unchanged
+    when it already fits (`tokens` may pass a count the caller already has).
+    """
+    if tokens is None:
+        tokens = count_tokens([snippet], encoding)[0]
+    if tokens <= threshold:
+        return [snippet]
+    return chunk_sections(markdown_sections(snippet), threshold, overlap_rate, encoding)
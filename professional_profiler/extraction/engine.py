@@ -0,0 +1,367 @@
+# professional_profiler/extraction/engine.py
+"""
+Async extraction engine for an OpenAI-compatible chat completions endpoint.
+
+Every author's degree sentences (the `parsing` output) become one request.
+`max_concurrency` requests are in flight at once, each request first takes
+its estimated token count from a shared per-minute `TokenBudget`, transient
+failures (network errors, 429 and 5xx) are retried with exponential backoff
+honouring `Retry-After`, and every reply is validated against the `Study` /
+`FieldEnum` models, with invalid replies retried like transient failures.
+Trivial snippets, snippets answered before (`cache.ExtractionCache`) and
+snippets identical to one already in flight never reach the model. Snippets
+over `chunk_token_threshold` tokens are sent in overlapping chunks
+(`chunking.chunk_snippet`) and the chunk replies are merged.
+
+The endpoint is a plain URL, so tests can point the engine at a local mock
+server (or pass an `httpx.AsyncClient` with a mock transport).
+"""
+
+import asyncio
+import json
+import os
+import random
+import time
+from typing import AsyncIterator, Iterable, NamedTuple, Optional
+
+import httpx
+from pydantic import ValidationError
+
+from professional_profiler.logging.logger import get_logger
+from professional_profiler.models import FieldEnum, ProfessionalProfiler, Study
+from .cache import ExtractionCache, cache_key, normalize_snippet, trivial_answer
+from .chunking import chunk_snippet, count_tokens
+from .prompt import PROMPT_VERSION, build_messages
+
+logger = get_logger(__name__)
+
+RETRY_STATUS = {408, 409, 429, 500, 502, 503, 504}
+MAX_BACKOFF = 60.0
+
+
+class ExtractionError(Exception):
+    """An author's degrees could not be extracted after all retries."""
+
+
+class ExtractionResult(NamedTuple):
+    author_id: str
+    author_name: str
+    profile: Optional[ProfessionalProfiler]
+    error: Optional[str] = None
+
+
+class TokenBudget:
+    """
+    Token bucket over LLM tokens per minute for a single event loop.
+
+    `acquire` reserves the estimated tokens right away (the balance may go
+    negative) and sleeps until that reservation is covered, like
+    `scraping.fetcher.TokenBucket`; `settle` gives back the difference once
+    the reply reports the tokens actually used.
+    """
+
+    def __init__(self, tokens_per_minute: int):
+        if tokens_per_minute <= 0:
+            raise ValueError("tokens_per_minute must be positive")
+        self.rate = tokens_per_minute / 60.0
+        self.capacity = float(tokens_per_minute)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, tokens: int) -> None:
+        self._refill()
+        self._tokens -= tokens
+        if self._tokens < 0:
+            await asyncio.sleep(-self._tokens / self.rate)
+
+    def settle(self, reserved: int, used: int) -> None:
+        self._refill()
+        self._tokens = min(self.capacity, self._tokens + reserved - used)
+
+
+def _retry_after(response: Optional[httpx.Response]) -> Optional[float]:
+    if response is None:
+        return None
+    try:
+        return float(response.headers["Retry-After"])
+    except (KeyError, ValueError):
+        return None
+
+
+def _strip_fences(content: str) -> str:
+    content = content.strip()
+    if content.startswith("```"):
+        content = content.split("\n", 1)[1] if "\n" in content else ""
+        content = content.rsplit("```", 1)[0]
+    return content.strip()
+
+
+def parse_reply(content: str) -> ProfessionalProfiler:
+    """
+    Validate a model reply. Accepts the README's `[{"studies": [...]}]` list as
+    well as a bare `{"studies": [...]}` object, and `FieldEnum` member names
+    ("BACHELOR") as well as values ("Bachelor's"). Raises `ValueError`.
+    """
+    data = json.loads(_strip_fences(content))
+    if isinstance(data, list):
+        if len(data) != 1:
+            raise ValueError(f"expected one studies object, got {len(data)}")
+        data = data[0]
+    if not isinstance(data, dict):
+        raise ValueError(f"expected a JSON object, got {type(data).__name__}")
+    for study in data.get("studies") or []:
+        if isinstance(study, dict) and study.get("degree_type") in FieldEnum.__members__:
+            study["degree_type"] = FieldEnum[study["degree_type"]].value
+    profile = ProfessionalProfiler.model_validate(data)
+    if not profile.studies:
+        profile.studies.append(Study(degree_type=FieldEnum.NONE))
+    return profile
+
+
+def merge_profiles(profiles: Iterable[ProfessionalProfiler]) -> ProfessionalProfiler:
+    """Union of the studies found in the chunks of one snippet."""
+    studies = {}
+    for profile in profiles:
+        for study in profile.studies:
+            if study.degree_type != FieldEnum.NONE:
+                studies.setdefault((study.degree_type, tuple(study.degree_field or [])), study)
+    return ProfessionalProfiler(
+        studies=list(studies.values()) or [Study(degree_type=FieldEnum.NONE)]
+    )
+
+
+class ExtractionEngine:
+    def __init__(
+        self,
+        base_url: str,
+        model: str,
+        api_key: Optional[str] = None,
+        max_concurrency: int = 16,
+        tokens_per_minute: int = 200_000,
+        max_tokens: int = 512,
+        max_retries: int = 3,
+        timeout: float = 60.0,
+        temperature: float = 0.0,
+        client: Optional[httpx.AsyncClient] = None,
+        cache: Optional[ExtractionCache] = None,
+        chunk_token_threshold: int = 5000,
+        overlap_rate: float = 0.25,
+        apply_chunking: bool = True,
+    ):
+        self.model = model
+        self.max_concurrency = max_concurrency
+        self.max_tokens = max_tokens
+        self.max_retries = max_retries
+        self.temperature = temperature
+        self.chunk_token_threshold = chunk_token_threshold
+        self.overlap_rate = overlap_rate
+        self.apply_chunking = apply_chunking
+        # tokens of the system prompt and examples, sent with every snippet
+        self._prompt_tokens = sum(count_tokens([m["content"] for m in build_messages("")]))
+        self.budget = TokenBudget(tokens_per_minute)
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self.cache = cache
+        # how each snippet was answered: trivially, from the cache, by sharing an
+        # identical request in flight, or by the model
+        self.calls = {"trivial": 0, "cached": 0, "shared": 0, "model": 0}
+        self._inflight: dict[str, asyncio.Future] = {}
+        headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+        self._own_client = client is None
+        self.client = client or httpx.AsyncClient(
+            base_url=base_url.rstrip("/"),
+            headers=headers,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_concurrency),
+        )
+
+    @classmethod
+    def from_settings(
+        cls,
+        conf,
+        client: Optional[httpx.AsyncClient] = None,
+        cache: Optional[ExtractionCache] = None,
+    ):
+        return cls(
+            conf.base_url,
+            conf.model,
+            api_key=os.getenv(conf.api_key_env) if conf.api_key_env else None,
+            max_concurrency=conf.max_concurrency,
+            tokens_per_minute=conf.tokens_per_minute,
+            max_tokens=conf.max_tokens,
+            max_retries=conf.max_retries,
+            timeout=conf.timeout,
+            temperature=conf.temperature,
+            client=client,
+            cache=cache,
+            chunk_token_threshold=conf.chunk_token_threshold,
+            overlap_rate=conf.overlap_rate,
+            apply_chunking=conf.apply_chunking,
+        )
+
+    async def aclose(self) -> None:
+        if self._own_client:
+            await self.client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def _complete(self, messages: list[dict], reserved: int) -> tuple[str, int]:
+        """
+        One chat completion, returns the reply text and the tokens used.
+        `reserved` tokens are taken from the budget before the request.
+        """
+        payload = {
+            "model": self.model,
+            "messages": messages,
+            "temperature": self.temperature,
+            "max_tokens": self.max_tokens,
+            "response_format": {"type": "json_object"},
+        }
+        await self.budget.acquire(reserved)
+        used = reserved
+        try:
+            async with self._slots:
+                response = await self.client.post("/chat/completions", json=payload)
+            response.raise_for_status()
+            body = response.json()
+            used = (body.get("usage") or {}).get("total_tokens", reserved)
+            return body["choices"][0]["message"]["content"], used
+        finally:
+            self.budget.settle(reserved, used)
+
+    async def extract(self, sentences: str) -> ProfessionalProfiler:
+        """Degrees mentioned in `sentences`, raises `ExtractionError`."""
+        normalized = normalize_snippet(sentences)
+        profile = trivial_answer(normalized)
+        if profile is not None:
+            self.calls["trivial"] += 1
+            return profile
+        key = cache_key(normalized, self.model, PROMPT_VERSION)
+        if key in self._inflight:
+            self.calls["shared"] += 1
+            profile = await asyncio.shield(self._inflight[key])
+            return profile.model_copy(deep=True)
+        if self.cache is not None:
+            profile = self.cache.get(key)
+            if profile is not None:
+                self.calls["cached"] += 1
+                return profile
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            profile = await self._call_model(sentences)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # retrieved here, identical requests re-raise it
+            raise
+        finally:
+            del self._inflight[key]
+        future.set_result(profile)
+        self.calls["model"] += 1
+        if self.cache is not None:
+            self.cache.put(key, self.model, PROMPT_VERSION, profile)
+        return profile
+
+    async def _call_model(self, sentences: str) -> ProfessionalProfiler:
+        tokens = count_tokens([sentences])[0]
+        if not self.apply_chunking or tokens <= self.chunk_token_threshold:
+            return await self._call_chunk(sentences, tokens)
+        chunks = chunk_snippet(
+            sentences, self.chunk_token_threshold, self.overlap_rate, tokens=tokens
+        )
+        logger.debug("Snippet of %d tokens sent in %d chunks", tokens, len(chunks))
+        counts = count_tokens(chunks)
+        profiles = await asyncio.gather(
+            *(self._call_chunk(chunk, n) for chunk, n in zip(chunks, counts))
+        )
+        return merge_profiles(profiles)
+
+    async def _call_chunk(self, sentences: str, tokens: int) -> ProfessionalProfiler:
+        messages = build_messages(sentences)
+        reserved = self._prompt_tokens + tokens + self.max_tokens
+        last_error = None
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                delay = min(MAX_BACKOFF, 2**attempt) + random.uniform(0, 1)
+                delay = max(delay, _retry_after(getattr(last_error, "response", None)) or 0)
+                logger.debug("Retrying in %.1fs after: %s", delay, last_error)
+                await asyncio.sleep(delay)
+            try:
+                content, _ = await self._complete(messages, reserved)
+                return parse_reply(content)
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code not in RETRY_STATUS:
+                    raise ExtractionError(f"HTTP {e.response.status_code}") from e
+                last_error = e
+            except httpx.TransportError as e:
+                last_error = e
+            except (ValueError, KeyError, IndexError, TypeError, ValidationError) as e:
+                # malformed body or a reply that does not match the schema
+                last_error = e
+        raise ExtractionError(
+            f"gave up after {self.max_retries + 1} attempts: {last_error}"
+        ) from last_error
+
+    async def extract_many(
+        self, authors: Iterable[tuple[str, str, str]]
+    ) -> AsyncIterator[ExtractionResult]:
+        """
+        Yield an `ExtractionResult` for every `(id, name, sentences)` as soon as
+        it finishes. Authors are pulled from `authors` only as earlier ones
+        complete, so large inputs are never all scheduled at once. An author
+        that fails for any reason yields a result with `error` set, an error
+        raised by `authors` itself is raised here.
+        """
+        pending = iter(authors)
+        results: asyncio.Queue = asyncio.Queue(maxsize=self.max_concurrency)
+
+        async def worker() -> None:
+            try:
+                for author_id, author_name, sentences in pending:
+                    try:
+                        profile = await self.extract(sentences)
+                        result = ExtractionResult(author_id, author_name, profile)
+                    except ExtractionError as e:
+                        logger.warning("Extraction failed for %s: %s", author_name, e)
+                        result = ExtractionResult(author_id, author_name, None, str(e))
+                    except Exception as e:
+                        # a bug for this author, not for the whole run
+                        logger.exception("Extraction failed for %s", author_name)
+                        error = f"{type(e).__name__}: {e}"
+                        result = ExtractionResult(author_id, author_name, None, error)
+                    await results.put(result)
+            except Exception as e:
+                # `authors` itself failed, re-raised by the consumer
+                await results.put(e)
+            finally:
+                # a cancelled worker must not wait for room in the queue
+                if not asyncio.current_task().cancelling():
+                    await results.put(None)
+
+        workers = [asyncio.create_task(worker()) for _ in range(self.max_concurrency)]
+        try:
+            running = len(workers)
+            while running:
+                result = await results.get()
+                if result is None:
+                    running -= 1
+                elif isinstance(result, Exception):
+                    raise result
+                else:
+                    yield result
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
@@ -0,0 +1,71 @@
+# professional_profiler/extraction/prompt.py
+"""Prompt for the degree extraction, see "Prompt Engineering" in the README."""
+
+import json
+
+from professional_profiler.models import FieldEnum
+
+# bump whenever the wording or the examples change, cached replies are keyed on it
+PROMPT_VERSION = "1"
+
+_DEGREE_TYPES = ", ".join(f'"{member.value}"' for member in FieldEnum)
+
+SYSTEM_PROMPT = f"""\
+Goal: Identify and categorize academic degrees from a Wikipedia text snippet.
+Respond only with JSON matching the output schema (no extra text or markdown).
+
+Steps:
+1. Scan for keywords (e.g., B.A., M.A., Bachelor, Master, Doctor).
+2. Map each mention to a degree type, one of: {_DEGREE_TYPES}.
+3. Extract associated study fields (optional).
+4. Detect incomplete degrees ("dropped out", "did not graduate") and ignore.
+5. If no completed degree is found, return a single entry with "{FieldEnum.NONE.value}".
+
+Output schema (exact JSON):
+{{"studies": [{{"degree_type": "<degree type>", "degree_field": ["<string>", ...]}}]}}"""
+
+# (snippet, studies) pairs from the README
+EXAMPLES = [
+    (
+        "- He received his Bachelor of Arts from Harvard College in 1980.\n"
+        "- He received his Juris Doctor from the University of California at Berkeley "
+        "in 1986.",
+        [(FieldEnum.BACHELOR, []), (FieldEnum.DOCTOR, ["Juris Doctor"])],
+    ),
+    (
+        "## Academic career\n"
+        "- After attending University City High School in St. Louis, Missouri, Moyn "
+        "earned his A.B. degree from Washington University in St. Louis in history and "
+        "French literature (1994).\n"
+        "- He continued his education, earning a Ph.D. from the University of California "
+        "at Berkeley (2000) and his J.D. from Harvard Law School (2001).",
+        [
+            (FieldEnum.BACHELOR, ["History", "French literature"]),
+            (FieldEnum.DOCTOR, ["Ph.D"]),
+            (FieldEnum.DOCTOR, ["J.D"]),
+        ],
+    ),
+    (
+        "## Early life\n"
+        "- Foster graduated from Falmouth Academy in 1994.\n"
+        "- He enrolled at the College of William & Mary, where he studied physics and "
+        "film studies before dropping out his senior year.",
+        [(FieldEnum.NONE, [])],
+    ),
+]
+
+
+def _answer(studies: list[tuple[FieldEnum, list[str]]]) -> str:
+    return json.dumps(
+        {"studies": [{"degree_type": t.value, "degree_field": f} for t, f in studies]}
+    )
+
+
+def build_messages(sentences: str) -> list[dict]:
+    """Chat messages asking for the degrees in `sentences` (parsing output)."""
+    messages = [{"role": "system", "content": SYSTEM_PROMPT}]
+    for snippet, studies in EXAMPLES:
+        messages.append({"role": "user", "content": snippet})
+        messages.append({"role": "assistant", "content": _answer(studies)})
+    messages.append({"role": "user", "content": sentences})
+    return messages
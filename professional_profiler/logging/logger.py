@@ -11,15 +11,32 @@ format. By default, it is set to `_LOG_YAML`, which
 is a Path object pointing to the logging configuration
 file located in the "config" directory relative to
 :type config_path: str | Path
+
+With `queued=True` (the default) the root handlers from the YAML file are
+moved behind a `QueueListener` thread: loggers only put records on a queue
+and the console/file writes happen off the calling thread. Worker processes
+log through `worker_logging` / `init_worker_logging`, which hand them a
+process-safe queue drained by the same handlers. `stop_logging` flushes the
+queues; it is registered to run at exit.
 """
-import logging.config
+
+import atexit
+import logging
 from pathlib import Path
-import yaml
 
 _LOG_YAML = Path(__file__).parent.parent.parent / "config" / "logging.yaml"
 
+# "threads" and "processes" listeners; logging.handlers is imported on first use
+_listeners: dict = {}
+_worker_queue = None
+
 
-def setup_logging(config_path: str | Path = _LOG_YAML) -> None:
+def setup_logging(config_path: str | Path = _LOG_YAML, queued: bool = True) -> None:
+    # imported here so that modules which only call get_logger stay cheap to import
+    import logging.config
+    import yaml
+
+    stop_logging()
     try:
         cfg = yaml.safe_load(Path(config_path).read_text())
         logging.config.dictConfig(cfg)
@@ -28,6 +45,77 @@ def setup_logging(config_path: str | Path = _LOG_YAML) -> None:
         logging.getLogger(__name__).warning(
             "Failed to load %r: %s—using basicConfig", config_path, e
         )
+    if queued:
+        enqueue_handlers()
+
+
+def enqueue_handlers() -> None:
+    """Replace the root handlers with a `QueueHandler` feeding them from a thread."""
+    import logging.handlers
+    import queue
+
+    root = logging.getLogger()
+    handlers = [h for h in root.handlers if not isinstance(h, logging.handlers.QueueHandler)]
+    if not handlers:
+        return
+    log_queue = queue.SimpleQueue()
+    root.handlers = [logging.handlers.QueueHandler(log_queue)]
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    _listeners["threads"] = listener
+
+
+def worker_logging(context=None):
+    """
+    `(queue, levels)` to pass to `init_worker_logging` in a child process, or
+    None when the handlers are not queued (workers then keep their defaults).
+    `context` is the multiprocessing context the children are started with,
+    the queue has to come from the same one.
+    """
+    import logging.handlers
+
+    global _worker_queue
+    threads = _listeners.get("threads")
+    if threads is None:
+        return None
+    if _worker_queue is None:
+        import multiprocessing
+
+        _worker_queue = (context or multiprocessing).Queue()
+        listener = logging.handlers.QueueListener(
+            _worker_queue, *threads.handlers, respect_handler_level=True
+        )
+        listener.start()
+        _listeners["processes"] = listener
+    levels = {
+        name: logger.level
+        for name, logger in logging.Logger.manager.loggerDict.items()
+        if isinstance(logger, logging.Logger) and logger.level != logging.NOTSET
+    }
+    levels[""] = logging.getLogger().level
+    return _worker_queue, levels
+
+
+def init_worker_logging(log_queue, levels: dict[str, int]) -> None:
+    """Send this process's records to the parent's handlers through `log_queue`."""
+    import logging.handlers
+
+    root = logging.getLogger()
+    root.handlers = [logging.handlers.QueueHandler(log_queue)]
+    for name, level in levels.items():
+        logging.getLogger(name or None).setLevel(level)
+
+
+def stop_logging() -> None:
+    """Write out the queued records and stop the listener threads."""
+    global _worker_queue
+    for listener in _listeners.values():
+        listener.stop()
+    _listeners.clear()
+    _worker_queue = None
+
+
+atexit.register(stop_logging)
 
 
 def get_logger(name: str = None):
@@ -0,0 +1,279 @@
+# professional_profiler/metrics.py
+"""
+Run metrics: counters, gauges and timing histograms with a run report.
+
+Instrumented code calls the module functions (`inc`, `observe`, `timer`,
+`timed`); they record into the process-wide `REGISTRY`, which is off until
+`enable()` is called. While it is off every call returns after one flag
+check (`timer` hands back a shared no-op context manager), so an
+uninstrumented run pays next to nothing.
+
+Series are identified by a name and keyword labels, as in Prometheus:
+
+    with metrics.timer("wiki_request_seconds", endpoint="search"):
+        ...
+    metrics.inc("fetch_outcomes_total", outcome="NO_MATCH")
+
+Histograms keep counts over the fixed `BUCKETS` (seconds) plus the sum and
+maximum, so they can be merged across processes: a parsing worker hands its
+`drain()` snapshot back with each result and the parent `merge`s it. At the
+end of a run `write_report` writes the JSON report and/or a Prometheus
+textfile-collector file.
+"""
+
+import functools
+import json
+import math
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import Callable, Optional
+
+# upper bounds in seconds, from a regex pass over one section to a long backoff
+BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, math.inf,
+)  # fmt: skip
+
+PREFIX = "professional_profiler_"
+
+
+def _key(name: str, labels: dict) -> tuple:
+    return (name, tuple(sorted(labels.items())))
+
+
+class Registry:
+    """Thread-safe metric store; `snapshot`/`merge` move it between processes."""
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.counters: dict[tuple, float] = {}
+        self.gauges: dict[tuple, float] = {}
+        # key -> [bucket counts, sum, max]
+        self.histograms: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        key = _key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def set(self, name: str, value: float, **labels) -> None:
+        with self._lock:
+            self.gauges[_key(name, labels)] = value
+
+    def observe(self, name: str, seconds: float, **labels) -> None:
+        key = _key(name, labels)
+        idx = bisect_left(BUCKETS, seconds)
+        with self._lock:
+            hist = self.histograms.get(key)
+            if hist is None:
+                hist = self.histograms[key] = [[0] * len(BUCKETS), 0.0, 0.0]
+            hist[0][idx] += 1
+            hist[1] += seconds
+            hist[2] = max(hist[2], seconds)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "counters": dict(self.counters),
+                "gauges": dict(self.gauges),
+                "histograms": {k: [list(h[0]), h[1], h[2]] for k, h in self.histograms.items()},
+            }
+
+    def drain(self) -> dict:
+        """Snapshot and reset, for workers that ship their metrics per task."""
+        with self._lock:
+            snap = {
+                "counters": self.counters,
+                "gauges": self.gauges,
+                "histograms": self.histograms,
+            }
+            self.counters, self.gauges, self.histograms = {}, {}, {}
+        return snap
+
+    def merge(self, snap: dict) -> None:
+        with self._lock:
+            for key, value in snap["counters"].items():
+                self.counters[key] = self.counters.get(key, 0) + value
+            self.gauges.update(snap["gauges"])
+            for key, (counts, total, peak) in snap["histograms"].items():
+                hist = self.histograms.get(key)
+                if hist is None:
+                    self.histograms[key] = [list(counts), total, peak]
+                    continue
+                hist[0] = [a + b for a, b in zip(hist[0], counts)]
+                hist[1] += total
+                hist[2] = max(hist[2], peak)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counters, self.gauges, self.histograms = {}, {}, {}
+
+    def report(self) -> dict:
+        """JSON-ready view: series grouped by name, histograms with quantile bounds."""
+        snap = self.snapshot()
+        report: dict = {"counters": {}, "gauges": {}, "histograms": {}}
+        for kind in ("counters", "gauges"):
+            for (name, labels), value in sorted(snap[kind].items()):
+                report[kind].setdefault(name, []).append(
+                    {"labels": dict(labels), "value": value}
+                )
+        for (name, labels), (counts, total, peak) in sorted(snap["histograms"].items()):
+            count = sum(counts)
+            report["histograms"].setdefault(name, []).append(
+                {
+                    "labels": dict(labels),
+                    "count": count,
+                    "sum": round(total, 6),
+                    "mean": round(total / count, 6) if count else 0.0,
+                    "max": round(peak, 6),
+                    # bucket upper bound holding the quantile, capped by the maximum
+                    **{
+                        f"p{q}": round(min(peak, _quantile_bound(counts, count * q / 100)), 6)
+                        for q in (50, 90, 99)
+                    },
+                }
+            )
+        return report
+
+    def prometheus(self) -> str:
+        """Prometheus text exposition format, for the node_exporter textfile collector."""
+        snap = self.snapshot()
+        lines = []
+        typed = set()
+
+        def header(name: str, kind: str) -> None:
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {PREFIX}{name} {kind}")
+
+        for (name, labels), value in sorted(snap["counters"].items()):
+            header(name, "counter")
+            lines.append(f"{PREFIX}{name}{_labels(labels)} {value}")
+        for (name, labels), value in sorted(snap["gauges"].items()):
+            header(name, "gauge")
+            lines.append(f"{PREFIX}{name}{_labels(labels)} {value}")
+        for (name, labels), (counts, total, _) in sorted(snap["histograms"].items()):
+            header(name, "histogram")
+            cumulative = 0
+            for bound, n in zip(BUCKETS, counts):
+                cumulative += n
+                le = "+Inf" if bound == math.inf else repr(bound)
+                lines.append(
+                    f"{PREFIX}{name}_bucket{_labels(labels + (('le', le),))} {cumulative}"
+                )
+            lines.append(f"{PREFIX}{name}_sum{_labels(labels)} {total}")
+            lines.append(f"{PREFIX}{name}_count{_labels(labels)} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+
+def _quantile_bound(counts: list[int], rank: float) -> float:
+    seen = 0
+    for bound, n in zip(BUCKETS, counts):
+        seen += n
+        if seen >= rank and seen:
+            return bound
+    return 0.0
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: tuple) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels) + "}"
+
+
+REGISTRY = Registry()
+
+
+class _Timer:
+    __slots__ = ("name", "labels", "start")
+
+    def __init__(self, name: str, labels: dict):
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        REGISTRY.observe(self.name, time.perf_counter() - self.start, **self.labels)
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def enable(on: bool = True) -> None:
+    REGISTRY.enabled = on
+
+
+def enabled() -> bool:
+    return REGISTRY.enabled
+
+
+def inc(name: str, value: float = 1, **labels) -> None:
+    if REGISTRY.enabled:
+        REGISTRY.inc(name, value, **labels)
+
+
+def set_gauge(name: str, value: float, **labels) -> None:
+    if REGISTRY.enabled:
+        REGISTRY.set(name, value, **labels)
+
+
+def observe(name: str, seconds: float, **labels) -> None:
+    if REGISTRY.enabled:
+        REGISTRY.observe(name, seconds, **labels)
+
+
+def timer(name: str, **labels):
+    """Context manager recording the seconds spent in its block into histogram `name`."""
+    return _Timer(name, labels) if REGISTRY.enabled else _NULL_TIMER
+
+
+def timed(name: str, **labels) -> Callable:
+    """Decorator form of `timer`."""
+
+    def decorate(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not REGISTRY.enabled:
+                return fn(*args, **kwargs)
+            with _Timer(name, labels):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def write_report(
+    json_path: Optional[str | Path] = None, prometheus_path: Optional[str | Path] = None
+) -> None:
+    """Write the run report; the Prometheus file is replaced atomically."""
+    if json_path:
+        path = Path(json_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(REGISTRY.report(), indent=2) + "\n", encoding="utf-8")
+    if prometheus_path:
+        path = Path(prometheus_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(REGISTRY.prometheus(), encoding="utf-8")
+        tmp.replace(path)
@@ -0,0 +1,27 @@
+# professional_profiler/models.py
+"""Pydantic models for the extracted degrees, see "Data Validation" in the README."""
+
+from enum import Enum
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class FieldEnum(str, Enum):
+    ASSOCIATE = "Associate's"
+    BACHELOR = "Bachelor's"
+    MASTER = "Master's"
+    DOCTOR = "Doctor's"
+    UNKNOWN = "Unknown"
+    NONE = "No degree"
+
+
+class Study(BaseModel):
+    degree_type: FieldEnum = Field(..., description="Academic degree type")
+    degree_field: Optional[List[str]] = Field(
+        default_factory=list, description="Field(s) of study"
+    )
+
+
+class ProfessionalProfiler(BaseModel):
+    studies: List[Study] = Field(default_factory=list, description="List of academic degrees")
@@ -1,13 +1,16 @@
 import sys
+from pathlib import Path
 import pandas as pd
+from professional_profiler import metrics
 from professional_profiler.logging.logger import get_logger, setup_logging
 from professional_profiler.config import load_app_config
-from professional_profiler.parsing.extractors import extract_degrees_markdown
+from professional_profiler.parsing.batch import ParsingPool
+from professional_profiler.parsing.cache import ParseCache
+from professional_profiler.scraping.storage import PageStore
 
-# Initialize first thing in main
-setup_logging()
 logger = get_logger(__name__)
-config = load_app_config()
+
+COLUMNS = ["id", "author_name", "sentences", "degree_types"]
 
 
 # ===== MAIN =====
@@ -16,22 +19,62 @@ config = load_app_config()
 def main():
     logger.info("Starting parsing")
     # Load the configuration
+    config = load_app_config()
     logger.debug("Configuration loaded: %s", config)
-    # Load the dataset
-    dataset_path = config.scraping.paths.processed_data + config.scraping.file.name
-
-    db = pd.read_csv(dataset_path)
-    logger.info("Loading HTML from DataFrame")
-    db["sentences"] = db["source"].apply(extract_degrees_markdown)
-    # Save the results just the id, name and sentences
-    db = db[["id", "author_name", "sentences"]]
-    # Save the results to a CSV file
+    metrics.enable(config.metrics.enabled)
+    # Load the author metadata, page sources stay in the page store
+    processed = config.scraping.paths.processed_data
+    file_conf = config.scraping.file
+    db = pd.read_csv(
+        processed + file_conf.name, usecols=[file_conf.id_column, file_conf.name_column]
+    )
+    names = dict(zip(db[file_conf.id_column].astype(str), db[file_conf.name_column]))
+
     output_path = config.parsing.paths.results_path + config.parsing.file.file_name
-    db.to_csv(output_path, index=False)
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+    # only pages whose HTML or parsing inputs changed since the last run are parsed
+    cache_conf = config.parsing.cache
+    cache = ParseCache.from_settings(cache_conf) if cache_conf.enabled else None
+    logger.info("Loading HTML from the page store")
+    with (
+        PageStore(processed + file_conf.pages) as store,
+        ParsingPool(config.parsing.workers, config.parsing.chunk_size) as pool,
+    ):
+        first = True
+        for batch in store.iter_batches(config.parsing.batch_size):
+            pages = pd.DataFrame(batch, columns=["id", "key", "source"])
+            pages["author_name"] = pages["id"].map(names)
+            parsed = pool.map(pages["source"], cache=cache)
+            pages["sentences"] = [page.markdown for page in parsed]
+            pages["degree_types"] = [page.degree_types for page in parsed]
+            # Save the results just the id, name, sentences and the regex degree types
+            pages[COLUMNS].to_csv(
+                output_path, mode="w" if first else "a", header=first, index=False
+            )
+            first = False
+    if first:
+        # no pages at all, do not leave an earlier run's results looking current
+        logger.warning("The page store is empty, writing an empty %s", output_path)
+        pd.DataFrame(columns=COLUMNS).to_csv(output_path, index=False)
+    if cache is not None:
+        stats = cache.stats()
+        logger.info(
+            "Parse cache: %d results reused, %d pages re-scanned from cached sections, "
+            "%d pages parsed",
+            stats["hits"]["results"],
+            stats["hits"]["sections"],
+            stats["misses"],
+        )
+        cache.evict()
+        cache.close()
+    if config.metrics.enabled:
+        metrics.write_report(config.metrics.json_path, config.metrics.prometheus_path)
     logger.info("Parsing completed successfully")
 
 
 if __name__ == "__main__":
+    # Initialize first thing
+    setup_logging()
     try:
         main()
     except Exception:
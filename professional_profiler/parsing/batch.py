@@ -0,0 +1,156 @@
+# professional_profiler/parsing/batch.py
+"""
+Process-pool batch parsing for `parse_page`.
+
+Parsing a page is CPU bound (html5lib tree building plus sentence
+tokenization), so pages are spread over a pool of worker processes. The pool
+lives for the whole run, the parent loads the degree patterns once and hands
+them to every worker's initializer (so a `set_patterns` override carries
+over), and `map` returns `ParsedPage` results in input order. With `metrics` enabled in
+the parent, workers record too and send their metrics back with each task,
+so the parent's report covers the parsing done in the pool. Worker log records
+go to the parent's queued handlers (`logger.worker_logging`) instead of each
+process writing the log files itself.
+
+Workers are started from a fork server (spawned where there is none), not
+forked from the parent: the pool starts its processes on first use, when the
+log listener and the pipeline's fetch and parse threads are already running,
+and a plain fork could copy a logging or sqlite lock that one of them holds.
+
+With a `ParseCache`, `map` only sends the pages the cache cannot answer:
+pages with cached sections go through the sentence scan alone, the others
+are parsed in full and their sections come back to be cached. Pages with
+the same HTML in a batch are parsed once.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Callable, Iterable, Optional
+
+from professional_profiler import metrics
+from professional_profiler.logging.logger import (
+    get_logger,
+    init_worker_logging,
+    worker_logging,
+)
+from . import constants
+from .cache import ParseCache, page_digest
+from .extractors import (
+    ParsedPage,
+    extract_degrees_with_sections,
+    page_from_sections,
+    parse_page,
+)
+
+logger = get_logger(__name__)
+
+_START_METHOD = (
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+
+def _init_worker(patterns: constants.Patterns, measure: bool = False, logs=None) -> None:
+    # workers reuse the parent's patterns instead of reading the config again
+    constants.set_patterns(patterns)
+    # a forked worker starts with a copy of the parent's series, which it would send back
+    metrics.REGISTRY.reset()
+    metrics.enable(measure)
+    if logs is not None:
+        init_worker_logging(*logs)
+
+
+def _measured(fn: Callable, items: list) -> tuple[list, dict]:
+    return [fn(item) for item in items], metrics.REGISTRY.drain()
+
+
+class ParsingPool:
+    """
+    Parse page sources with `workers` processes, `chunk_size` pages per task.
+
+    `workers=0` uses one process per CPU core and `workers=1` parses in the
+    calling process without a pool.
+    """
+
+    def __init__(self, workers: int = 0, chunk_size: int = 16):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self._pool = None
+
+    def __enter__(self):
+        if self.workers > 1:
+            logger.info("Starting parsing pool with %d workers", self.workers)
+            context = multiprocessing.get_context(_START_METHOD)
+            if _START_METHOD == "forkserver":
+                # imported once by the server, every worker forks with it loaded
+                context.set_forkserver_preload([parse_page.__module__])
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=(
+                    constants.get_patterns(),
+                    metrics.enabled(),
+                    worker_logging(context),
+                ),
+            )
+        return self
+
+    def __exit__(self, *exc):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def parse(self, source: str) -> ParsedPage:
+        """Parse a single page, blocking until a worker is done with it."""
+        if self._pool is None:
+            return parse_page(source)
+        if metrics.enabled():
+            [page], snap = self._pool.submit(_measured, parse_page, [source]).result()
+            metrics.REGISTRY.merge(snap)
+            return page
+        return self._pool.submit(parse_page, source).result()
+
+    def map(
+        self, sources: Iterable[str], cache: Optional[ParseCache] = None
+    ) -> list[ParsedPage]:
+        """Every source parsed, in input order, see the module docstring for `cache`."""
+        if cache is None:
+            return self._map(parse_page, sources)
+        sources = list(sources)
+        digests = [page_digest(source) for source in sources]
+        # one entry per distinct page, in order of first occurrence
+        unique = {digest: source for digest, source in zip(digests, sources)}
+        parsed = cache.results(list(unique))
+        sections = cache.sections([d for d in unique if d not in parsed])
+        rescan = list(sections)
+        parse = [d for d in unique if d not in parsed and d not in sections]
+        fresh = []
+        for digest, page in zip(
+            rescan, self._map(page_from_sections, [sections[d] for d in rescan])
+        ):
+            parsed[digest] = page
+            fresh.append((digest, page, None))
+        for digest, (page, secs) in zip(
+            parse, self._map(extract_degrees_with_sections, [unique[d] for d in parse])
+        ):
+            parsed[digest] = page
+            fresh.append((digest, page, secs))
+        cache.put_many(fresh)
+        return [parsed[digest] for digest in digests]
+
+    def _map(self, fn: Callable, items: Iterable) -> list:
+        if self._pool is None:
+            return [fn(item) for item in items]
+        if metrics.enabled():
+            items = list(items)
+            chunks = [
+                items[i : i + self.chunk_size] for i in range(0, len(items), self.chunk_size)
+            ]
+            results = []
+            for chunk, snap in self._pool.map(_measured, repeat(fn), chunks):
+                metrics.REGISTRY.merge(snap)
+                results.extend(chunk)
+            return results
+        return list(self._pool.map(fn, items, chunksize=self.chunk_size))
@@ -0,0 +1,221 @@
+# professional_profiler/parsing/cache.py
+"""
+Incremental re-parsing: per-page results keyed by content and parsing inputs.
+
+Every page is identified by the SHA-256 of its HTML. Two things are kept per
+page, each under a fingerprint of the inputs that produced it:
+
+- its sections (`extract_all_sections`), under the parser version, the HTML
+  backend and the section blacklist;
+- its degree markdown and degree types, under the section fingerprint plus the strict and
+  loose degree patterns and the section keywords.
+
+A rerun after adding authors only parses the new pages; after editing
+`degree_pattern.txt`, `loose_degree.txt` or `keywords.txt` it skips HTML parsing and re-runs
+the sentence scan over the cached sections; after editing the blacklist,
+switching `parsing.backend` or bumping `constants.PARSER_VERSION` it parses
+everything again. Authors with the same page share one entry. The SQLite
+file is only used from the parent process (the pool's workers never see
+it) and is kept under `max_bytes` by evicting the least recently used
+entries, as in `scraping.cache`.
+"""
+
+import hashlib
+import json
+import sqlite3
+import time
+import zlib
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+from professional_profiler import metrics
+from professional_profiler.logging.logger import get_logger
+from .constants import PARSER_VERSION, Patterns, get_patterns, parser_backend
+from .extractors import ParsedPage
+
+logger = get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sections (
+    page TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (page, fingerprint)
+);
+CREATE TABLE IF NOT EXISTS results (
+    page TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    markdown TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    accessed_at REAL NOT NULL,
+    degree_types TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (page, fingerprint)
+);
+CREATE INDEX IF NOT EXISTS sections_accessed ON sections (accessed_at);
+CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed_at);
+"""
+
+
+def _digest(*parts: str) -> str:
+    return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+
+def page_digest(source: str) -> str:
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+
+class Fingerprint(NamedTuple):
+    sections: str
+    results: str
+
+
+def fingerprint(
+    patterns: Optional[Patterns] = None, backend: Optional[str] = None
+) -> Fingerprint:
+    """Fingerprints of the parsing inputs, the configured ones by default."""
+    patterns = patterns or get_patterns()
+    sections = _digest(PARSER_VERSION, backend or parser_backend(), *sorted(patterns.blacklist))
+    keywords = patterns.keywords.pattern if patterns.keywords is not None else ""
+    results = _digest(sections, patterns.degree.pattern, patterns.loose.pattern, keywords)
+    return Fingerprint(sections, results)
+
+
+class ParseCache:
+    """SQLite store of page sections and results, used by `ParsingPool.map`."""
+
+    def __init__(
+        self,
+        path: str | Path,
+        max_bytes: int = 1 << 30,
+        fingerprint: Optional[Fingerprint] = None,
+        level: int = 6,
+    ):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._fingerprint = fingerprint
+        self.level = level
+        self.hits = {"results": 0, "sections": 0}
+        self.misses = 0
+        self._conn = sqlite3.connect(self.path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(results)")}
+        if "degree_types" not in columns:
+            # a file from before the types were kept, its rows predate PARSER_VERSION 2
+            self._conn.execute(
+                "ALTER TABLE results ADD COLUMN degree_types TEXT NOT NULL DEFAULT ''"
+            )
+
+    @classmethod
+    def from_settings(cls, cache_conf) -> "ParseCache":
+        """Build a cache from the `parsing.cache` config section."""
+        return cls(cache_conf.path, max_bytes=cache_conf.max_size_mb * 1024 * 1024)
+
+    @property
+    def fingerprint(self) -> Fingerprint:
+        # taken on first use, after any `set_patterns` override
+        if self._fingerprint is None:
+            self._fingerprint = fingerprint()
+        return self._fingerprint
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def _lookup(self, table: str, columns: str, pages: list[str], fp: str) -> dict:
+        found = {}
+        for page in pages:
+            row = self._conn.execute(
+                f"SELECT {columns} FROM {table} WHERE page = ? AND fingerprint = ?", (page, fp)
+            ).fetchone()
+            if row is not None:
+                found[page] = row
+        if found:
+            now = time.time()
+            self._conn.executemany(
+                f"UPDATE {table} SET accessed_at = ? WHERE page = ? AND fingerprint = ?",
+                [(now, page, fp) for page in found],
+            )
+            self._conn.commit()
+        return found
+
+    def results(self, pages: list[str]) -> dict[str, ParsedPage]:
+        """`{page: ParsedPage}` for the pages parsed with the current inputs."""
+        found = self._lookup(
+            "results", "markdown, degree_types", pages, self.fingerprint.results
+        )
+        self.hits["results"] += len(found)
+        metrics.inc("parse_cache_total", len(found), kind="results", result="hit")
+        metrics.inc("parse_cache_total", len(pages) - len(found), kind="results", result="miss")
+        return {page: ParsedPage(*row) for page, row in found.items()}
+
+    def sections(self, pages: list[str]) -> dict[str, list[dict]]:
+        """`{page: sections}` for the pages sectioned with the current backend and blacklist."""
+        found = self._lookup("sections", "body", pages, self.fingerprint.sections)
+        self.hits["sections"] += len(found)
+        self.misses += len(pages) - len(found)
+        metrics.inc("parse_cache_total", len(found), kind="sections", result="hit")
+        metrics.inc(
+            "parse_cache_total", len(pages) - len(found), kind="sections", result="miss"
+        )
+        return {page: json.loads(zlib.decompress(body)) for page, (body,) in found.items()}
+
+    def put_many(self, entries: list[tuple[str, ParsedPage, Optional[list[dict]]]]) -> None:
+        """Store `(page, ParsedPage, sections)` entries, sections None for only the result."""
+        now = time.time()
+        fp = self.fingerprint
+        section_rows, result_rows = [], []
+        for page, parsed, sections in entries:
+            size = len(parsed.markdown) + len(parsed.degree_types)
+            result_rows.append(
+                (page, fp.results, parsed.markdown, size, now, parsed.degree_types)
+            )
+            if sections is not None:
+                body = zlib.compress(json.dumps(sections).encode("utf-8"), self.level)
+                section_rows.append((page, fp.sections, body, len(body), now))
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO sections VALUES (?, ?, ?, ?, ?)", section_rows
+        )
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)", result_rows
+        )
+        self._conn.commit()
+
+    def evict(self) -> int:
+        """Drop least recently used entries until both tables fit `max_bytes`."""
+        total = sum(
+            self._conn.execute(f"SELECT COALESCE(SUM(size), 0) FROM {table}").fetchone()[0]
+            for table in ("sections", "results")
+        )
+        if total <= self.max_bytes:
+            return 0
+        rows = self._conn.execute(
+            "SELECT 'sections', page, fingerprint, size, accessed_at FROM sections "
+            "UNION ALL SELECT 'results', page, fingerprint, size, accessed_at FROM results "
+            "ORDER BY accessed_at"
+        ).fetchall()
+        removed = 0
+        for table, page, fp, size, _ in rows:
+            if total <= self.max_bytes:
+                break
+            self._conn.execute(
+                f"DELETE FROM {table} WHERE page = ? AND fingerprint = ?", (page, fp)
+            )
+            total -= size
+            removed += 1
+        self._conn.commit()
+        logger.info(
+            "Evicted %d parse cache entries to stay under %d bytes", removed, self.max_bytes
+        )
+        return removed
+
+    def stats(self) -> dict:
+        return {"hits": dict(self.hits), "misses": self.misses}
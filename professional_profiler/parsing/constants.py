@@ -1,24 +1,169 @@
+"""
+Degree patterns, section blacklist and parser settings used by `parsing`.
+
+Nothing is read or compiled at import time. `get_patterns()` loads the
+pattern files named in `config/app.yaml` on first use and memoizes the
+compiled result, so worker processes and modules that only need a helper do
+not pay for config parsing, file I/O and the VERBOSE regex compile. The old
+module attributes (`DEGREE_PATTERN`, `LOOSE_DEGREE_RE`, `DEGREE_KEYWORDS_RE`,
+`BLACKLIST_SECTIONS`, `PARSER_BACKEND`) still work and resolve lazily.
+
+`keywords.txt` gates the sentence scan: one literal per line, matched as a
+whole word in any case, or as a word prefix when it ends in "*" ("graduat*").
+Sections without any keyword are not tokenized, so every sentence either
+degree pattern matches must contain one of them.
+
+Tests can swap the patterns with `set_patterns(compile_patterns(...))` and
+restore the configured ones with `set_patterns(None)`.
+"""
+
 import re
-from professional_profiler.config import load_app_config
 import textwrap
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+# bump when a change to the section extraction or the sentence scan changes its
+# output, so `ParseCache` entries written by the older code are not reused
+PARSER_VERSION = "2"
+
+# site-wide junk stripped before sectioning, matched as one selector list
+JUNK_SELECTOR = ", ".join(
+    [
+        "style",
+        "script",
+        "table.navbox",
+        "sup.reference",
+        "span.mw-cite-backlink",
+        "ol.references",
+        "div.reflist",
+        "div.hatnote",
+        "div#toc",
+    ]
+)
+
+
+class Patterns(NamedTuple):
+    degree: re.Pattern
+    loose: re.Pattern
+    blacklist: frozenset
+    # literal scan for "may mention a degree", None scans every section
+    keywords: Optional[re.Pattern] = None
+
+
+_override: Optional[Patterns] = None
+
+
+@lru_cache(maxsize=1)
+def get_config():
+    """The app config, loaded on first use."""
+    from professional_profiler.config import load_app_config
+
+    return load_app_config()
+
+
+def parser_backend() -> str:
+    return get_config().parsing.backend
+
+
+# anchors outside escapes, character classes and VERBOSE comments
+_PATTERN_TOKEN = re.compile(r"\\.|\[(?:\\.|[^\]\\])*\]|#[^\n]*|[\^$]")
+
+
+def _anchored(src: str) -> bool:
+    return any(token in ("^", "$", r"\A", r"\Z") for token in _PATTERN_TOKEN.findall(src))
+
+
+def compile_keywords(keywords) -> Optional[re.Pattern]:
+    """One alternation of the escaped `keywords.txt` literals, None for none."""
+    terms = []
+    # longest first, then alphabetically, so the pattern (part of the results
+    # fingerprint) is the same in every process
+    for keyword in sorted(set(keywords), key=lambda k: (-len(k), k)):
+        if keyword.endswith("*"):
+            terms.append(re.escape(keyword[:-1]))
+        else:
+            terms.append(re.escape(keyword) + r"(?!\w)")
+    if not terms:
+        return None
+    return re.compile(r"(?<!\w)(?:" + "|".join(terms) + ")", re.IGNORECASE)
+
+
+@lru_cache(maxsize=8)
+def compile_patterns(
+    degree_src: str,
+    loose_src: str,
+    blacklist: frozenset = frozenset(),
+    keywords: tuple = (),
+) -> Patterns:
+    # compile under VERBOSE so comments and line-breaks work
+    degree = re.compile(degree_src, re.IGNORECASE | re.VERBOSE)
+    loose = re.compile(loose_src, re.IGNORECASE | re.VERBOSE)
+    gate = compile_keywords(keywords)
+    if gate is not None and (_anchored(degree_src) or _anchored(loose_src)):
+        # an anchored pattern matches a sentence position, not a term the
+        # keywords could stand for, so every section is scanned
+        gate = None
+    return Patterns(degree, loose, frozenset(blacklist), gate)
+
+
+def _read_pattern(path: str) -> str:
+    with open(path, encoding="utf-8") as f:
+        return textwrap.dedent(f.read()).strip()
+
+
+def _read_lines(path: str) -> list[str]:
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+@lru_cache(maxsize=4)
+def load_patterns(
+    degree_re_path: str,
+    degree_loose_re_path: str,
+    blacklist_path: str,
+    keywords_path: str = "",
+) -> Patterns:
+    # load blacklist as a set of lines
+    blacklist = frozenset(_read_lines(blacklist_path))
+    keywords = tuple(_read_lines(keywords_path)) if keywords_path else ()
+    return compile_patterns(
+        _read_pattern(degree_re_path),
+        _read_pattern(degree_loose_re_path),
+        blacklist,
+        keywords,
+    )
 
-config = load_app_config()
 
-# load & strip regex patterns
-with open(config.parsing.paths.degree_re_path, encoding="utf-8") as f:
-    raw = f.read()
+def get_patterns() -> Patterns:
+    """The patterns set with `set_patterns`, or the configured ones."""
+    if _override is not None:
+        return _override
+    paths = get_config().parsing.paths
+    return load_patterns(
+        paths.degree_re_path,
+        paths.degree_loose_re_path,
+        paths.blacklist_path,
+        paths.keywords_path,
+    )
 
-pattern_src = textwrap.dedent(raw).strip()
 
-# 2) compile under VERBOSE so comments and line-breaks work
-DEGREE_PATTERN = re.compile(pattern_src, re.IGNORECASE | re.VERBOSE)
+def set_patterns(patterns: Optional[Patterns]) -> None:
+    """Use `patterns` instead of the configured files, `None` restores them."""
+    global _override
+    _override = patterns
 
-with open(config.parsing.paths.degree_loose_re_path, encoding="utf-8") as f:
-    loose = textwrap.dedent(f.read()).strip()
 
-LOOSE_DEGREE_RE = re.compile(loose, re.IGNORECASE | re.VERBOSE)
+_LAZY = {
+    "DEGREE_PATTERN": "degree",
+    "LOOSE_DEGREE_RE": "loose",
+    "DEGREE_KEYWORDS_RE": "keywords",
+    "BLACKLIST_SECTIONS": "blacklist",
+}
 
 
-# load blacklist as a set of lines
-with open(config.parsing.paths.blacklist_path, "r", encoding="utf-8") as f:
-    BLACKLIST_SECTIONS = {line.strip() for line in f if line.strip()}
+def __getattr__(name: str):
+    if name in _LAZY:
+        return getattr(get_patterns(), _LAZY[name])
+    if name == "PARSER_BACKEND":
+        return parser_backend()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,41 +1,58 @@
-from bs4 import BeautifulSoup, Tag, NavigableString
-from nltk.tokenize import sent_tokenize
+# bs4 and nltk are imported on first use, see `constants` for the patterns
+from __future__ import annotations
+
+from functools import lru_cache, partial
+import logging
 import re
+from typing import TYPE_CHECKING, NamedTuple, Optional
 from .utils import is_html
-from .constants import DEGREE_PATTERN, LOOSE_DEGREE_RE, BLACKLIST_SECTIONS
+from .constants import JUNK_SELECTOR, get_patterns, parser_backend
+from . import fast_html
 from .formatter import degrees_to_markdown
-from professional_profiler.logging.logger import get_logger, setup_logging
+from .sections import HEADING, TEXT, log_sections, nest_sections, split_section_texts
+from professional_profiler import metrics
+from professional_profiler.logging.logger import get_logger
+
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup, Tag
 
-setup_logging()
 logger = get_logger(__name__)
 
+HEADING_RE = re.compile(r"^h[1-6]$")
 
-def extract_all_sections(html: str) -> list[dict]:
-    logger.info("Starting extraction of all sections from HTML.")
-    soup = BeautifulSoup(html, "html5lib")
-
-    # strip site-wide junk
-    for sel in [
-        "style",
-        "script",
-        "table.navbox",
-        "sup.reference",
-        "span.mw-cite-backlink",
-        "ol.references",
-        "div.reflist",
-        "div.hatnote",
-        "div#toc",
-    ]:
-        for el in soup.select(sel):
-            logger.debug(f"Decomposing element: {sel}")
-            el.decompose()
 
-    body = soup.select_one("div.mw-parser-output") or soup
+class ParsedPage(NamedTuple):
+    markdown: str
+    # "; "-joined `FieldEnum` values mentioned in the strict degree sentences
+    degree_types: str = ""
+
+
+@lru_cache(maxsize=1)
+def _sentence_tokenizer():
+    from nltk.tokenize import sent_tokenize
+
+    return sent_tokenize
+
+
+@metrics.timed("sections_seconds")
+def extract_all_sections(html: str, backend: Optional[str] = None) -> list[dict]:
+    """
+    Split a page into lead, heading and `_infobox_education_` sections.
+
+    `backend` is "html5lib" (reference), "lxml" or "selectolax"; all of them
+    produce the same sections on Wikipedia pages. Defaults to `parsing.backend`.
+    """
+    from bs4 import Tag
+
+    backend = backend or parser_backend()
+    if backend == "selectolax":
+        return fast_html.extract_all_sections(html)
+    soup, body = _parse(html, backend)
     sections = []
 
     # Lead paragraph(s)
     lead_chunks = []
-    first_h = body.find(re.compile(r"^h[1-6]$"))
+    first_h = body.find(HEADING_RE)
     for sib in body.children:
         if sib is first_h:
             break
@@ -43,18 +60,17 @@ def extract_all_sections(html: str) -> list[dict]:
             lead_chunks.append(sib.get_text(" ", strip=True))
     lead_text = " ".join(lead_chunks).strip()
     if lead_text:
-        logger.debug("Extracted lead section text.")
         sections.append({"title": "_lead_", "content": lead_text})
 
-    for h in body.find_all(re.compile(r"^h[1-6]$")):
-        title = h.get_text(strip=True)
-        if title in BLACKLIST_SECTIONS:
-            logger.info(f"Skipping blacklisted section: {title}")
-            continue
-        content = extract_section_text(h)
-        if content:
-            logger.debug(f"Extracted section: {title}")
+    skipped, empty = [], []
+    for rec in heading_records(body):
+        title, content = rec["title"], rec["content"]
+        if content is None:
+            skipped.append(title)
+        elif content:
             sections.append({"title": title, "content": content})
+        else:
+            empty.append(title)
 
     # Infobox education as a pseudo-section
     infobox = soup.find("table", class_="infobox")
@@ -73,16 +89,83 @@ def extract_all_sections(html: str) -> list[dict]:
             ):
                 edu_texts.append(cell.get_text(" ", strip=True))
         if edu_texts:
-            logger.debug("Extracted education information from infobox.")
             sections.append({"title": "_infobox_education_", "content": "; ".join(edu_texts)})
 
-    logger.info("Completed extraction of all sections.")
+    log_sections(logger, sections, skipped, empty)
     return sections
 
 
-# Heading-based sections
+def _parse(html: str, backend: str) -> tuple[BeautifulSoup, Tag]:
+    from bs4 import BeautifulSoup
+
+    with metrics.timer("html_parse_seconds", backend=backend):
+        soup = BeautifulSoup(html, backend)
+
+    # strip site-wide junk in a single traversal, nested junk is already gone
+    for el in soup.select(JUNK_SELECTOR):
+        if not el.decomposed:
+            el.decompose()
+
+    body = soup.select_one("div.mw-parser-output") or soup
+    return soup, body
+
+
+def _sibling_items(parent: Tag, titles: dict, blacklist: frozenset):
+    from bs4 import NavigableString, Tag
+
+    for node in parent.children:
+        if isinstance(node, Tag):
+            if HEADING_RE.match(node.name):
+                blacklisted = titles[id(node)] in blacklist
+                yield HEADING, (id(node), int(node.name[1]), blacklisted)
+            elif node.name == "p":
+                yield TEXT, partial(node.get_text, " ", strip=True)
+        elif isinstance(node, NavigableString):
+            text = node.strip()
+            if text:
+                yield TEXT, partial(str, text)
+
+
+def heading_records(body: Tag) -> list[dict]:
+    """
+    `{"level", "title", "id", "content"}` for every heading under `body` in
+    document order, `content` is None for blacklisted sections. Each heading
+    container is walked once, see `sections.split_section_texts`.
+    """
+    headings = body.find_all(HEADING_RE)
+    titles = {id(h): h.get_text(strip=True) for h in headings}
+    blacklist = get_patterns().blacklist
+    contents = {}
+    walked = set()
+    for h in headings:
+        if id(h.parent) not in walked:
+            walked.add(id(h.parent))
+            contents.update(split_section_texts(_sibling_items(h.parent, titles, blacklist)))
+    return [
+        {
+            "level": int(h.name[1]),
+            "title": titles[id(h)],
+            "id": h.get("id"),
+            "content": contents.get(id(h)),
+        }
+        for h in headings
+    ]
+
+
+def build_section_tree(html: str, backend: Optional[str] = None) -> list[dict]:
+    """Heading hierarchy with each section's content, blacklisted subtrees pruned."""
+    backend = backend or parser_backend()
+    if backend == "selectolax":
+        return fast_html.build_section_tree(html)
+    _, body = _parse(html, backend)
+    return nest_sections(heading_records(body))
+
+
+# Heading-based sections, for a single heading (extract_all_sections splits
+# every heading in one pass with heading_records)
 def extract_section_text(tag: Tag) -> str:
-    logger.debug(f"Extracting text for section: {tag.get_text(strip=True)}")
+    from bs4 import NavigableString, Tag
+
     level = int(tag.name[1])
     texts = []
     for sib in tag.next_siblings:
@@ -95,52 +178,143 @@ def extract_section_text(tag: Tag) -> str:
             texts.append(str(sib).strip())
     section_text = " ".join(texts).strip()
     if not section_text:
-        logger.warning(f"No content found for section: {tag.get_text(strip=True)}")
+        logger.warning("No content found for section: %s", tag.get_text(strip=True))
     return section_text
 
 
-def parse_degrees_from_sections(sections: list[dict]) -> dict:
-    logger.info("Parsing degrees from sections.")
+def scan_degree_sentences(
+    sections: list[dict], stop_loose_on_strict: bool = True, prefilter: bool = True
+) -> tuple[dict, list[str]]:
+    """
+    Tokenize every section once and test both degree patterns in one pass.
+
+    Returns the strict `{section title: [sentences]}` map and the de-duplicated
+    list of loose mentions. The loose list is only a fallback for pages without
+    strict matches, so by default it stops growing once a strict match is found.
+    With `prefilter`, sections without any of the `keywords.txt` terms are
+    skipped before sentence tokenization; the extracted sentences are the same
+    as long as every degree mention contains a keyword.
+    """
+    patterns = get_patterns()
+    gate = patterns.keywords if prefilter else None
+    sent_tokenize = _sentence_tokenizer()
     extracted = {}
+    hits = []
+    scanned = 0
     for sec in sections:
-        for sent in sent_tokenize(sec["content"]):
-            if DEGREE_PATTERN.search(sent):
-                logger.debug(
-                    f"Degree mention found in section '{sec['title']}': {sent.strip()}"
-                )
-                extracted.setdefault(sec["title"], []).append(sent.strip())
-    if not extracted:
-        logger.warning("No degree mentions found in any section.")
-    return extracted
+        if gate is not None and gate.search(sec["content"]) is None:
+            metrics.inc("sections_prefiltered_total")
+            continue
+        scanned += 1
+        with metrics.timer("sentence_tokenize_seconds"):
+            sentences = sent_tokenize(sec["content"])
+        with metrics.timer("degree_regex_seconds"):
+            for sent in sentences:
+                if patterns.degree.search(sent):
+                    extracted.setdefault(sec["title"], []).append(sent.strip())
+                if (not extracted or not stop_loose_on_strict) and patterns.loose.search(sent):
+                    hits.append(sent.strip())
+    hits = list(dict.fromkeys(hits))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "Scanned %d of %d sections: strict %s, loose %s",
+            scanned,
+            len(sections),
+            extracted,
+            hits,
+        )
+    return extracted, hits
+
+
+def _with_matches(extracted: dict) -> dict:
+    # the matcher brings in pydantic, loaded on first use like bs4
+    from .matcher import get_matcher
+
+    matcher = get_matcher()
+    return {
+        title: [(sent, matcher.findall(sent)) for sent in sentences]
+        for title, sentences in extracted.items()
+    }
+
+
+def parse_degrees_from_sections(sections: list[dict]) -> dict:
+    """
+    `{section title: [(sentence, [DegreeMatch, ...])]}` for the strict degree
+    sentences, with the typed mentions `matcher.DegreeMatcher` finds in each.
+    """
+    extracted, _ = scan_degree_sentences(sections)
+    return _with_matches(extracted)
 
 
 def extract_every_degree_sentence(html: str) -> list[str]:
-    logger.info("Extracting every degree-related sentence from HTML.")
     sections = extract_all_sections(html)
-    hits = []
-    for sec in sections:
-        for sent in sent_tokenize(sec["content"]):
-            if LOOSE_DEGREE_RE.search(sent):
-                logger.debug(f"Loose degree mention found: {sent.strip()}")
-                hits.append(sent.strip())
-    if not hits:
-        logger.warning("No loose degree mentions found.")
-    return list(dict.fromkeys(hits))
+    _, hits = scan_degree_sentences(sections, stop_loose_on_strict=False)
+    return hits
 
 
 def extract_degrees_markdown(html: str) -> str:
-    logger.info("Extracting degrees and converting to markdown.")
+    """
+    Degree sentences of a page as markdown, one INFO record per page (the
+    per-section details are logged at DEBUG).
+    """
+    return parse_page(html).markdown
+
+
+@metrics.timed("parse_page_seconds")
+def parse_page(html: str) -> ParsedPage:
+    """`extract_degrees_markdown` with the degree types of the strict sentences."""
+    page, _ = extract_degrees_with_sections(html)
+    return page
+
+
+def extract_degrees_with_sections(html: str) -> tuple[ParsedPage, Optional[list[dict]]]:
+    """
+    `parse_page` that also returns the page's sections (None for a page that
+    is not HTML), so `ParseCache` can keep them and redo only the sentence
+    scan when the patterns change.
+    """
     if not is_html(html):
-        logger.debug("Input is not HTML, skipping parsing.")
-        return "NOT HTML"
+        logger.info("Parsed page: not HTML, skipped")
+        metrics.inc("parse_outcomes_total", outcome="not_html")
+        return ParsedPage("NOT HTML"), None
     sections = extract_all_sections(html)
-    sec_map = parse_degrees_from_sections(sections)
+    return page_from_sections(sections), sections
+
+
+def degrees_markdown_from_sections(sections: list[dict]) -> str:
+    """The markdown of `extract_degrees_markdown` from already extracted sections."""
+    return page_from_sections(sections).markdown
+
+
+def page_from_sections(sections: list[dict]) -> ParsedPage:
+    """The `parse_page` result from already extracted sections."""
+    from .matcher import degree_types
+
+    # tokenize once, the loose fallback reuses the same sentences
+    sec_map, fallback = scan_degree_sentences(sections)
     if sec_map:
-        logger.info("Successfully parsed degrees from sections.")
-        return degrees_to_markdown(sec_map)
+        logger.info(
+            "Parsed page: %d sections, %d degree sentences in %d sections",
+            len(sections),
+            sum(map(len, sec_map.values())),
+            len(sec_map),
+        )
+        metrics.inc("parse_outcomes_total", outcome="sections")
+        matches = (
+            m
+            for sentences in _with_matches(sec_map).values()
+            for _, ms in sentences
+            for m in ms
+        )
+        return ParsedPage(degrees_to_markdown(sec_map), degree_types(matches))
 
-    # fallback
-    logger.warning("No structured degree mentions found, falling back to loose mentions.")
-    fallback = extract_every_degree_sentence(html)
+    # fallback, loose mentions are not typed
+    outcome = "loose" if fallback else "none"
+    logger.info(
+        "Parsed page: %d sections, no strict degree sentence, %d loose mentions",
+        len(sections),
+        len(fallback),
+    )
+    metrics.inc("parse_outcomes_total", outcome=outcome)
     md = "## Degree Mentions\n" + "\n".join(f"- {s}" for s in fallback)
-    return md
+    return ParsedPage(md)
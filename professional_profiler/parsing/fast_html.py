@@ -0,0 +1,135 @@
+# professional_profiler/parsing/fast_html.py
+"""
+selectolax (lexbor) backend for `extract_all_sections`.
+
+Mirrors the BeautifulSoup implementation in `extractors.py` node for node so
+both produce the same sections; lexbor is an HTML5 parser like html5lib, so
+the trees match, but building them is an order of magnitude cheaper.
+"""
+
+from functools import partial
+
+from professional_profiler.logging.logger import get_logger
+from .constants import JUNK_SELECTOR, get_patterns
+from .sections import HEADING, TEXT, log_sections, nest_sections, split_section_texts
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # optional dependency, only needed for backend "selectolax"
+    LexborHTMLParser = None
+
+logger = get_logger(__name__)
+
+HEADINGS = ("h1", "h2", "h3", "h4", "h5", "h6")
+HEADING_SELECTOR = ", ".join(HEADINGS)
+
+
+def _text(node, separator: str = " ") -> str:
+    # same as bs4 `get_text(separator, strip=True)`: lexbor's own `text(strip=True)`
+    # keeps the empty strings left by whitespace-only nodes, bs4 drops them
+    parts = (n.text_content.strip() for n in node.traverse(include_text=True) if n.is_text_node)
+    return separator.join(part for part in parts if part)
+
+
+def _string(node) -> str:
+    """Raw text of a text or comment node (bs4 treats both as NavigableString)."""
+    if node.is_comment_node:
+        return node.comment_content or ""
+    return node.text_content or ""
+
+
+def _parse(html: str):
+    if LexborHTMLParser is None:
+        raise ImportError("parsing backend 'selectolax' requires `pip install selectolax`")
+    tree = LexborHTMLParser(html)
+
+    # strip site-wide junk in a single selector pass
+    for el in tree.css(JUNK_SELECTOR):
+        el.decompose()
+
+    return tree, tree.css_first("div.mw-parser-output")
+
+
+def _sibling_items(parent, titles: dict, blacklist: frozenset):
+    for node in parent.iter(include_text=True):
+        if node.tag in HEADINGS:
+            blacklisted = titles[node.mem_id] in blacklist
+            yield HEADING, (node.mem_id, int(node.tag[1]), blacklisted)
+        elif node.tag == "p":
+            yield TEXT, partial(_text, node)
+        elif node.is_text_node or node.is_comment_node:
+            text = _string(node).strip()
+            if text:
+                yield TEXT, partial(str, text)
+
+
+def heading_records(root) -> list[dict]:
+    """Same records as `extractors.heading_records`, one walk per heading container."""
+    headings = root.css(HEADING_SELECTOR)
+    titles = {h.mem_id: _text(h, separator="") for h in headings}
+    blacklist = get_patterns().blacklist
+    contents = {}
+    walked = set()
+    for h in headings:
+        parent = h.parent
+        if parent.mem_id not in walked:
+            walked.add(parent.mem_id)
+            contents.update(split_section_texts(_sibling_items(parent, titles, blacklist)))
+    return [
+        {
+            "level": int(h.tag[1]),
+            "title": titles[h.mem_id],
+            "id": h.attributes.get("id"),
+            "content": contents.get(h.mem_id),
+        }
+        for h in headings
+    ]
+
+
+def build_section_tree(html: str) -> list[dict]:
+    tree, body = _parse(html)
+    return nest_sections(heading_records(body or tree))
+
+
+def extract_all_sections(html: str) -> list[dict]:
+    tree, body = _parse(html)
+    sections = []
+
+    # Lead paragraph(s), the document itself has no <p> children
+    lead_chunks = []
+    if body is not None:
+        first_h = body.css_first(HEADING_SELECTOR)
+        for sib in body.iter(include_text=True):
+            if first_h is not None and sib.mem_id == first_h.mem_id:
+                break
+            if sib.tag == "p":
+                lead_chunks.append(_text(sib))
+    lead_text = " ".join(lead_chunks).strip()
+    if lead_text:
+        sections.append({"title": "_lead_", "content": lead_text})
+
+    skipped, empty = [], []
+    for rec in heading_records(body or tree):
+        if rec["content"] is None:
+            skipped.append(rec["title"])
+        elif rec["content"]:
+            sections.append({"title": rec["title"], "content": rec["content"]})
+        else:
+            empty.append(rec["title"])
+
+    # Infobox education as a pseudo-section
+    infobox = tree.css_first("table.infobox")
+    if infobox is not None:
+        edu_texts = []
+        for row in infobox.css("tr"):
+            hdr = row.css_first("th")
+            cell = row.css_first("td")
+            if hdr is not None and cell is not None:
+                label = _text(hdr).lower()
+                if "education" in label or "alma mater" in label:
+                    edu_texts.append(_text(cell))
+        if edu_texts:
+            sections.append({"title": "_infobox_education_", "content": "; ".join(edu_texts)})
+
+    log_sections(logger, sections, skipped, empty)
+    return sections
@@ -0,0 +1,235 @@
+# professional_profiler/parsing/matcher.py
+"""
+Single-scan degree matcher with per-match spans and `FieldEnum` types.
+
+The degree vocabulary (abbreviations such as "B.A." / "Ph.D." and full names
+such as "Bachelor of Arts" / "doctorate") is compiled into one regular
+expression whose alternations are built from a character trie, so the regex
+engine never backtracks across sibling terms. One `finditer` pass over a
+sentence returns every mention with its span and degree type; this is the
+regex baseline the README evaluates the LLM against, and the source of the
+parsed output's `degree_types` (the mentions in a page's strict sentences).
+
+The vocabulary covers every spelling `DEGREE_PATTERN` matches (checked by
+`benchmarks/check_matcher.py`) and spans end where its matches end: a final
+period is never part of a span, as it may end the sentence ("an MSc."). Two
+letter abbreviations that are also state codes or clock times ("MA", "MD",
+"AM") are only taken outside those contexts, and the bare "master" /
+"bachelor" only when a degree follows ("a Master in Economics").
+"""
+
+import re
+from functools import lru_cache
+from typing import Iterable, Iterator, NamedTuple, Optional
+
+from professional_profiler.models import FieldEnum, ProfessionalProfiler, Study
+
+# Abbreviations are matched case-sensitively ("MA" yes, "ma" no) and written as
+# segments; a dot may follow every segment but the last ("PhD" / "Ph.D" /
+# "Ph. D"), and every spelling takes a plural ("PhDs" / "Ph.D.s").
+ABBREVIATIONS = {
+    FieldEnum.ASSOCIATE: ["A A", "A S", "A A S"],
+    FieldEnum.BACHELOR: [
+        "B A", "A B", "B S", "B Sc", "B F A", "B B A", "B Eng", "B S E", "B S N",
+        "B Mus", "B Phil", "B Ed", "B Arch", "B J", "LL B", "S B", "B SC",
+    ],
+    FieldEnum.MASTER: [
+        "M A", "A M", "M S", "M Sc", "M F A", "M B A", "M P A", "M P P", "M P H",
+        "M Ed", "M Phil", "M Res", "M S W", "M Arch", "M Eng", "M Div", "M Mus",
+        "M A T", "M L S", "LL M", "L L M", "S M", "M SC",
+    ],
+    FieldEnum.DOCTOR: [
+        "Ph D", "J D", "M D", "Ed D", "D Phil", "Sc D", "D Sc", "LL D", "D M D",
+        "D D S", "D V M", "Pharm D", "Psy D", "D B A", "D N P", "D Min", "J S D",
+        "S J D", "D O", "PH D",
+    ],
+}  # fmt: skip
+
+# Full names are matched case-insensitively, the ones ending in "degree" or
+# "doctorate" also in the plural.
+FULL_NAMES = {
+    FieldEnum.ASSOCIATE: [
+        "associate degree", "associate's degree", "associates degree",
+        "associate of arts", "associate of science", "associate of applied science",
+    ],
+    FieldEnum.BACHELOR: [
+        "bachelor's", "bachelors", "bachelor's degree", "bachelors degree",
+        "bachelor degree", "baccalaureate", "bachelor of arts", "bachelor of science",
+        "bachelor of fine arts", "bachelor of business administration",
+        "bachelor of engineering", "bachelor of laws", "bachelor of music",
+        "bachelor of philosophy", "bachelor of education", "bachelor of architecture",
+        "bachelor of journalism", "bachelor of social work", "bachelor of nursing",
+        "bachelor",
+    ],
+    FieldEnum.MASTER: [
+        "master's", "master", "masters", "masters degree", "master's degree", "master degree",
+        "master of arts", "master of science", "master of fine arts",
+        "master of business administration", "master of public administration",
+        "master of public policy", "master of public health", "master of education",
+        "master of philosophy", "master of laws", "master of divinity",
+        "master of engineering", "master of music", "master of social work",
+        "master of architecture", "master of research", "master of library science",
+    ],
+    FieldEnum.DOCTOR: [
+        "doctorate", "doctoral degree", "doctor of philosophy", "doctor of medicine",
+        "doctor of science", "doctor of education", "doctor of laws",
+        "doctor of jurisprudence", "doctor of juridical science", "doctor of engineering",
+        "doctor of law", "doctor of dental medicine", "doctor of pharmacy",
+        "doctor of psychology", "doctor of veterinary medicine", "doctor of ministry",
+        "doctor of business administration", "doctor of nursing practice",
+        "juris doctor", "medical degree", "law degree",
+    ],
+}  # fmt: skip
+
+# full names that are only a degree when one follows ("Master in ..." but not
+# "a master craftsman"), and what must follow them
+BARE_NAMES = {"bachelor", "master", "masters"}
+_DEGREE_AFTER = re.compile(r"\s+(?:in|degrees?)\b", re.IGNORECASE)
+
+# two letter abbreviations are also state codes ("Boston, MA"), clock times
+# ("10 AM") and ZIP codes ("MD 21201") follow them
+_NUMBER_BEFORE = re.compile(r"\d[\d:.]*\s?$")
+_ZIP_AFTER = re.compile(r",?\s*\d{5}\b")
+_COMMA_BEFORE = re.compile(r",\s*$")
+_LIST_SEPARATOR = re.compile(r"\s*,\s*")
+
+
+class DegreeMatch(NamedTuple):
+    start: int
+    end: int
+    text: str
+    degree_type: FieldEnum
+
+
+def _abbreviation_forms(spec: str) -> set[str]:
+    """All dotted / undotted spellings of an abbreviation spec like "Ph D"."""
+    forms = {""}
+    *segments, last = spec.split()
+    for seg in segments:
+        # "B. A." is rare but shows up in older biographies
+        forms = {f + seg + sep for f in forms for sep in ("", ".", ". ")}
+    forms = {f + last for f in forms}
+    return forms | {f + "s" for f in forms} | {f + ".s" for f in forms if "." in f}
+
+
+def _name_forms(name: str) -> set[str]:
+    forms = {name}
+    if name.endswith(("degree", "doctorate")):
+        forms.add(name + "s")
+    return forms | {f.replace("'", "’") for f in forms}
+
+
+def _trie_regex(words: list[str]) -> str:
+    """
+    Regex alternation for `words` built from a character trie. Longer words win
+    over their prefixes, and the engine never retries a shared prefix.
+    """
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = True
+
+    def build(node: dict) -> str:
+        end = "" in node
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if end:
+            # make the continuation optional; a single char needs no group
+            body = (f"(?:{body})" if len(branches) == 1 and len(body) > 1 else body) + "?"
+        return body
+
+    return build(trie)
+
+
+class DegreeMatcher:
+    def __init__(
+        self,
+        abbreviations: dict[FieldEnum, list[str]] = ABBREVIATIONS,
+        full_names: dict[FieldEnum, list[str]] = FULL_NAMES,
+    ):
+        self._abbr_types: dict[str, FieldEnum] = {}
+        # spellings of the two letter abbreviations, see `_abbreviation_fits`
+        self._ambiguous: set[str] = set()
+        for degree_type, specs in abbreviations.items():
+            for spec in specs:
+                forms = _abbreviation_forms(spec)
+                for form in forms:
+                    self._abbr_types[form] = degree_type
+                if len(spec.replace(" ", "")) == 2:
+                    self._ambiguous |= forms
+        self._full_types: dict[str, FieldEnum] = {}
+        for degree_type, names in full_names.items():
+            for name in names:
+                for form in _name_forms(name):
+                    self._full_types[form] = degree_type
+
+        self.pattern = re.compile(
+            r"(?<![\w.])(?:(?P<abbr>"
+            + _trie_regex(list(self._abbr_types))
+            + r")|(?i:(?P<full>"
+            + _trie_regex(list(self._full_types))
+            + r")))(?!\w)(?!\.\w)"
+        )
+
+    def finditer(self, text: str) -> Iterator[DegreeMatch]:
+        previous = None
+        for m in self.pattern.finditer(text):
+            if m.lastgroup == "abbr":
+                degree_type = self._abbr_types[m.group()]
+                if m.group() in self._ambiguous and not _abbreviation_fits(text, m, previous):
+                    continue
+            else:
+                name = m.group().lower()
+                degree_type = self._full_types[name]
+                if name in BARE_NAMES and not _DEGREE_AFTER.match(text, m.end()):
+                    continue
+            previous = m.end()
+            yield DegreeMatch(m.start(), m.end(), m.group(), degree_type)
+
+    def findall(self, text: str) -> list[DegreeMatch]:
+        return list(self.finditer(text))
+
+    def classify(self, text: str) -> list[FieldEnum]:
+        """Distinct degree types mentioned in `text`, in order of first mention."""
+        return list(dict.fromkeys(m.degree_type for m in self.finditer(text)))
+
+
+def _abbreviation_fits(text: str, m: re.Match, previous: Optional[int]) -> bool:
+    """
+    Whether a two letter abbreviation is a degree here: not a clock time, not a
+    state code after a city or before a ZIP code. After a comma it is one when
+    the comma separates it from the previous degree ("a BA, MA and PhD").
+    """
+    before = text[max(0, m.start() - 16) : m.start()]
+    if _NUMBER_BEFORE.search(before) or _ZIP_AFTER.match(text, m.end()):
+        return False
+    if _COMMA_BEFORE.search(before):
+        return previous is not None and bool(
+            _LIST_SEPARATOR.fullmatch(text, previous, m.start())
+        )
+    return True
+
+
+@lru_cache(maxsize=1)
+def get_matcher() -> DegreeMatcher:
+    return DegreeMatcher()
+
+
+def regex_baseline(text: str) -> ProfessionalProfiler:
+    """
+    Regex baseline for the evaluation: one `Study` per distinct degree type
+    mentioned in `text` (fields are left empty), or a single `NONE` entry.
+    """
+    types = get_matcher().classify(text)
+    if not types:
+        return ProfessionalProfiler(studies=[Study(degree_type=FieldEnum.NONE)])
+    return ProfessionalProfiler(studies=[Study(degree_type=t) for t in types])
+
+
+def degree_types(matches: Iterable[DegreeMatch]) -> str:
+    """The distinct types of `matches` in order, joined with "; ", "" for none."""
+    return "; ".join(dict.fromkeys(m.degree_type.value for m in matches))
@@ -0,0 +1,89 @@
+# professional_profiler/parsing/sections.py
+"""
+Backend-independent, single-pass section splitting.
+
+A heading's section is every `<p>` and bare text sibling that follows it up
+to the next sibling heading of the same or a higher level, so the text of a
+subsection also belongs to its parent. Instead of scanning forward from every
+heading (quadratic on deep heading trees), each container of headings is
+walked once with a stack of open headings: every chunk of text is appended
+once to a shared list and an open heading only records where its range
+starts. Chunks under blacklisted headings only are never extracted.
+
+Backends feed the walk with `(HEADING, (key, level, blacklisted))` and
+`(TEXT, get_text)` items; `get_text` is only called for chunks that belong
+to a kept section.
+"""
+
+import logging
+from typing import Callable, Iterable
+
+HEADING = "heading"
+TEXT = "text"
+
+
+def split_section_texts(items: Iterable[tuple[str, object]]) -> dict:
+    """Return `{heading key: content}` for the non-blacklisted headings in `items`."""
+    chunks: list[str] = []
+    stack: list[tuple] = []  # (key, level, blacklisted, first chunk), levels increasing
+    contents = {}
+    live = 0  # open headings that are not blacklisted
+
+    def close(entry) -> None:
+        nonlocal live
+        key, _, blacklisted, start = entry
+        if not blacklisted:
+            live -= 1
+            contents[key] = " ".join(chunks[start:]).strip()
+
+    for kind, payload in items:
+        if kind == HEADING:
+            key, level, blacklisted = payload
+            while stack and stack[-1][1] >= level:
+                close(stack.pop())
+            stack.append((key, level, blacklisted, len(chunks)))
+            live += not blacklisted
+        elif live:
+            get_text: Callable[[], str] = payload
+            chunks.append(get_text())
+    while stack:
+        close(stack.pop())
+    return contents
+
+
+def nest_sections(records: list[dict]) -> list[dict]:
+    """
+    Nest `{"level", "title", "id", "content"}` heading records (document order)
+    into a tree with `children`, as in `build_heading_tree_with_content`.
+    Records with `content=None` (blacklisted) are dropped with their subtree.
+    """
+    tree, stack = [], []
+    pruned_level = None
+    for rec in records:
+        if pruned_level is not None:
+            if rec["level"] > pruned_level:
+                continue
+            pruned_level = None
+        if rec["content"] is None:
+            pruned_level = rec["level"]
+            continue
+        node = {**rec, "children": []}
+        while stack and stack[-1]["level"] >= node["level"]:
+            stack.pop()
+        (stack[-1]["children"] if stack else tree).append(node)
+        stack.append(node)
+    return tree
+
+
+def log_sections(
+    logger: logging.Logger, sections: list[dict], skipped: list[str], empty: list[str]
+) -> None:
+    """One DEBUG record per page for `extract_all_sections`, built only when enabled."""
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "Extracted %d sections %s, skipped blacklisted %s, empty %s",
+            len(sections),
+            [sec["title"] for sec in sections],
+            skipped,
+            empty,
+        )
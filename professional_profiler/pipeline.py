@@ -0,0 +1,155 @@
+# professional_profiler/pipeline.py
+"""
+Streaming stage graph for the end-to-end run.
+
+A `Pipeline` is a chain of stages connected by bounded queues. The source
+stage pulls items from an iterator in its own thread, every further stage
+runs `threads` threads that apply a function to each item, and iterating the
+pipeline yields the results of the last stage in completion order. A stage
+that gets ahead of the next one blocks on the full queue, so slow consumers
+hold back fast producers and memory stays bounded by the queue sizes. All
+stages work at the same time, so the wall time of a run approaches the busy
+time of its slowest stage instead of the sum of all of them.
+
+Use the pipeline as a context manager: leaving the block, also when the
+consumer raises, stops every stage. Threads blocked on a full or empty queue
+see the stop within `_POLL` seconds, and the source closes its iterator, so
+a failed writer does not leave producers hanging on a queue nobody reads.
+"""
+
+import queue
+import threading
+import time
+from typing import Any, Callable, Iterable, Iterator
+
+from professional_profiler.logging.logger import get_logger
+
+logger = get_logger(__name__)
+
+_DONE = object()  # end-of-stream marker, passed down the chain
+_POLL = 0.1  # seconds between stop checks of a thread blocked on a queue
+
+
+class Pipeline:
+    def __init__(self, queue_size: int = 64):
+        self.queue_size = queue_size
+        # seconds of work per stage thread, excluding time blocked on the queues
+        self.busy: dict[str, float] = {}
+        self._tail: queue.Queue | None = None
+        self._errors: list[BaseException] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self) -> None:
+        """Stop every stage, e.g. because the consumer gave up."""
+        self._stop.set()
+
+    def _put(self, q: queue.Queue, item) -> bool:
+        """Put `item` unless the pipeline is stopped first."""
+        while not self._stop.is_set():
+            try:
+                q.put(item, timeout=_POLL)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _get(self, q: queue.Queue):
+        """The next item of `q`, or `_DONE` once the pipeline is stopped."""
+        while not self._stop.is_set():
+            try:
+                return q.get(timeout=_POLL)
+            except queue.Empty:
+                pass
+        return _DONE
+
+    def _spawn(self, name: str, target: Callable) -> None:
+        threading.Thread(target=target, name=f"pipeline-{name}", daemon=True).start()
+
+    def _add_busy(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.busy[name] = self.busy.get(name, 0.0) + seconds
+
+    def source(self, name: str, items: Iterable) -> "Pipeline":
+        """Feed the pipeline from `items`, consumed in a background thread."""
+        outbox = queue.Queue(maxsize=self.queue_size)
+        self.busy[name] = 0.0
+
+        def run() -> None:
+            iterator = iter(items)
+            try:
+                while not self._errors and not self._stop.is_set():
+                    start = time.perf_counter()
+                    try:
+                        item = next(iterator)
+                    except StopIteration:
+                        break
+                    finally:
+                        self._add_busy(name, time.perf_counter() - start)
+                    if not self._put(outbox, item):
+                        break
+            except BaseException as e:
+                logger.exception("Pipeline stage %s failed", name)
+                self._errors.append(e)
+            finally:
+                if self._stop.is_set() and hasattr(iterator, "close"):
+                    # a generator source releases its resources (e.g. thread pools) now
+                    iterator.close()
+                self._put(outbox, _DONE)
+
+        self._spawn(name, run)
+        self._tail = outbox
+        return self
+
+    def stage(self, name: str, fn: Callable[[Any], Any], threads: int = 1) -> "Pipeline":
+        """Apply `fn` to every item of the previous stage with `threads` threads."""
+        if self._tail is None:
+            raise ValueError("a pipeline starts with a source stage")
+        inbox, outbox = self._tail, queue.Queue(maxsize=self.queue_size)
+        self.busy[name] = 0.0
+        running = [threads]
+
+        def run() -> None:
+            while (item := self._get(inbox)) is not _DONE:
+                if self._errors:
+                    continue  # drain so upstream threads do not block on a full queue
+                start = time.perf_counter()
+                try:
+                    result = fn(item)
+                except BaseException as e:
+                    logger.exception("Pipeline stage %s failed", name)
+                    self._errors.append(e)
+                    continue
+                self._add_busy(name, (time.perf_counter() - start) / threads)
+                self._put(outbox, result)
+            # let the sibling threads see the end of the stream too
+            self._put(inbox, _DONE)
+            with self._lock:
+                running[0] -= 1
+                last = running[0] == 0
+            if last:
+                self._put(outbox, _DONE)
+
+        for _ in range(threads):
+            self._spawn(name, run)
+        self._tail = outbox
+        return self
+
+    def __iter__(self) -> Iterator:
+        """Yield the last stage's results, re-raising the first stage failure."""
+        if self._tail is None:
+            raise ValueError("a pipeline starts with a source stage")
+        try:
+            while (item := self._get(self._tail)) is not _DONE:
+                if not self._errors:
+                    yield item
+        finally:
+            self.close()
+        if self._errors:
+            raise self._errors[0]
@@ -1,13 +1,21 @@
 # ===== IMPORTS =====
 
 import sys
+from professional_profiler import metrics
 from professional_profiler.logging.logger import setup_logging, get_logger
 from professional_profiler.config import load_app_config
-from professional_profiler.scraping.wikipedia_search import get_wikipedia, search_html
+from professional_profiler.scraping.cache import ResponseCache
+from professional_profiler.scraping.checkpoint import (
+    FAILED,
+    RETRYABLE,
+    ProgressLedger,
+    ResultWriter,
+)
+from professional_profiler.scraping.fetcher import iter_fetch
+from professional_profiler.scraping.names import normalize_names, unique_queries
+from professional_profiler.scraping.storage import PageStore
 import pandas as pd
 
-setup_logging()
-conf = load_app_config()
 logger = get_logger(__name__)
 
 # ===== FUNCTIONS =====
@@ -28,38 +36,12 @@ def load_subject_list(path: str) -> list[str]:
         return []
 
 
-def fetch_wikipedia(subject):
-    logger.debug("Processing subject: %s", subject)
-    wiki_conf = conf.scraping.wikipedia
-    result = get_wikipedia(
-        subject,
-        lang=wiki_conf.language,
-        retry=wiki_conf.max_retries,
-        timeout=wiki_conf.timeout,
-        rc=wiki_conf.response_code,
-    )
-    logger.info("Result for %s: %s", subject, result)
-    return result
-
-
-def fetch_source(key):
-    logger.debug("fetching key: %s", key)
-    wiki_conf = conf.scraping.wikipedia
-    result = search_html(
-        key,
-        lang=wiki_conf.language,
-        retry=wiki_conf.max_retries,
-        timeout=wiki_conf.timeout,
-        rc=wiki_conf.response_code,
-    )
-    logger.info("Result for %s: %s", key, result[1:10])
-    return result
-
-
 # ===== MAIN =====
 def main():
 
     logger.info("Starting wikipedia link gathering")
+    conf = load_app_config()
+    metrics.enable(conf.metrics.enabled)
     # Load the subject list
     logger.debug("Loading subject list from %s", conf.scraping.paths.authors)
     subjects = load_subject_list(conf.scraping.paths.authors)
@@ -67,19 +49,68 @@ def main():
         logger.error("No subjects found in the file.")
         return
     logger.debug("Loaded %d subjects", len(subjects))
-    # Process each subject
-    # It will be a concat into a dataframe
-    subjects["key"] = subjects[conf.scraping.file.name_column].apply(fetch_wikipedia)
-    subjects["source"] = subjects["key"].apply(fetch_source)
-    # Save the results to a CSV file
+    file_conf = conf.scraping.file
+    if file_conf.raw_name_column:
+        subjects[file_conf.name_column] = normalize_names(subjects[file_conf.raw_name_column])
     output_path = conf.scraping.paths.processed_data
+
+    # Skip authors finished by a previous run
+    ledger = ProgressLedger(
+        output_path + file_conf.ledger, max_attempts=conf.scraping.wikipedia.max_attempts
+    )
+    todo = subjects[~subjects[file_conf.id_column].map(ledger.is_finished)]
+    todo = todo.reset_index(drop=True)
+    logger.info("%d of %d subjects left to process", len(todo), len(subjects))
+    # one search per distinct query, its outcome is recorded for every author sharing it
+    queries, groups = unique_queries(todo[file_conf.name_column])
+
+    cache = (
+        ResponseCache.from_settings(conf.scraping.cache)
+        if conf.scraping.cache.enabled
+        else None
+    )
+    # Each result is appended as soon as it arrives, page sources go to the page store
     logger.debug("Saving results to %s", output_path)
-    subjects.to_csv(output_path + conf.scraping.file.name, index=False)
+    writer = ResultWriter(
+        output_path + file_conf.name, fieldnames=[*subjects.columns, "key", "failure"]
+    )
+    pages = PageStore(output_path + file_conf.pages)
+    try:
+        for idx, _, result in iter_fetch(
+            queries,
+            conf.scraping.wikipedia,
+            cache=cache,
+            dump_conf=conf.scraping.dump,
+        ):
+            failure = result.failure.value if result.failure else ""
+            for row in todo.iloc[groups[idx]].to_dict("records"):
+                author_id, name = row[file_conf.id_column], row[file_conf.name_column]
+                # store the page before the ledger marks the author as finished
+                if result.failure is None:
+                    pages.put(author_id, result.key, result.source)
+                status = ledger.record(author_id, name, result.key, result.failure)
+                if status == FAILED:
+                    logger.error("Giving up on %s: %s", name, failure)
+                if status != RETRYABLE:
+                    writer.write({**row, "key": result.key, "failure": failure})
+    finally:
+        pages.close()
+        writer.close()
+        ledger.close()
+    logger.info("Progress: %s", ledger.summary())
 
+    if cache is not None:
+        cache.evict()
+        stats = cache.stats()
+        logger.info("Cache hits: %s, misses: %s", stats["hits"], stats["misses"])
+        cache.close()
+    if conf.metrics.enabled:
+        metrics.write_report(conf.metrics.json_path, conf.metrics.prometheus_path)
     logger.info("Finished processing subjects")
 
 
 if __name__ == "__main__":
+    setup_logging()
     try:
         main()
     except Exception:
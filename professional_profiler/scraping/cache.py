@@ -0,0 +1,219 @@
+# professional_profiler/scraping/cache.py
+"""
+Persistent on-disk cache for Wikimedia search and page-HTML responses.
+
+Search results are keyed by `(lang, query)` and page HTML by
+`(lang, key, revision)`, where the revision is taken from the page ETag.
+Entries younger than `ttl` are served without touching the network; older
+HTML entries are revalidated with a conditional request (`If-None-Match`) so
+an unchanged page costs a 304 instead of a full download. Both tables
+together are kept under `max_bytes` by evicting the least recently used
+entries; a search entry counts the bytes of its lang, query and key.
+"""
+
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+
+from professional_profiler.logging.logger import get_logger
+
+logger = get_logger(__name__)
+
+_REVISION_RE = re.compile(r'"(\d+)')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS search (
+    lang TEXT NOT NULL,
+    query TEXT NOT NULL,
+    key TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    size INTEGER NOT NULL DEFAULT 0,
+    accessed_at REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (lang, query)
+);
+CREATE TABLE IF NOT EXISTS html (
+    lang TEXT NOT NULL,
+    key TEXT NOT NULL,
+    revision TEXT NOT NULL,
+    etag TEXT,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    fetched_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (lang, key, revision)
+);
+CREATE INDEX IF NOT EXISTS html_accessed ON html (accessed_at);
+"""
+
+
+def revision_from_etag(etag: str | None) -> str:
+    """Extract the page revision id from a REST ETag such as `W/"1234/uuid"`."""
+    if not etag:
+        return ""
+    m = _REVISION_RE.search(etag)
+    return m.group(1) if m else etag
+
+
+class ResponseCache:
+    """Thread-safe SQLite store shared by the fetcher's worker threads."""
+
+    def __init__(self, path: str | Path, ttl: float = 30 * 86400, max_bytes: int = 2 << 30):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = {"search": 0, "html": 0, "revalidated": 0}
+        self.misses = {"search": 0, "html": 0}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(search)")}
+        if "size" not in columns:
+            # a file from before search entries counted towards `max_bytes`
+            self._conn.execute("ALTER TABLE search ADD COLUMN size INTEGER NOT NULL DEFAULT 0")
+            self._conn.execute(
+                "ALTER TABLE search ADD COLUMN accessed_at REAL NOT NULL DEFAULT 0"
+            )
+            self._conn.execute(
+                "UPDATE search SET size = LENGTH(CAST(lang || query || key AS BLOB)), "
+                "accessed_at = fetched_at"
+            )
+            self._conn.commit()
+
+    @classmethod
+    def from_settings(cls, cache_conf) -> "ResponseCache":
+        """Build a cache from the `scraping.cache` config section."""
+        return cls(
+            cache_conf.path,
+            ttl=cache_conf.ttl_days * 86400,
+            max_bytes=cache_conf.max_size_mb * 1024 * 1024,
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # ----- search -----
+
+    def get_search(self, lang: str, query: str) -> str | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT key, fetched_at FROM search WHERE lang = ? AND query = ?",
+                (lang, query),
+            ).fetchone()
+            if row and time.time() - row[1] < self.ttl:
+                self.hits["search"] += 1
+                self._conn.execute(
+                    "UPDATE search SET accessed_at = ? WHERE lang = ? AND query = ?",
+                    (time.time(), lang, query),
+                )
+                self._conn.commit()
+                return row[0]
+            self.misses["search"] += 1
+            return None
+
+    def put_search(self, lang: str, query: str, key: str) -> None:
+        size = len(f"{lang}{query}{key}".encode("utf-8"))
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO search VALUES (?, ?, ?, ?, ?, ?)",
+                (lang, query, key, now, size, now),
+            )
+            self._conn.commit()
+
+    # ----- html -----
+
+    def get_html(self, lang: str, key: str) -> tuple[str, str | None, bool] | None:
+        """
+        Return `(html, etag, fresh)` for the latest cached revision of `key`,
+        or None. A stale entry should be revalidated before use.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT revision, etag, body, fetched_at FROM html "
+                "WHERE lang = ? AND key = ? ORDER BY fetched_at DESC LIMIT 1",
+                (lang, key),
+            ).fetchone()
+            if row is None:
+                self.misses["html"] += 1
+                return None
+            revision, etag, body, fetched_at = row
+            fresh = time.time() - fetched_at < self.ttl
+            if fresh:
+                self.hits["html"] += 1
+                self._touch(lang, key, revision, refresh=False)
+            else:
+                # stale entries count as misses; a 304 is reported as "revalidated"
+                self.misses["html"] += 1
+            return zlib.decompress(body).decode("utf-8"), etag, fresh
+
+    def revalidated(self, lang: str, key: str) -> None:
+        """Mark the latest revision of `key` as confirmed current (HTTP 304)."""
+        with self._lock:
+            self.hits["revalidated"] += 1
+            row = self._conn.execute(
+                "SELECT revision FROM html WHERE lang = ? AND key = ? "
+                "ORDER BY fetched_at DESC LIMIT 1",
+                (lang, key),
+            ).fetchone()
+            if row:
+                self._touch(lang, key, row[0], refresh=True)
+
+    def put_html(self, lang: str, key: str, html: str, etag: str | None) -> None:
+        body = zlib.compress(html.encode("utf-8"))
+        now = time.time()
+        with self._lock:
+            # a new revision supersedes every older copy of the page
+            self._conn.execute("DELETE FROM html WHERE lang = ? AND key = ?", (lang, key))
+            self._conn.execute(
+                "INSERT INTO html VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (lang, key, revision_from_etag(etag), etag, body, len(body), now, now),
+            )
+            self._conn.commit()
+
+    def _touch(self, lang: str, key: str, revision: str, refresh: bool) -> None:
+        now = time.time()
+        column = "fetched_at = ?, accessed_at = ?" if refresh else "accessed_at = ?"
+        args = (now, now) if refresh else (now,)
+        self._conn.execute(
+            f"UPDATE html SET {column} WHERE lang = ? AND key = ? AND revision = ?",
+            (*args, lang, key, revision),
+        )
+        self._conn.commit()
+
+    # ----- maintenance -----
+
+    def evict(self) -> int:
+        """Drop least recently used entries until both tables fit `max_bytes`."""
+        with self._lock:
+            total = sum(
+                self._conn.execute(f"SELECT COALESCE(SUM(size), 0) FROM {table}").fetchone()[0]
+                for table in ("search", "html")
+            )
+            if total <= self.max_bytes:
+                return 0
+            rows = self._conn.execute(
+                "SELECT 'search', rowid, size, accessed_at FROM search "
+                "UNION ALL SELECT 'html', rowid, size, accessed_at FROM html "
+                "ORDER BY accessed_at"
+            ).fetchall()
+            removed = 0
+            for table, rowid, size, _ in rows:
+                if total <= self.max_bytes:
+                    break
+                self._conn.execute(f"DELETE FROM {table} WHERE rowid = ?", (rowid,))
+                total -= size
+                removed += 1
+            self._conn.commit()
+        logger.info(
+            "Evicted %d cached responses to stay under %d bytes", removed, self.max_bytes
+        )
+        return removed
+
+    def stats(self) -> dict:
+        return {"hits": dict(self.hits), "misses": dict(self.misses)}
@@ -0,0 +1,125 @@
+# professional_profiler/scraping/checkpoint.py
+"""
+Append-only persistence for scraping runs.
+
+`ProgressLedger` records one JSON line per author attempt with its status:
+
+- `done`: the author resolved to a page or to a definitive outcome
+  (`NO_RESULTS`, `MULTIPLE_MATCHES`, `NO_MATCH`).
+- `retryable`: the search or page fetch failed with a transient `Failure`
+  (after the fetcher's dead-letter retries) and the author will be picked
+  up again by the next run.
+- `failed`: the author stayed retryable for `max_attempts` runs, or failed
+  with a `Failure` that is not worth retrying, and is given up.
+
+Entries of failed attempts carry the `failure` value.
+
+`ResultWriter` appends each finished author's row to the output CSV, so a
+crash only loses the authors that were in flight. It refuses to append to a
+file written with other columns (an older version, a different
+`raw_name_column`); starting over would drop the rows of the authors the
+ledger already counts as finished.
+"""
+
+import csv
+import json
+import time
+from collections import Counter
+from pathlib import Path
+
+from professional_profiler.logging.logger import get_logger
+from professional_profiler.scraping.wikipedia_search import Failure
+
+logger = get_logger(__name__)
+
+DONE = "done"
+FAILED = "failed"
+RETRYABLE = "retryable"
+
+
+class ProgressLedger:
+    def __init__(self, path: str | Path, max_attempts: int = 3):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_attempts = max_attempts
+        self.entries: dict[str, dict] = {}
+        self._load()
+        self._fh = self.path.open("a", encoding="utf-8")
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        with self.path.open(encoding="utf-8") as fh:
+            for line in fh:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # a torn last line from a crash mid-write
+                    logger.warning("Skipping unreadable ledger line in %s", self.path)
+                    continue
+                self.entries[entry["id"]] = entry
+        logger.info("Loaded progress for %d authors: %s", len(self.entries), self.summary())
+
+    def is_finished(self, author_id) -> bool:
+        entry = self.entries.get(str(author_id))
+        return entry is not None and entry["status"] in (DONE, FAILED)
+
+    def record(self, author_id, name: str, key: str, failure: Failure | None = None) -> str:
+        """Append the outcome for one author and return its status."""
+        author_id = str(author_id)
+        attempts = self.entries.get(author_id, {}).get("attempts", 0) + 1
+        if failure is None:
+            status = DONE
+        elif failure.retryable and attempts < self.max_attempts:
+            status = RETRYABLE
+        else:
+            status = FAILED
+        entry = {
+            "id": author_id,
+            "name": name,
+            "key": key,
+            "status": status,
+            "attempts": attempts,
+            "ts": time.time(),
+        }
+        if failure is not None:
+            entry["failure"] = failure.value
+        self.entries[author_id] = entry
+        self._fh.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._fh.flush()
+        return status
+
+    def summary(self) -> dict:
+        return dict(Counter(entry["status"] for entry in self.entries.values()))
+
+    def close(self) -> None:
+        self._fh.close()
+
+
+class ResultWriter:
+    """Append rows to a CSV, writing the header only when the file is new."""
+
+    def __init__(self, path: str | Path, fieldnames: list[str]):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        is_new = not self.path.exists() or self.path.stat().st_size == 0
+        if not is_new:
+            with self.path.open(encoding="utf-8", newline="") as fh:
+                header = next(csv.reader(fh), [])
+            if header != list(fieldnames):
+                raise ValueError(
+                    f"{self.path} has the columns {header}, "
+                    f"this run writes {list(fieldnames)}; "
+                    "move it and the progress ledger aside to start over"
+                )
+        self._fh = self.path.open("a", encoding="utf-8", newline="")
+        self._writer = csv.DictWriter(self._fh, fieldnames=fieldnames)
+        if is_new:
+            self._writer.writeheader()
+
+    def write(self, row: dict) -> None:
+        self._writer.writerow(row)
+        self._fh.flush()
+
+    def close(self) -> None:
+        self._fh.close()
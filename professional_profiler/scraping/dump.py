@@ -0,0 +1,279 @@
+# professional_profiler/scraping/dump.py
+"""
+Offline scraping backend reading a local Wikimedia Enterprise HTML dump.
+
+The dump is the NDJSON of an Enterprise snapshot (`enwiki_namespace_0_*.ndjson`
+once the tarball is unpacked): one JSON article per line with its `name`,
+`namespace`, `redirects` and the Parsoid HTML in `article_body.html`, the same
+HTML the REST `/page/{key}/html` endpoint serves. `path` is one such file or
+a directory of them.
+
+The first use builds a SQLite index next to the dump (`index_path`) mapping
+every article title and redirect to the file, byte offset and length of its
+line; the index is rebuilt when the dump files change. Lookups then cost one
+indexed query, and a page one slice of the memory-mapped file, so a run is
+limited by disk speed only. `WikiDump` has the interface of
+`WikimediaClient` (`search`, `resolve_titles`, `search_many`, `page_html`,
+`fetch_page`), so the fetcher drives either one.
+
+Searching resolves a name the way `resolve_titles` does against the live
+API: the title (after MediaWiki's title normalization) or a redirect to it,
+then the title ignoring case and dots. There is no full-text search, so a
+name that is not a title or redirect is `NO_RESULTS` here even when the API
+search would have found a page.
+"""
+
+import json
+import mmap
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from professional_profiler import metrics
+from professional_profiler.logging.logger import get_logger
+from professional_profiler.scraping.wikipedia_search import (
+    SKIP_KEYS,
+    Failure,
+    FetchError,
+    _match_key,
+)
+
+logger = get_logger(__name__)
+
+# Parsoid marks pages with __DISAMBIG__ with this page property
+DISAMBIGUATION_PROP = 'property="mw:PageProp/disambiguation"'
+INSERT_BATCH = 10_000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pages (
+    title TEXT PRIMARY KEY,
+    file INTEGER NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    disambiguation INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS titles (
+    title TEXT PRIMARY KEY,
+    target TEXT NOT NULL,
+    folded TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS titles_folded ON titles (folded);
+"""
+
+
+def normalize_title(name: str) -> str:
+    """MediaWiki's title normalization for the main namespace."""
+    title = " ".join(name.replace("_", " ").split())
+    return title[:1].upper() + title[1:]
+
+
+def fold_title(name: str) -> str:
+    """Title lookup key ignoring case, dots and spacing."""
+    return " ".join(name.replace("_", " ").replace(".", " ").split()).casefold()
+
+
+def dump_files(path: str | Path) -> list[Path]:
+    path = Path(path)
+    if path.is_dir():
+        return sorted(path.glob("*.ndjson"))
+    return [path]
+
+
+def _records(fh) -> Iterator[tuple[int, bytes]]:
+    offset = 0
+    for line in fh:
+        yield offset, line
+        offset += len(line)
+
+
+class WikiDump:
+    """Title index and random access over an Enterprise HTML dump, shared by threads."""
+
+    def __init__(
+        self, path: str | Path, index_path: str | Path | None = None, lang: str = "en"
+    ):
+        self.lang = lang
+        self.files = dump_files(path)
+        missing = [f for f in self.files if not f.is_file()]
+        if not self.files or missing:
+            raise FileNotFoundError(f"No dump files at {path}: {missing or 'empty directory'}")
+        # an empty file cannot be memory-mapped, and holds no pages anyway
+        empty = [f for f in self.files if f.stat().st_size == 0]
+        if empty:
+            logger.warning("Skipping empty dump file(s): %s", ", ".join(map(str, empty)))
+            self.files = [f for f in self.files if f not in empty]
+        if not self.files:
+            raise ValueError(f"Every dump file at {path} is empty")
+        base = Path(path)
+        self.index_path = Path(index_path) if index_path else base.with_name(base.name + ".idx")
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.index_path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        if not self._index_current():
+            self.build_index()
+        self._handles = [f.open("rb") for f in self.files]
+        self._maps = [
+            mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) for fh in self._handles
+        ]
+
+    @classmethod
+    def from_settings(cls, dump_conf, wiki_conf=None) -> "WikiDump":
+        """Build a reader from the `scraping.dump` config section."""
+        return cls(
+            dump_conf.path,
+            index_path=dump_conf.index_path or None,
+            lang=wiki_conf.language if wiki_conf is not None else "en",
+        )
+
+    def close(self) -> None:
+        for m in self._maps:
+            m.close()
+        for fh in self._handles:
+            fh.close()
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ----- index -----
+
+    def _index_current(self) -> bool:
+        indexed = self._conn.execute(
+            "SELECT path, size, mtime FROM files ORDER BY id"
+        ).fetchall()
+        current = [(str(f), f.stat().st_size, f.stat().st_mtime) for f in self.files]
+        return indexed == current
+
+    def build_index(self) -> None:
+        """(Re)build the title index; one pass over every dump file."""
+        logger.info("Indexing %d dump file(s) into %s", len(self.files), self.index_path)
+        start = time.perf_counter()
+        pages = titles = 0
+        with self._lock:
+            conn = self._conn
+            conn.executescript("DELETE FROM files; DELETE FROM pages; DELETE FROM titles;")
+            for file_id, path in enumerate(self.files):
+                page_rows, title_rows = [], []
+                with path.open("rb") as fh:
+                    for offset, line in _records(fh):
+                        if not line.strip():
+                            continue
+                        article = json.loads(line)
+                        if (article.get("namespace") or {}).get("identifier", 0) != 0:
+                            continue
+                        title = article["name"]
+                        html = (article.get("article_body") or {}).get("html", "")
+                        disambiguation = DISAMBIGUATION_PROP in html
+                        page_rows.append((title, file_id, offset, len(line), disambiguation))
+                        title_rows.append((title, title, fold_title(title)))
+                        for redirect in article.get("redirects") or []:
+                            name = redirect["name"]
+                            title_rows.append((name, title, fold_title(name)))
+                        if len(title_rows) >= INSERT_BATCH:
+                            pages, titles = self._flush(page_rows, title_rows, pages, titles)
+                            page_rows, title_rows = [], []
+                pages, titles = self._flush(page_rows, title_rows, pages, titles)
+                stat = path.stat()
+                conn.execute(
+                    "INSERT INTO files VALUES (?, ?, ?, ?)",
+                    (file_id, str(path), stat.st_size, stat.st_mtime),
+                )
+                logger.info("Indexed %s: %d pages so far", path.name, pages)
+            conn.commit()
+        logger.info(
+            "Indexed %d pages and %d titles in %.1fs",
+            pages,
+            titles,
+            time.perf_counter() - start,
+        )
+
+    def _flush(self, page_rows: list, title_rows: list, pages: int, titles: int):
+        # a later copy of a page in the dump wins, and a title beats a redirect
+        self._conn.executemany("INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?)", page_rows)
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO titles VALUES (?, ?, ?)",
+            [row for row in title_rows if row[0] == row[1]],
+        )
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO titles VALUES (?, ?, ?)",
+            [row for row in title_rows if row[0] != row[1]],
+        )
+        return pages + len(page_rows), titles + len(title_rows)
+
+    # ----- lookups -----
+
+    def _target(self, name: str) -> str | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT target FROM titles WHERE title = ?", (normalize_title(name),)
+            ).fetchone()
+            if row is None:
+                targets = [
+                    t
+                    for (t,) in self._conn.execute(
+                        "SELECT DISTINCT target FROM titles WHERE folded = ? ORDER BY target",
+                        (fold_title(name),),
+                    )
+                ]
+                if not targets:
+                    return None
+                idx = _match_key(name, targets)
+                return targets[idx if idx is not None else 0]
+        return row[0]
+
+    def _page(self, title: str) -> tuple | None:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT file, offset, length, disambiguation FROM pages WHERE title = ?",
+                (title,),
+            ).fetchone()
+
+    def search(self, name: str) -> str:
+        """Key of the article titled `name` (or redirected from it), see `WikimediaClient`."""
+        with metrics.timer("wiki_request_seconds", endpoint="dump"):
+            title = self._target(name) if name.strip() else None
+            page = self._page(title) if title is not None else None
+        if page is None:
+            return "NO_RESULTS"
+        if page[3]:
+            return "MULTIPLE_MATCHES"
+        key = title.replace(" ", "_")
+        return key if _match_key(name, [key]) is not None else "NO_MATCH"
+
+    def resolve_titles(self, names: Iterable[str]) -> dict[str, str]:
+        """`{name: key}` for every name, a dump resolves them all locally."""
+        return {name: self.search(name) for name in dict.fromkeys(names)}
+
+    def search_many(self, names: Iterable[str]) -> dict[str, str]:
+        return self.resolve_titles(names)
+
+    def page_html(self, key: str) -> str:
+        """
+        The article HTML of `key` as stored in the dump. A key that is not in
+        the dump raises `FetchError` like the REST API's 404 does.
+        """
+        if key in SKIP_KEYS:
+            return key
+        page = self._page(normalize_title(key))
+        if page is None:
+            raise FetchError(Failure.HTTP_ERROR, f"Page {key!r} is not in the dump", status=404)
+        file_id, offset, length, _ = page
+        with metrics.timer("wiki_request_seconds", endpoint="dump_html"):
+            article = json.loads(self._maps[file_id][offset : offset + length])
+        return article["article_body"]["html"]
+
+    def fetch_page(self, key: str) -> str:
+        # the whole article is local, there is nothing to save by fetching sections
+        return self.page_html(key)
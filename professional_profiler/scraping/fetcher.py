@@ -0,0 +1,242 @@
+# professional_profiler/scraping/fetcher.py
+"""
+Concurrent, rate-limited fetch engine for the scraping stage.
+
+Each author is resolved with a pipelined search -> HTML fetch inside a single
+worker, a bounded number of authors are in flight at once, and every outgoing
+request takes a token from a shared `TokenBucket` sized from
+`wikipediaSettings.rate_limit`, so the run stays close to the allowed request
+rate instead of waiting on one round trip at a time.
+
+With `wikipediaSettings.bulk_titles`, names are first resolved in batches of
+`TITLES_PER_QUERY` with one Action API request per batch
+(`WikimediaClient.resolve_titles`); the workers then only search the names
+that are not an article title, which removes most search requests from the
+request budget.
+
+With `wikipediaSettings.fetch_mode: sections`, only the lead, the infobox
+and the sections named in `section_keywords` are downloaded per author
+(`WikimediaClient.section_html`), falling back to the full page.
+
+With `wikipediaSettings.backend: dump`, the same workers read a local
+Enterprise HTML dump through `dump.WikiDump` instead of the API.
+
+Authors whose fetch fails with a retryable `Failure` (rate limiting, 5xx,
+timeouts, network errors) once the client's own retries are used up go to a
+dead-letter queue instead of holding a worker, and the run carries on with
+the others. Once the input is exhausted the queue is drained: each author is
+retried when its `Retry-After` (or `dead_letter_wait`) has passed, for up to
+`dead_letter_rounds` rounds, and only then reported with its failure.
+"""
+
+import heapq
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+from typing import Iterable, Iterator, NamedTuple, Optional
+
+from professional_profiler import metrics
+from professional_profiler.config import wikipediaSettings
+from professional_profiler.logging.logger import get_logger
+from professional_profiler.scraping.wikipedia_search import (
+    SKIP_KEYS,
+    TITLES_PER_QUERY,
+    Failure,
+    FetchError,
+    WikimediaClient,
+)
+
+logger = get_logger(__name__)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    Tokens refill continuously at `rate_per_minute / 60` per second up to
+    `capacity`. `acquire` reserves a token immediately (the balance may go
+    negative) and sleeps outside the lock until that reservation is due, so
+    waiting callers are served in order without busy looping.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: int = 1):
+        if rate_per_minute <= 0:
+            raise ValueError("rate_per_minute must be positive")
+        self.rate = rate_per_minute / 60.0
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self) -> None:
+        with self._lock:
+            self._refill()
+            self._tokens -= 1
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if delay > 0:
+            metrics.observe("rate_limit_wait_seconds", delay)
+            time.sleep(delay)
+
+    def pause(self, seconds: float) -> None:
+        """Hold every caller back for at least `seconds`, e.g. after a `Retry-After`."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, -seconds * self.rate)
+
+
+class FetchResult(NamedTuple):
+    """One author's outcome: the page `key` and `source` HTML, or a typed `failure`."""
+
+    key: str
+    source: str
+    failure: Optional[Failure] = None
+
+
+def fetch_author(name: str, client: WikimediaClient, key: Optional[str] = None) -> FetchResult:
+    """
+    Resolve one author name to its page, searching unless `key` is known.
+    Raises `FetchError` with `key` set to the search result, if there was one.
+    """
+    try:
+        with metrics.timer("fetch_author_seconds"):
+            if key is None:
+                key = client.search(name)
+            logger.info("Result for %s: %s", name, key)
+            source = client.fetch_page(key)
+    except FetchError as e:
+        logger.warning("Fetching %s failed (%s): %s", name, e.failure.value, e)
+        metrics.inc("fetch_outcomes_total", outcome=e.failure.value)
+        e.key = key
+        raise
+    logger.debug("Fetched %s (%d chars)", key, len(source))
+    metrics.inc("fetch_outcomes_total", outcome=key if key in SKIP_KEYS else "page")
+    return FetchResult(key, source)
+
+
+def resolve_batches(
+    names: Iterable[str], client: WikimediaClient
+) -> Iterator[tuple[int, str, Optional[str]]]:
+    """
+    `(index, name, key)` for every name, with the keys `resolve_titles` finds
+    for each batch of `TITLES_PER_QUERY` names and None for the others.
+    Batches are only resolved as the output is consumed.
+    """
+    indexed = enumerate(names)
+    while batch := list(islice(indexed, TITLES_PER_QUERY)):
+        keys = client.resolve_titles(name for _, name in batch)
+        for idx, name in batch:
+            yield idx, name, keys.get(name)
+
+
+def open_client(wiki_conf: wikipediaSettings, cache=None, dump_conf=None):
+    """The client for `wiki_conf.backend`: the rate-limited API or a local dump."""
+    if wiki_conf.backend == "dump":
+        from professional_profiler.scraping.dump import WikiDump
+
+        if dump_conf is None:
+            raise ValueError("backend 'dump' needs the scraping.dump settings")
+        logger.info("Fetching subjects from the dump at %s", dump_conf.path)
+        return WikiDump.from_settings(dump_conf, wiki_conf)
+    limiter = TokenBucket(wiki_conf.rate_limit, wiki_conf.burst)
+    logger.info("Fetching subjects at %d req/min", wiki_conf.rate_limit)
+    return WikimediaClient.from_settings(wiki_conf, limiter=limiter, cache=cache)
+
+
+def iter_fetch(
+    names: Iterable[str],
+    wiki_conf: wikipediaSettings,
+    cache=None,
+    dump_conf=None,
+) -> Iterator[tuple[int, str, FetchResult]]:
+    """
+    Yield `(index, name, FetchResult)` for every name as each one finishes.
+
+    At most `wiki_conf.max_workers` authors are in flight at any time; new
+    names are only pulled from `names` as earlier ones finish, so memory stays
+    bounded regardless of the input size and results can be persisted as
+    they arrive. An optional `ResponseCache` is shared by all workers. With
+    `wiki_conf.backend: dump` the pages come from the `WikiDump` at
+    `dump_conf.path` instead, without rate limit or cache. Failed authors
+    go through the dead-letter queue described above and come out last.
+    """
+    client = open_client(wiki_conf, cache=cache, dump_conf=dump_conf)
+    logger.info("Fetching subjects with %d workers", wiki_conf.max_workers)
+
+    with client, ThreadPoolExecutor(max_workers=wiki_conf.max_workers) as pool:
+        # future -> (index, name, rounds spent in the dead-letter queue)
+        pending: dict = {}
+        # heap of (due, index, name, key, rounds), drained once `queue` is exhausted
+        dead_letters: list = []
+        if wiki_conf.bulk_titles:
+            queue = resolve_batches(names, client)
+        else:
+            queue = ((idx, name, None) for idx, name in enumerate(names))
+        exhausted = False
+
+        def fill() -> None:
+            nonlocal exhausted
+            while not exhausted and len(pending) < wiki_conf.max_workers:
+                item = next(queue, None)
+                if item is None:
+                    exhausted = True
+                    break
+                idx, name, key = item
+                pending[pool.submit(fetch_author, name, client, key)] = (idx, name, 0)
+            now = time.monotonic()
+            while (
+                exhausted
+                and dead_letters
+                and dead_letters[0][0] <= now
+                and len(pending) < wiki_conf.max_workers
+            ):
+                _, idx, name, key, rounds = heapq.heappop(dead_letters)
+                pending[pool.submit(fetch_author, name, client, key)] = (idx, name, rounds)
+
+        fill()
+        while pending or dead_letters:
+            if not pending:
+                wait_for = dead_letters[0][0] - time.monotonic()
+                logger.info(
+                    "Retrying %d dead-lettered authors in %.0fs", len(dead_letters), wait_for
+                )
+                time.sleep(max(0.0, wait_for))
+                fill()
+                continue
+            # wake up for the next dead letter that falls due while others run
+            timeout = None
+            if exhausted and dead_letters:
+                timeout = max(0.0, dead_letters[0][0] - time.monotonic())
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for fut in done:
+                idx, name, rounds = pending.pop(fut)
+                try:
+                    result = fut.result()
+                except FetchError as e:
+                    if not e.failure.retryable or rounds >= wiki_conf.dead_letter_rounds:
+                        result = FetchResult(e.key or "", "", e.failure)
+                    else:
+                        due = time.monotonic() + max(
+                            e.retry_after or 0.0, wiki_conf.dead_letter_wait
+                        )
+                        heapq.heappush(dead_letters, (due, idx, name, e.key, rounds + 1))
+                        metrics.inc("dead_letters_total", failure=e.failure.value)
+                        continue
+                yield idx, name, result
+            fill()
+
+
+def fetch_all(
+    names: Iterable[str], wiki_conf: wikipediaSettings, cache=None, dump_conf=None
+) -> list[FetchResult]:
+    """Fetch a `FetchResult` for every name, returned in input order."""
+    names = list(names)
+    results: list[FetchResult | None] = [None] * len(names)
+    for idx, _, result in iter_fetch(names, wiki_conf, cache=cache, dump_conf=dump_conf):
+        results[idx] = result
+    return results
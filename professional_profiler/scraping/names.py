@@ -0,0 +1,59 @@
+# professional_profiler/scraping/names.py
+"""
+Author-name normalization and query deduplication for the scraping stage.
+
+`normalize_names` turns the raw "Last, First; suffix" author strings into the
+"First Last suffix" search queries the notebooks used to build row by row
+(`notebooks/name_normalization_fix.ipynb`), with whole-column pandas string
+operations. `unique_queries` then groups identical names into one query, so
+each distinct query is searched once and its outcome is fanned back out to
+every author row that shares it. Names are only grouped when they are the
+same string: title lookups are case-sensitive, so "McDonald" and "Mcdonald"
+can resolve differently. Missing names become the empty query, which the
+client answers with `NO_RESULTS` without a request.
+"""
+
+import numpy as np
+import pandas as pd
+
+from professional_profiler.logging.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def normalize_names(raw: pd.Series) -> pd.Series:
+    """
+    "Masad,   Ilana." -> "Ilana Masad", "Smith, John; Jr." -> "John Smith Jr".
+
+    The part before the first comma is the last name and the next part the
+    first name; whatever follows a ";" in the first name or a second comma
+    is a suffix. Trailing dots and semicolons are stripped from every part
+    and whitespace is collapsed. Names without a comma are only cleaned up.
+    """
+    names = raw.astype("string")
+    parts = names.str.split(r",\s*", n=2, expand=True, regex=True).reindex(columns=range(3))
+    last = parts[0].str.strip(";. ")
+    first_suffix = parts[1].str.split(";", n=1, expand=True).reindex(columns=range(2))
+    first = first_suffix[0].str.strip().str.strip(".;")
+    suffix = first_suffix[1].fillna("").str.strip() + "; " + parts[2].fillna("")
+    suffix = suffix.str.strip("; ").str.strip(";.")
+    reordered = first + " " + last + " " + suffix
+    normalized = reordered.where(parts[1].notna(), names)
+    return normalized.str.replace(r"\s+", " ", regex=True).str.strip()
+
+
+def unique_queries(names: pd.Series) -> tuple[list[str], list[np.ndarray]]:
+    """
+    The distinct queries among `names` and for every query the positions in
+    `names` of the rows that share it, both in order of first occurrence.
+    Missing names are the query "".
+    """
+    queries_by_row = names.astype("string").fillna("").str.strip()
+    codes, uniques = pd.factorize(queries_by_row)
+    # factorize numbers the keys by first occurrence, a stable sort keeps rows in order
+    order = np.argsort(codes, kind="stable")
+    starts = np.flatnonzero(np.diff(codes[order], prepend=-1))
+    groups = np.split(order, starts[1:]) if len(order) else []
+    queries = queries_by_row.iloc[order[starts]].tolist()
+    logger.info("%d distinct queries for %d names", len(uniques), len(names))
+    return queries, groups
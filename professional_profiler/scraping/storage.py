@@ -0,0 +1,85 @@
+# professional_profiler/scraping/storage.py
+"""
+Compressed page store shared by the scraping and parsing stages.
+
+Each author's page source (the Wikipedia HTML, or the outcome string such as
+`NO_MATCH` when there is no page) is stored zlib-compressed in a SQLite file
+indexed by author id. Scraping appends pages as they arrive; parsing streams
+them back in insertion order with `iter_batches`, so neither side has to hold
+the whole corpus in memory or go through an escaped CSV column.
+"""
+
+import sqlite3
+import zlib
+from pathlib import Path
+from typing import Iterator
+
+from professional_profiler.logging.logger import get_logger
+
+logger = get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    author_id TEXT PRIMARY KEY,
+    key TEXT NOT NULL,
+    body BLOB NOT NULL
+);
+"""
+
+
+class PageStore:
+    def __init__(self, path: str | Path, level: int = 6):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.level = level
+        self._conn = sqlite3.connect(self.path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+
+    def put(self, author_id, key: str, source: str, commit: bool = True) -> None:
+        body = zlib.compress(source.encode("utf-8"), self.level)
+        self._conn.execute(
+            "INSERT OR REPLACE INTO pages VALUES (?, ?, ?)", (str(author_id), key, body)
+        )
+        if commit:
+            self._conn.commit()
+
+    def get(self, author_id) -> str | None:
+        row = self._conn.execute(
+            "SELECT body FROM pages WHERE author_id = ?", (str(author_id),)
+        ).fetchone()
+        return zlib.decompress(row[0]).decode("utf-8") if row else None
+
+    def iter_batches(self, batch_size: int = 256) -> Iterator[list[tuple[str, str, str]]]:
+        """Yield lists of `(author_id, key, source)` without loading the whole store."""
+        cursor = self._conn.execute("SELECT author_id, key, body FROM pages ORDER BY rowid")
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            yield [(aid, key, zlib.decompress(body).decode("utf-8")) for aid, key, body in rows]
+
+    def import_csv(self, path: str | Path, id_column: str = "id", chunksize: int = 1000) -> int:
+        """Migrate a legacy scraping CSV with a `source` column into the store."""
+        import pandas as pd
+
+        count = 0
+        for chunk in pd.read_csv(path, chunksize=chunksize):
+            for author_id, key, source in zip(chunk[id_column], chunk["key"], chunk["source"]):
+                self.put(author_id, str(key), str(source), commit=False)
+                count += 1
+            self._conn.commit()
+        logger.info("Imported %d pages from %s", count, path)
+        return count
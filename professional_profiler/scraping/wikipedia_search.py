@@ -1,9 +1,17 @@
 # professional_profiler/scraping/wikipedia_search.py
 
+from professional_profiler import metrics
 from professional_profiler.logging.logger import get_logger
+from email.utils import parsedate_to_datetime
+from enum import Enum
+from functools import lru_cache
 import os
+import random
+from typing import Iterable, Optional
 import requests
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
+import re
 import time
 from rapidfuzz import process, fuzz
 
@@ -11,6 +19,485 @@ load_dotenv()
 
 logger = get_logger(__name__)
 
+BASE_URL = "https://api.wikimedia.org/core/v1/wikipedia"
+SEARCH_TIMEOUT = 5
+SKIP_KEYS = {"NO_MATCH", "MULTIPLE_MATCHES", "NO_RESULTS"}
+RETRY_STATUS = {500, 502, 503, 504}  # retried like the rate-limit status
+ACTION_URL = "https://{lang}.wikipedia.org/w/api.php"
+TITLES_PER_QUERY = 50  # `titles` limit of the Action API for clients without apihighlimits
+# characters MediaWiki does not allow in titles, "|" also separates the titles
+_ILLEGAL_TITLE_CHARS = set("#<>[]{}|")
+# headings whose sections are downloaded in the "sections" fetch mode
+SECTION_KEYWORDS = ("early life", "education", "career", "biography", "background")
+_PARSER_OUTPUT = re.compile(
+    r'^\s*<div class="[^"]*\bmw-parser-output\b[^"]*"[^>]*>(.*)</div>\s*$', re.S
+)
+_TAG = re.compile(r"<[^>]+>")
+
+
+class Failure(str, Enum):
+    """Why an author could not be fetched; all but `HTTP_ERROR` are worth retrying."""
+
+    RATE_LIMITED = "rate_limited"
+    SERVER_ERROR = "server_error"
+    TIMEOUT = "timeout"
+    NETWORK_ERROR = "network_error"
+    INVALID_JSON = "invalid_json"
+    HTTP_ERROR = "http_error"  # any other 4xx, e.g. a deleted page
+
+    @property
+    def retryable(self) -> bool:
+        return self is not Failure.HTTP_ERROR
+
+
+class FetchError(Exception):
+    """
+    A request that failed after the client's retries. `retry_after` is the
+    wait the server asked for, if any; `key` is set by the fetcher when the
+    search had already resolved the author.
+    """
+
+    def __init__(
+        self,
+        failure: Failure,
+        message: str,
+        retry_after: Optional[float] = None,
+        status: Optional[int] = None,
+    ):
+        super().__init__(message)
+        self.failure = failure
+        self.retry_after = retry_after
+        self.status = status
+        self.key: Optional[str] = None
+
+
+def retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a `Retry-After` header (delta-seconds or HTTP-date)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _normalized_query(name: str) -> str:
+    return name.lower().replace(" ", "_").replace(".", "")  # strip dots from initials/suffixes
+
+
+def _match_key(name: str, keys: list[str]) -> int | None:
+    """Index of the key in `keys` that fuzzy-matches `name`, None below the threshold."""
+    # build candidate list from all returned pages
+    choices = [key.lower().replace(" ", "_") for key in keys]
+    best, score, idx = process.extractOne(_normalized_query(name), choices, scorer=fuzz.ratio)
+    return idx if score >= 50 else None
+
+
+class WikimediaClient:
+    """
+    Reusable client for the Wikimedia core REST API.
+
+    Owns a single `requests.Session` whose connection pool is shared by every
+    call, so repeated searches and page downloads reuse keep-alive TCP/TLS
+    connections instead of paying a new handshake each time. The session is
+    safe to share between the worker threads of the fetcher; `pool_size`
+    should be at least the number of workers.
+
+    When a `ResponseCache` is given, search outcomes and page HTML are served
+    from it and stale pages are revalidated with their ETag.
+
+    `resolve_titles` resolves whole batches of names that are page titles
+    (after MediaWiki's title normalization and redirects) with one Action API
+    `action=query` request per `TITLES_PER_QUERY` names; only the names it
+    cannot resolve need a `search` each. `action_url` defaults to the
+    `api.php` of the `lang` Wikipedia.
+
+    Rate limiting (`rc`), 5xx replies, timeouts and connection errors are
+    retried up to `retry` times with full-jitter exponential backoff starting
+    at `backoff` seconds, waiting at least what `Retry-After` asks for; a 429
+    also pauses the shared `limiter` so the other workers back off too, even
+    when the request gives up. A wait longer than `timeout` seconds is not
+    taken inline: the request fails at once with a `FetchError` carrying
+    `retry_after`, and the fetcher parks the author in its dead-letter queue
+    instead.
+
+    With `fetch_mode="sections"`, `fetch_page` downloads only the lead (with
+    the infobox) and the sections whose heading contains one of
+    `section_keywords`, through `action=parse`, instead of the whole page;
+    see `section_html`.
+    """
+
+    def __init__(
+        self,
+        lang: str = "en",
+        retry: int = 3,
+        timeout: float = 60,
+        rc: int = 429,
+        pool_size: int = 10,
+        limiter=None,
+        base_url: str = BASE_URL,
+        cache=None,
+        action_url: str | None = None,
+        fetch_mode: str = "full",
+        section_keywords: Iterable[str] = SECTION_KEYWORDS,
+        backoff: float = 1.0,
+    ):
+        if retry < 1:
+            raise ValueError("retry must be at least 1, it counts every attempt")
+        self.lang = lang
+        self.retry = retry
+        self.timeout = timeout
+        self.rc = rc
+        self.backoff = backoff
+        self.limiter = limiter
+        self.cache = cache
+        self.base_url = base_url.rstrip("/")
+        self.action_url = action_url or ACTION_URL.format(lang=lang)
+        self.fetch_mode = fetch_mode
+        self.section_keywords = tuple(k.lower() for k in section_keywords)
+
+        self.session = requests.Session()
+        self.session.headers.update({"Authorization": os.getenv("WP_ACCESS_TOKEN", "")})
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    @classmethod
+    def from_settings(cls, wiki_conf, limiter=None, cache=None) -> "WikimediaClient":
+        """Build a client from the `scraping.wikipedia` config section."""
+        return cls(
+            lang=wiki_conf.language,
+            retry=wiki_conf.max_retries,
+            timeout=wiki_conf.timeout,
+            rc=wiki_conf.response_code,
+            pool_size=wiki_conf.pool_size,
+            limiter=limiter,
+            base_url=wiki_conf.base_url,
+            cache=cache,
+            action_url=wiki_conf.action_url or None,
+            fetch_mode=wiki_conf.fetch_mode,
+            section_keywords=wiki_conf.section_keywords,
+            backoff=wiki_conf.backoff,
+        )
+
+    def close(self) -> None:
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _get(
+        self,
+        url: str,
+        params: dict | None = None,
+        headers: dict | None = None,
+        endpoint: str = "other",
+    ) -> requests.Response:
+        """GET with the retry loop described on the class; raises `FetchError`."""
+        for attempt in range(self.retry):
+            retry_after, status = None, None
+            try:
+                if self.limiter is not None:
+                    self.limiter.acquire()
+                with metrics.timer("wiki_request_seconds", endpoint=endpoint):
+                    rs = self.session.get(
+                        url, params=params, headers=headers, timeout=SEARCH_TIMEOUT
+                    )
+            except requests.Timeout as e:
+                failure, message = Failure.TIMEOUT, str(e)
+            except requests.RequestException as e:
+                failure, message = Failure.NETWORK_ERROR, str(e)
+            else:
+                status = rs.status_code
+                metrics.inc("wiki_responses_total", endpoint=endpoint, status=status)
+                if status < 400:
+                    return rs
+                message = f"HTTP {status}"
+                retry_after = retry_after_seconds(rs.headers.get("Retry-After"))
+                if status == self.rc:
+                    failure = Failure.RATE_LIMITED
+                elif status in RETRY_STATUS:
+                    failure = Failure.SERVER_ERROR
+                else:
+                    raise FetchError(Failure.HTTP_ERROR, message, status=status)
+            if failure in (Failure.TIMEOUT, Failure.NETWORK_ERROR):
+                metrics.inc("wiki_network_errors_total", endpoint=endpoint)
+            # full jitter, but never sooner than the server asked for
+            delay = random.uniform(0, min(self.timeout, self.backoff * 2**attempt))
+            delay = max(delay, retry_after or 0.0)
+            if attempt == self.retry - 1 or delay > self.timeout:
+                if failure is Failure.RATE_LIMITED and self.limiter is not None:
+                    # giving up here does not end the throttling for the other workers
+                    self.limiter.pause(delay)
+                break
+            logger.warning(
+                "%s from %s, retrying in %.1fs (%d/%d)",
+                message,
+                endpoint,
+                delay,
+                attempt + 1,
+                self.retry,
+            )
+            metrics.inc("wiki_retries_total", endpoint=endpoint, failure=failure.value)
+            metrics.observe("wiki_backoff_seconds", delay, endpoint=endpoint)
+            if failure is Failure.RATE_LIMITED and self.limiter is not None:
+                # every worker waits, the next acquire here included
+                self.limiter.pause(delay)
+            else:
+                time.sleep(delay)
+        raise FetchError(failure, message, retry_after=retry_after, status=status)
+
+    def search(self, name: str) -> str:
+        """Return the key of the best matching page for `name`, see `get_wikipedia`."""
+        if not name.strip():
+            # a missing name, there is nothing to search for
+            return "NO_RESULTS"
+        if self.cache is not None:
+            cached = self.cache.get_search(self.lang, name)
+            metrics.inc(
+                "wiki_cache_total", kind="search", result="miss" if cached is None else "hit"
+            )
+            if cached is not None:
+                return cached
+        key = self._search(name)
+        if self.cache is not None:
+            self.cache.put_search(self.lang, name, key)
+        return key
+
+    def _search(self, name: str) -> str:
+        logger.debug("Scraping %r", name)
+        url = f"{self.base_url}/{self.lang}/search/page"
+        params = {"q": name, "limit": 1}
+        rs = self._get(url, params=params, endpoint="search")
+        try:
+            data = rs.json()
+        except ValueError as e:
+            raise FetchError(Failure.INVALID_JSON, f"search reply: {e}") from e
+
+        pages = data.get("pages", [])
+        if not pages:
+            return "NO_RESULTS"
+
+        # detection of disambiguation remains the same for the first result
+        if pages[0].get("description") == "Topics referred to by the same term":
+            return "MULTIPLE_MATCHES"
+
+        # fuzzy‐match
+        idx = _match_key(name, [p["key"] for p in pages])
+        if idx is None:
+            return "NO_MATCH"
+
+        # we accept pages[idx]
+        match = pages[idx]
+
+        return match["key"]
+
+    def resolve_titles(self, names: Iterable[str]) -> dict[str, str]:
+        """
+        `{name: key}` for the names that resolve without a search: names that
+        are the title of an article (or redirect to one) and whose key passes
+        the same fuzzy threshold as `search`, and `MULTIPLE_MATCHES` for titles
+        of disambiguation pages. Names left out need `search`.
+        """
+        resolved = {}
+        todo = []
+        for name in dict.fromkeys(names):
+            cached = self.cache.get_search(self.lang, name) if self.cache is not None else None
+            if cached is not None:
+                metrics.inc("wiki_cache_total", kind="search", result="hit")
+                resolved[name] = cached
+            elif name.strip() and not _ILLEGAL_TITLE_CHARS.intersection(name):
+                todo.append(name)
+        for start in range(0, len(todo), TITLES_PER_QUERY):
+            for name, key in self._query_titles(todo[start : start + TITLES_PER_QUERY]).items():
+                resolved[name] = key
+                if self.cache is not None:
+                    self.cache.put_search(self.lang, name, key)
+        return resolved
+
+    def _query_titles(self, names: list[str]) -> dict[str, str]:
+        params = {
+            "action": "query",
+            "format": "json",
+            "formatversion": 2,
+            "redirects": 1,
+            "prop": "pageprops",
+            "ppprop": "disambiguation",
+            "titles": "|".join(names),
+        }
+        try:
+            data = self._get(self.action_url, params=params, endpoint="query").json()
+        except (FetchError, ValueError) as e:
+            # the names are searched one by one instead
+            logger.warning("Title query for %d names failed: %s", len(names), e)
+            return {}
+        query = data.get("query") or {}
+        normalized = {n["from"]: n["to"] for n in query.get("normalized", [])}
+        redirects = {r["from"]: r["to"] for r in query.get("redirects", [])}
+        pages = {p["title"]: p for p in query.get("pages", [])}
+
+        keys = {}
+        for name in names:
+            title = normalized.get(name, name)
+            for _ in range(len(redirects)):  # redirect chains, at most one hop per entry
+                if title not in redirects:
+                    break
+                title = redirects[title]
+            page = pages.get(title)
+            if page is None or page.get("missing") or page.get("invalid") or page.get("ns"):
+                continue
+            if "disambiguation" in (page.get("pageprops") or {}):
+                keys[name] = "MULTIPLE_MATCHES"
+                continue
+            key = title.replace(" ", "_")
+            if _match_key(name, [key]) is not None:
+                keys[name] = key
+        metrics.inc("wiki_titles_total", len(keys), result="resolved")
+        metrics.inc("wiki_titles_total", len(names) - len(keys), result="unresolved")
+        logger.debug("Resolved %d of %d titles in one query", len(keys), len(names))
+        return keys
+
+    def search_many(self, names: Iterable[str]) -> dict[str, str]:
+        """`search` for every name, batch-resolving the exact titles first."""
+        names = list(dict.fromkeys(names))
+        keys = self.resolve_titles(names)
+        for name in names:
+            if name not in keys:
+                keys[name] = self.search(name)
+        return keys
+
+    def page_html(self, key: str) -> str:
+        """Return the rendered HTML of page `key`, see `search_html`."""
+        logger.debug("Fetching %r", key)
+        if key in SKIP_KEYS:
+            return key
+        cached = self.cache.get_html(self.lang, key) if self.cache is not None else None
+        if self.cache is not None:
+            result = "miss" if cached is None else "hit" if cached[2] else "stale"
+            metrics.inc("wiki_cache_total", kind="html", result=result)
+        if cached is not None and cached[2]:
+            return cached[0]
+        headers = {"If-None-Match": cached[1]} if cached is not None and cached[1] else None
+        url = f"{self.base_url}/{self.lang}/page/{key}/html"
+        rs = self._get(url, headers=headers, endpoint="html")
+        if rs.status_code == 304:
+            logger.debug("Page %r unchanged since last fetch", key)
+            metrics.inc("wiki_cache_total", kind="html", result="revalidated")
+            self.cache.revalidated(self.lang, key)
+            return cached[0]
+        if self.cache is not None:
+            self.cache.put_html(self.lang, key, rs.text, rs.headers.get("ETag"))
+        metrics.inc("wiki_page_bytes_total", len(rs.content), mode="full")
+        return rs.text
+
+    def fetch_page(self, key: str) -> str:
+        """The HTML of page `key` in the configured `fetch_mode`."""
+        if self.fetch_mode == "sections":
+            return self.section_html(key)
+        return self.page_html(key)
+
+    def section_html(self, key: str) -> str:
+        """
+        The lead, infobox and keyword sections of page `key` as one
+        `mw-parser-output` div, which `extract_all_sections` reads like the
+        full page. Costs two requests plus one per matching section (the
+        section index, the lead, the sections); pages without a matching
+        section, and any failed request, fall back to `page_html`.
+        """
+        if key in SKIP_KEYS:
+            return key
+        cache_key = f"{key}#sections"  # "#" never appears in a page key
+        cached = self.cache.get_html(self.lang, cache_key) if self.cache is not None else None
+        if cached is not None and cached[2]:
+            metrics.inc("wiki_cache_total", kind="sections", result="hit")
+            return cached[0]
+        if self.cache is not None:
+            metrics.inc("wiki_cache_total", kind="sections", result="miss")
+        try:
+            html = self._parse_sections(key)
+        except FetchError as e:
+            if e.failure is Failure.RATE_LIMITED:
+                raise  # the full page would be throttled just the same
+            logger.warning("Section fetch of %r failed, fetching the full page: %s", key, e)
+            html = None
+        except (ValueError, KeyError) as e:
+            logger.warning("Section fetch of %r failed, fetching the full page: %s", key, e)
+            html = None
+        if html is None:
+            metrics.inc("wiki_section_fetch_total", result="fallback")
+            return self.page_html(key)
+        metrics.inc("wiki_section_fetch_total", result="sections")
+        if self.cache is not None:
+            self.cache.put_html(self.lang, cache_key, html, None)
+        return html
+
+    def _parse_sections(self, key: str) -> str | None:
+        params = {
+            "action": "parse",
+            "format": "json",
+            "formatversion": 2,
+            "page": key,
+            "redirects": 1,
+            "prop": "sections|revid",
+        }
+        data = self._get(self.action_url, params=params, endpoint="parse").json()
+        if "error" in data:
+            raise ValueError(data["error"].get("info", data["error"]))
+        parse = data["parse"]
+
+        # a matching section brings its subsections along, so those are not asked for
+        chosen: list[dict] = []
+        for section in parse["sections"]:
+            if not str(section.get("index", "")).isdigit():
+                continue  # transcluded from a template
+            if any(section["number"].startswith(c["number"] + ".") for c in chosen):
+                continue
+            line = _TAG.sub("", section["line"]).lower()
+            if any(keyword in line for keyword in self.section_keywords):
+                chosen.append(section)
+        if not chosen:
+            logger.debug("No sections of %r match, fetching the full page", key)
+            return None
+
+        fragments = []
+        for index in ["0"] + [c["index"] for c in chosen]:
+            params = {
+                "action": "parse",
+                "format": "json",
+                "formatversion": 2,
+                "oldid": parse["revid"],  # section indexes are only valid for this revision
+                "prop": "text",
+                "section": index,
+                "disableeditsection": 1,
+                "disablelimitreport": 1,
+            }
+            rs = self._get(self.action_url, params=params, endpoint="parse")
+            metrics.inc("wiki_page_bytes_total", len(rs.content), mode="sections")
+            data = rs.json()
+            if "error" in data:
+                raise ValueError(data["error"].get("info", data["error"]))
+            text = data["parse"]["text"]
+            match = _PARSER_OUTPUT.match(text)
+            fragments.append(match.group(1) if match else text)
+        logger.debug(
+            "Fetched %d of %d sections of %r", len(chosen), len(parse["sections"]), key
+        )
+        return '<div class="mw-parser-output">' + "\n".join(fragments) + "</div>"
+
+
+@lru_cache(maxsize=8)
+def _shared_client(
+    lang: str, retry: int, timeout: float, rc: int, limiter=None
+) -> WikimediaClient:
+    return WikimediaClient(lang=lang, retry=retry, timeout=timeout, rc=rc, limiter=limiter)
+
 
 """
 This Python function retrieves information from
@@ -35,85 +522,34 @@ request up to the specified number of times before giving up,
 defaults to 3
 :type retry: int (optional)
 :param timeout: The `timeout` parameter in the `get_wikipedia`
-function specifies the maximum number of seconds to wait for a
-response from the Wikipedia API before raising a timeout error. In the
-provided code snippet, the default value for `timeout` is set to 60 seconds.
-This means that if the API, defaults to 60
-:type timeout: int (optional)
+function is the longest wait, in seconds, before a retry. When a
+`Retry-After` asks for longer, the function gives up at once and
+raises `FetchError` with that `retry_after`, defaults to 60
+:type timeout: float (optional)
 :param rc: The `rc` parameter in the `get_wikipedia` function stands
 for "retry count." It specifies the number of times the function will
 retry making a request in case it encounters a rate limit
 from the Wikipedia API. If the rate limit is hit, the function, defaults to 429
 :type rc: int (optional)
+:param limiter: Optional shared `TokenBucket`; a token is taken
+before every request (retries included) so concurrent callers
+stay under the configured requests-per-minute budget
 :return: The function `get_wikipedia` returns the key of the best
 matching Wikipedia page based on the search query provided.
+:raises FetchError: when the search failed after the retries, with the
+typed `Failure`
 """
 
 
 def get_wikipedia(
-    name: str, lang: str = "en", retry: int = 3, timeout: int = 60, rc: int = 429
+    name: str,
+    lang: str = "en",
+    retry: int = 3,
+    timeout: float = 60,
+    rc: int = 429,
+    limiter=None,
 ) -> str:
-    logger.debug("Scraping %r", name)
-    BASE_URL = "https://api.wikimedia.org/core/v1/wikipedia"
-    HEADERS = {"Authorization": os.getenv("WP_ACCESS_TOKEN", "")}
-    SEARCH_TIMEOUT = 5
-
-    url = f"{BASE_URL}/{lang}/search/page"
-    params = {"q": name, "limit": 1}
-    rs = None
-    try:
-        # Retry logic
-        for attempt in range(retry):
-            try:
-                rs = requests.get(url, headers=HEADERS, params=params, timeout=SEARCH_TIMEOUT)
-                rs.raise_for_status()
-                break
-            except requests.HTTPError as e:
-                if rs.status_code == rc and attempt < retry - 1:
-                    logger.warning("Rate limit hit, retrying... (%d/%d)", attempt + 1, retry)
-                    # Wait before retrying
-                    logger.debug("Waiting for %d seconds before retrying...", timeout)
-                    time.sleep(timeout)
-                    continue
-                else:
-                    raise e
-        data = rs.json()
-    except requests.HTTPError:
-        logger.error("HTTP error: %s", rs.status_code)
-        return "HTTP error"
-    except requests.RequestException:
-        logger.error("Network error: %s", rs.status_code)
-        return "Network error"
-    except ValueError:
-        logger.error("Invalid JSON response")
-        return "Invalid JSON"
-
-    pages = data.get("pages", [])
-    if not pages:
-        return "NO_RESULTS"
-
-    # detection of disambiguation remains the same for the first result
-    if pages[0].get("description") == "Topics referred to by the same term":
-        return "MULTIPLE_MATCHES"
-
-    # normalize query
-    normalized_query = (
-        name.lower().replace(" ", "_").replace(".", "")  # strip dots from initials/suffixes
-    )
-
-    # build candidate list from all returned pages
-    choices = [p["key"].lower().replace(" ", "_") for p in pages]
-
-    # fuzzy‐match
-    best, score, idx = process.extractOne(normalized_query, choices, scorer=fuzz.ratio)
-
-    if score < 50:
-        return "NO_MATCH"
-
-    # we accept pages[idx]
-    match = pages[idx]
-
-    return match["key"]
+    return _shared_client(lang, retry, timeout, rc, limiter).search(name)
 
 
 """
@@ -139,63 +575,30 @@ If the initial request fails due to a specific HTTP error
 status code (specified by `rc`), the function will retry
 making the, defaults to 3
 :type retry: int (optional)
-:param timeout: The `timeout` parameter in the `search_html`
-function specifies the maximum number of seconds the function
-will wait for a response from the API before timing out. In
-this case, the default timeout value is set to 60 seconds.
-If the API does not respond within this time frame, the
-function, defaults to 60
-:type timeout: int (optional)
+:param timeout: The longest wait before a retry, see `get_wikipedia`,
+defaults to 60
+:type timeout: float (optional)
 :param rc: The `rc` parameter in the `search_html` function
 stands for "Retry Count". It is used to specify the number of
 times the function should retry making a request in case a
 rate limit is hit, defaults to 429
 :type rc: int (optional)
+:param limiter: Optional shared `TokenBucket`, see `get_wikipedia`
 :return: The function `search_html` returns a string, which
 is the HTML content fetched from a specified URL. If there
 are any HTTP errors or network errors during the request,
-it will return an error message instead. If the key
+it raises `FetchError` with the typed `Failure`. If the key
 parameter is "NO_MATCH", "MULTIPLE_MATCHES", or "NO_RESULTS", it
 will return the key itself without making the request.
 """
 
 
 def search_html(
-    key: str, lang: str = "en", retry: int = 3, timeout: int = 60, rc: int = 429
+    key: str,
+    lang: str = "en",
+    retry: int = 3,
+    timeout: float = 60,
+    rc: int = 429,
+    limiter=None,
 ) -> str:
-    logger.debug("Fetching %r", key)
-    if key != "NO_MATCH" and key != "MULTIPLE_MATCHES" and key != "NO_RESULTS":
-        url = "https://api.wikimedia.org/core/v1/wikipedia/" + lang + "/page/" + key + "/html"
-        HEADERS = {
-            "Authorization": os.getenv("WP_ACCESS_TOKEN"),
-        }
-        SEARCH_TIMEOUT = 5
-        rs = None
-        try:
-            # Retry logic
-            for attempt in range(retry):
-                try:
-                    rs = requests.get(url, headers=HEADERS, timeout=SEARCH_TIMEOUT)
-                    rs.raise_for_status()
-                    break
-                except requests.HTTPError as e:
-                    if rs.status_code == rc and attempt < retry - 1:
-                        logger.warning(
-                            "Rate limit hit, retrying... (%d/%d)", attempt + 1, retry
-                        )
-                        # Wait before retrying
-                        logger.debug("Waiting for %d seconds before retrying...", timeout)
-                        time.sleep(timeout)
-                        continue
-                    else:
-                        raise e
-            data = rs.text
-        except requests.HTTPError:
-            logger.error("HTTP error: %s", rs.status_code)
-            return "HTTP error"
-        except requests.RequestException:
-            logger.error("Network error: %s", rs.status_code)
-            return "Network error"
-        return data
-    else:
-        return key
+    return _shared_client(lang, retry, timeout, rc, limiter).page_html(key)